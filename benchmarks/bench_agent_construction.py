@@ -0,0 +1,67 @@
+"""
+Benchmark: per-request agent construction.
+
+Compares building a fresh Agent for every request with instantiating one
+from a shared AgentSpec, for agents connected to an MCP server with a
+configurable number of tools. No requests are sent to the model.
+
+Usage:
+    python benchmarks/bench_agent_construction.py
+    python benchmarks/bench_agent_construction.py --count 5000 --tools 50
+"""
+
+import argparse
+import os
+import time
+from typing import Callable
+
+# Placeholder credentials so clients can be built without a .env file
+os.environ.setdefault("endpoint", "https://example.openai.azure.com")
+os.environ.setdefault("api_version", "2024-06-01")
+os.environ.setdefault("subscription_key", "benchmark")
+
+from or_af import Agent, AgentSpec, MCPServer
+from or_af.utils import set_log_level, LogLevel
+
+
+def build_server(tools: int) -> MCPServer:
+    """An MCP server with ``tools`` trivial tools."""
+    server = MCPServer(name="bench_tools")
+    for i in range(tools):
+        def tool(x: int) -> int:
+            """Return x unchanged."""
+            return x
+        server.tool(name=f"tool_{i}")(tool)
+    return server
+
+
+def per_call(func: Callable[[], object], count: int) -> float:
+    """Mean seconds per call over ``count`` calls."""
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - start) / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--tools", type=int, default=20)
+    args = parser.parse_args()
+
+    set_log_level(LogLevel.WARNING)
+    server = build_server(args.tools)
+    kwargs = dict(system_prompt="You are a helpful assistant.", mcp_servers=[server], verbose=False)
+
+    direct = per_call(lambda: Agent(**kwargs), args.count)
+    spec = AgentSpec(**kwargs)
+    spawned = per_call(spec.instantiate, args.count)
+
+    print(f"{'construction':<22}{'per agent':>12}")
+    print(f"{'Agent(...)':<22}{direct * 1e6:>10.1f}us")
+    print(f"{'spec.instantiate()':<22}{spawned * 1e6:>10.1f}us")
+    print(f"speedup: {direct / spawned:.1f}x ({args.count} agents, {args.tools} tools)")
+
+
+if __name__ == "__main__":
+    main()
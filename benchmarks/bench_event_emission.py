@@ -0,0 +1,107 @@
+"""
+Benchmark: callback event emission throughput.
+
+Emits bursts of events (100k by default) through CallbackHandler and
+through the previous implementation, which built a pydantic AgentEvent for
+every emit and re-parsed its EventType on dispatch, reporting events per
+second for handlers with no subscribers, a subscriber to another event
+type, and a global subscriber receiving stream chunks.
+
+Usage:
+    python benchmarks/bench_event_emission.py
+    python benchmarks/bench_event_emission.py --events 500000 --repeat 5
+"""
+
+import argparse
+import time
+from typing import Callable
+
+from or_af.callbacks import CallbackHandler
+from or_af.models import AgentEvent, EventType
+
+
+class LegacyCallbackHandler(CallbackHandler):
+    """The pre-fast-path emit/dispatch, kept here as the baseline."""
+
+    def emit(self, event_type, iteration=None, **data):
+        event = AgentEvent(event_type=event_type, iteration=iteration, data=data)
+        self.on_event(event)
+        return event
+
+    def emit_chunk(self, chunk, iteration=None):
+        return self.emit(EventType.STREAM_CHUNK, iteration=iteration, chunk=chunk)
+
+    def on_event(self, event):
+        for callback in self._global_callbacks:
+            try:
+                callback(event)
+            except Exception:
+                pass
+        event_type = EventType(event.event_type) if isinstance(event.event_type, str) else event.event_type
+        if event_type in self._callbacks:
+            for callback in self._callbacks[event_type]:
+                try:
+                    callback(event)
+                except Exception:
+                    pass
+
+
+# (subscribers, emit method)
+SCENARIOS = (("none", "emit"), ("other type", "emit"), ("global", "emit"), ("global", "emit_chunk"))
+
+
+def handler_for(handler_class: type, subscribers: str) -> CallbackHandler:
+    handler = handler_class()
+    if subscribers == "other type":
+        handler.register(EventType.TOOL_ERROR, lambda event: None)
+    elif subscribers == "global":
+        handler.register_global(lambda event: None)
+    return handler
+
+
+def burst(handler: CallbackHandler, method: str, events: int) -> Callable[[], None]:
+    """``events`` STREAM_CHUNK emits through ``emit`` or ``emit_chunk``."""
+    if method == "emit_chunk":
+        emit_chunk = handler.emit_chunk
+
+        def run() -> None:
+            for i in range(events):
+                emit_chunk("token ", i)
+    else:
+        emit = handler.emit
+
+        def run() -> None:
+            for i in range(events):
+                emit(EventType.STREAM_CHUNK, iteration=i, chunk="token ")
+    return run
+
+
+def events_per_second(run: Callable[[], None], events: int, repeat: int) -> float:
+    """Best-of-``repeat`` events per second."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return events / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'subscribers':<14}{'method':<12}{'legacy':>14}{'current':>14}{'speedup':>10}")
+    for subscribers, method in SCENARIOS:
+        legacy = events_per_second(
+            burst(handler_for(LegacyCallbackHandler, subscribers), method, args.events), args.events, args.repeat
+        )
+        current = events_per_second(
+            burst(handler_for(CallbackHandler, subscribers), method, args.events), args.events, args.repeat
+        )
+        print(f"{subscribers:<14}{method:<12}{legacy:>12,.0f}/s{current:>12,.0f}/s{current / legacy:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
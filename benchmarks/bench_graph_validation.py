@@ -0,0 +1,93 @@
+"""
+Benchmark: workflow graph validation on large generated graphs.
+
+Measures topological sort, Tarjan SCC, cycle search and full
+WorkflowGraph.compile() on chains and random DAGs of 10k-100k nodes.
+
+Usage:
+    python benchmarks/bench_graph_validation.py
+    python benchmarks/bench_graph_validation.py --sizes 10000 50000
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, Dict, List
+
+from or_af import WorkflowGraph
+from or_af.utils import set_log_level, LogLevel
+from or_af.workflow.validation import (
+    topological_sort,
+    strongly_connected_components,
+    find_cycle,
+)
+
+
+def chain(size: int) -> Dict[str, List[str]]:
+    """A single long chain, the shape Sequential() produces."""
+    return {str(i): [str(i + 1)] if i + 1 < size else [] for i in range(size)}
+
+
+def random_dag(size: int, fan_out: int = 3, seed: int = 0) -> Dict[str, List[str]]:
+    """A random DAG where every edge points to a later node."""
+    rng = random.Random(seed)
+    graph: Dict[str, List[str]] = {str(i): [] for i in range(size)}
+    for i in range(size - 1):
+        for _ in range(rng.randint(1, fan_out)):
+            graph[str(i)].append(str(rng.randint(i + 1, size - 1)))
+    return graph
+
+
+def with_back_edge(graph: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Close a cycle from the last node back to the first."""
+    size = len(graph)
+    cyclic = {node_id: list(targets) for node_id, targets in graph.items()}
+    cyclic[str(size - 1)].append("0")
+    return cyclic
+
+
+def build_workflow(graph: Dict[str, List[str]]) -> WorkflowGraph:
+    """Build a WorkflowGraph with identity nodes matching a successor map."""
+    wf = WorkflowGraph(name="bench")
+    nodes = {node_id: wf.add_node(lambda x: x, name=node_id) for node_id in graph}
+    for source, targets in graph.items():
+        for target in targets:
+            wf.add_edge(nodes[source], nodes[target])
+    return wf
+
+
+def timed(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    args = parser.parse_args()
+
+    set_log_level(LogLevel.WARNING)
+
+    print(f"{'graph':<18}{'nodes':>9}{'edges':>9}{'toposort':>11}{'tarjan':>11}{'cycle':>11}{'compile':>11}")
+    for size in args.sizes:
+        for label, graph in (
+            ("chain", chain(size)),
+            ("random dag", random_dag(size)),
+            ("chain + cycle", with_back_edge(chain(size))),
+        ):
+            edges = sum(len(targets) for targets in graph.values())
+            topo = timed(lambda: topological_sort(graph))
+            tarjan = timed(lambda: strongly_connected_components(graph))
+            cycle = timed(lambda: find_cycle(graph))
+            wf = build_workflow(graph)
+            compile_time = timed(lambda: wf.compile(check_cycles=False))
+            print(
+                f"{label:<18}{size:>9}{edges:>9}"
+                f"{topo * 1000:>9.1f}ms{tarjan * 1000:>9.1f}ms"
+                f"{cycle * 1000:>9.1f}ms{compile_time * 1000:>9.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark: assembling streamed chat completion chunks.
+
+Replays recorded-shape chunk streams (text-only, tool-call-only and mixed)
+with thousands of chunks through StreamAccumulator and through the previous
+dict-padding / string-concatenation implementation, reporting the cost per
+chunk.
+
+Usage:
+    python benchmarks/bench_stream_assembly.py
+    python benchmarks/bench_stream_assembly.py --chunks 20000 --repeat 20
+"""
+
+import argparse
+import json
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+from or_af.core.streaming import StreamAccumulator
+
+
+def text_stream(chunks: int) -> List[Any]:
+    """A reply made of ``chunks`` short text deltas."""
+    return [
+        SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=f"tok{i} ", tool_calls=None))])
+        for i in range(chunks)
+    ]
+
+
+def tool_stream(chunks: int, tools: int = 4) -> List[Any]:
+    """``tools`` tool calls whose arguments arrive in ``chunks`` fragments in total."""
+    stream = []
+    per_tool = max(1, chunks // tools)
+    for index in range(tools):
+        arguments = json.dumps({"values": list(range(per_tool))})
+        step = max(1, len(arguments) // per_tool)
+        fragments = [arguments[i:i + step] for i in range(0, len(arguments), step)]
+        for position, fragment in enumerate(fragments):
+            tool_call = SimpleNamespace(
+                index=index,
+                id=f"call_{index}" if position == 0 else None,
+                function=SimpleNamespace(name="solve" if position == 0 else None, arguments=fragment)
+            )
+            stream.append(SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=None, tool_calls=[tool_call]))]))
+    return stream
+
+
+def legacy_assemble(stream: List[Any]) -> Any:
+    """The pre-accumulator implementation, kept here as the baseline."""
+    collected_messages = []
+    collected_tool_calls: List[Dict] = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        if delta.content:
+            collected_messages.append(delta.content)
+        if delta.tool_calls:
+            for tool_call_chunk in delta.tool_calls:
+                while len(collected_tool_calls) <= tool_call_chunk.index:
+                    collected_tool_calls.append({"id": "", "type": "function", "function": {"name": "", "arguments": ""}})
+                if tool_call_chunk.id:
+                    collected_tool_calls[tool_call_chunk.index]["id"] = tool_call_chunk.id
+                if tool_call_chunk.function.name:
+                    collected_tool_calls[tool_call_chunk.index]["function"]["name"] = tool_call_chunk.function.name
+                if tool_call_chunk.function.arguments:
+                    collected_tool_calls[tool_call_chunk.index]["function"]["arguments"] += tool_call_chunk.function.arguments
+
+    content = "".join(collected_messages) if collected_messages else None
+
+    class MockMessage:
+        def __init__(self, content, tool_calls):
+            self.content = content
+            self.tool_calls = None
+            if tool_calls:
+                class MockToolCall:
+                    def __init__(self, tc):
+                        self.id = tc["id"]
+                        self.type = tc["type"]
+                        class MockFunction:
+                            def __init__(self, func):
+                                self.name = func["name"]
+                                self.arguments = func["arguments"]
+                        self.function = MockFunction(tc["function"])
+                self.tool_calls = [MockToolCall(tc) for tc in tool_calls]
+
+    return MockMessage(content, collected_tool_calls or None)
+
+
+def accumulator_assemble(stream: List[Any]) -> Any:
+    accumulator = StreamAccumulator()
+    add = accumulator.add
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        add(chunk.choices[0].delta)
+    return accumulator.build()
+
+
+def per_chunk(func: Callable[[List[Any]], Any], stream: List[Any], repeat: int) -> float:
+    """Best-of-``repeat`` seconds per chunk."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(stream)
+        best = min(best, time.perf_counter() - start)
+    return best / len(stream)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    streams = {
+        "text": text_stream(args.chunks),
+        "tool calls": tool_stream(args.chunks),
+        "mixed": text_stream(args.chunks // 2) + tool_stream(args.chunks // 2),
+    }
+
+    print(f"{'stream':<14}{'chunks':>8}{'legacy':>12}{'accumulator':>14}{'speedup':>10}")
+    for label, stream in streams.items():
+        legacy = per_chunk(legacy_assemble, stream, args.repeat)
+        accumulator_result = per_chunk(accumulator_assemble, stream, args.repeat)
+        print(
+            f"{label:<14}{len(stream):>8}"
+            f"{legacy * 1e9:>10.0f}ns{accumulator_result * 1e9:>12.0f}ns"
+            f"{legacy / accumulator_result:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
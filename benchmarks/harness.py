@@ -0,0 +1,243 @@
+"""
+Benchmark harness for the OR-AF suite.
+
+A small asv-style runner: cases register a setup function returning the
+callable to time, each case is calibrated so one sample takes at least
+``min_time`` seconds, and the best of ``repeat`` samples is kept. Results
+are saved as JSON baselines and later runs are compared against them.
+
+Used by benchmarks/run_suite.py.
+"""
+
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+# Version of the baseline file format
+BASELINE_FORMAT_VERSION = 1
+
+
+@dataclass
+class Case:
+    """
+    One benchmark.
+
+    Attributes:
+        name: Unique name, e.g. "workflow.run[1000]"
+        setup: Builds the state for the case and returns the callable to time
+        repeat: Number of timed samples
+        ops: Operations performed by one call of the timed callable; times
+            are reported per operation
+    """
+    name: str
+    setup: Callable[[], Callable[[], Any]]
+    repeat: int = 5
+    ops: int = 1
+
+
+@dataclass
+class Result:
+    """Timing of one case, in seconds per operation"""
+    name: str
+    best: float
+    median: float
+    number: int
+    repeat: int
+
+    @property
+    def ops_per_sec(self) -> float:
+        return 1.0 / self.best if self.best > 0 else float("inf")
+
+
+@dataclass
+class Comparison:
+    """A result next to its baseline"""
+    name: str
+    current: float
+    baseline: Optional[float]
+    tolerance: float
+
+    @property
+    def ratio(self) -> Optional[float]:
+        """Current time over baseline time (above 1 is slower)"""
+        if self.baseline is None or self.baseline <= 0:
+            return None
+        return self.current / self.baseline
+
+    @property
+    def status(self) -> str:
+        ratio = self.ratio
+        if ratio is None:
+            return "new"
+        if ratio > 1 + self.tolerance:
+            return "regressed"
+        if ratio < 1 / (1 + self.tolerance):
+            return "improved"
+        return "ok"
+
+
+class Suite:
+    """
+    Registry of benchmark cases.
+
+    Example:
+        ```python
+        suite = Suite()
+
+        @suite.case("tool.execute", params=["sync", "cached"])
+        def tool_execute(kind):
+            tool = make_tool(kind)
+            return lambda: tool.execute("call_1", x=1)
+
+        results = suite.run()
+        ```
+    """
+
+    def __init__(self):
+        self.cases: List[Case] = []
+
+    def add(self, case: Case) -> None:
+        if any(existing.name == case.name for existing in self.cases):
+            raise ValueError(f"Duplicate benchmark '{case.name}'")
+        self.cases.append(case)
+
+    def case(
+        self,
+        name: str,
+        params: Optional[Iterable[Any]] = None,
+        repeat: int = 5,
+        ops: int = 1
+    ) -> Callable[[Callable[..., Callable[[], Any]]], Callable[..., Callable[[], Any]]]:
+        """
+        Register a setup function as a case, or one case per parameter.
+
+        Parameterized cases are named ``name[param]`` and their setup function
+        is called with the parameter.
+        """
+        def decorator(setup: Callable[..., Callable[[], Any]]) -> Callable[..., Callable[[], Any]]:
+            if params is None:
+                self.add(Case(name, setup, repeat=repeat, ops=ops))
+            else:
+                for param in params:
+                    self.add(Case(
+                        f"{name}[{param}]",
+                        lambda param=param: setup(param),
+                        repeat=repeat,
+                        ops=ops
+                    ))
+            return setup
+        return decorator
+
+    def select(self, patterns: Optional[List[str]] = None) -> List[Case]:
+        """Cases whose name contains any of ``patterns`` (all if none given)"""
+        if not patterns:
+            return list(self.cases)
+        return [case for case in self.cases if any(pattern in case.name for pattern in patterns)]
+
+    def run(
+        self,
+        patterns: Optional[List[str]] = None,
+        min_time: float = 0.1,
+        repeat: Optional[int] = None,
+        progress: Optional[Callable[[Result], None]] = None
+    ) -> List[Result]:
+        """
+        Run the selected cases.
+
+        Args:
+            patterns: Substrings selecting cases by name
+            min_time: Minimum seconds per timed sample
+            repeat: Override every case's number of samples
+            progress: Called with each result as it completes
+        """
+        results = []
+        for case in self.select(patterns):
+            result = measure(case, min_time=min_time, repeat=repeat or case.repeat)
+            results.append(result)
+            if progress is not None:
+                progress(result)
+        return results
+
+
+def measure(case: Case, min_time: float = 0.1, repeat: int = 5) -> Result:
+    """Time a case, calibrating the number of calls per sample like timeit.autorange()."""
+    func = case.setup()
+    timer = time.perf_counter
+
+    def sample(number: int) -> float:
+        start = timer()
+        for _ in range(number):
+            func()
+        return timer() - start
+
+    number = 1
+    while True:
+        elapsed = sample(number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / elapsed) + 1) if elapsed > 0 else number * 10
+
+    samples = [elapsed] + [sample(number) for _ in range(repeat - 1)]
+    per_op = [elapsed / (number * case.ops) for elapsed in samples]
+    return Result(
+        name=case.name,
+        best=min(per_op),
+        median=statistics.median(per_op),
+        number=number,
+        repeat=repeat
+    )
+
+
+def save_baseline(results: List[Result], path: str) -> None:
+    """Write results as a baseline file."""
+    data = {
+        "version": BASELINE_FORMAT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "machine": {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+        },
+        "results": {result.name: asdict(result) for result in results},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    """Read a baseline file written by save_baseline()."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != BASELINE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported baseline version {data.get('version')!r}")
+    return data
+
+
+def compare(results: List[Result], baseline: Dict[str, Any], tolerance: float) -> List[Comparison]:
+    """Compare each result's best time with the baseline's."""
+    stored = baseline["results"]
+    return [
+        Comparison(
+            name=result.name,
+            current=result.best,
+            baseline=stored[result.name]["best"] if result.name in stored else None,
+            tolerance=tolerance
+        )
+        for result in results
+    ]
+
+
+def format_time(seconds: float) -> str:
+    """Human readable duration"""
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
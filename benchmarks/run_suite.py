@@ -0,0 +1,246 @@
+"""
+Benchmark suite: hot paths of agents, callbacks, tools, workflows and A2A.
+
+Runs every case registered below (agent runs against a ReplayBackend, so no
+credentials or network are needed), prints the time per operation and
+optionally saves a baseline or compares with one. Comparing exits with
+status 1 when a case is slower than its baseline by more than the
+tolerance, so the suite can gate CI.
+
+Baselines are machine specific: compare against one recorded on the same
+machine (benchmarks/baselines/ holds the reference run).
+
+Usage:
+    python benchmarks/run_suite.py
+    python benchmarks/run_suite.py --filter workflow callbacks
+    python benchmarks/run_suite.py --save benchmarks/baselines/local.json
+    python benchmarks/run_suite.py --compare benchmarks/baselines/local.json --tolerance 0.2
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+from harness import Result, Suite, compare, format_time, load_baseline, save_baseline
+
+from or_af import Agent, MCPServer, ReplayBackend, Tool, ToolCachePolicy, WorkflowGraph
+from or_af.a2a import A2AProtocol, MessageType
+from or_af.callbacks import CallbackHandler, DispatchConfig, FileCallback, MetricsCallback, PrometheusExporter
+from or_af.models import AgentEvent, EventType
+from or_af.utils import set_log_level, LogLevel
+
+
+suite = Suite()
+
+
+# Agent
+
+
+def agent_trace(iterations: int):
+    """A conversation taking ``iterations`` model calls: tool turns, then the answer."""
+    trace = [
+        {
+            "content": None,
+            "tool_calls": [{
+                "id": f"call_{turn}",
+                "type": "function",
+                "function": {"name": "add", "arguments": json.dumps({"a": turn, "b": 1})}
+            }]
+        }
+        for turn in range(iterations - 1)
+    ]
+    trace.append({"content": "Done.", "usage": {"prompt_tokens": 50, "completion_tokens": 2, "total_tokens": 52}})
+    return trace
+
+
+def replay_agent(iterations: int, stream: bool) -> Agent:
+    server = MCPServer(name="calculator")
+
+    @server.tool()
+    def add(a: int, b: int) -> int:
+        """Add two numbers"""
+        return a + b
+
+    return Agent(
+        system_prompt="You are a calculator.",
+        mcp_servers=[server],
+        verbose=False,
+        stream=stream,
+        max_iterations=iterations + 1,
+        backend=ReplayBackend(agent_trace(iterations))
+    )
+
+
+@suite.case("agent.run", params=[1, 4])
+def agent_run(iterations):
+    agent = replay_agent(iterations, stream=False)
+    return lambda: agent.run("Add some numbers")
+
+
+@suite.case("agent.stream", params=[4])
+def agent_stream(iterations):
+    agent = replay_agent(iterations, stream=True)
+    return lambda: agent.run("Add some numbers")
+
+
+# Callbacks
+
+
+@suite.case("callbacks.emit", params=[0, 1, 4])
+def callbacks_emit(listeners):
+    handler = CallbackHandler()
+    for i in range(listeners):
+        if i % 2:
+            handler.register(EventType.TOOL_CALL_END, lambda event: None)
+        else:
+            handler.register_global(lambda event: None)
+    return lambda: handler.emit(EventType.TOOL_CALL_END, iteration=1, tool_name="add", result=8)
+
+
+@suite.case("callbacks.emit_chunk", params=[0, 1])
+def callbacks_emit_chunk(listeners):
+    handler = CallbackHandler()
+    for _ in range(listeners):
+        handler.register_global(lambda event: None)
+    return lambda: handler.emit_chunk("token ", 1)
+
+
+@suite.case("callbacks.emit_async", params=[1])
+def callbacks_emit_async(listeners):
+    handler = CallbackHandler(dispatch=DispatchConfig(overflow="drop_oldest"))
+    for _ in range(listeners):
+        handler.register_global(lambda event: None)
+    return lambda: handler.emit(EventType.TOOL_CALL_END, iteration=1, tool_name="add", result=8)
+
+
+@suite.case("callbacks.file", params=["buffered"])
+def callbacks_file(mode):
+    directory = tempfile.mkdtemp()
+    events = FileCallback(os.path.join(directory, "events.jsonl"), max_bytes=50_000_000, backup_count=1)
+    event = AgentEvent(event_type=EventType.TOOL_CALL_END, iteration=1, data={"tool_name": "add", "result": 8})
+    return lambda: events.on_event(event)
+
+
+@suite.case("callbacks.metrics", params=["tool"])
+def callbacks_metrics(kind):
+    metrics = MetricsCallback()
+    event = AgentEvent(event_type=EventType.TOOL_CALL_END, iteration=1, data={"tool_name": "add", "execution_time": 0.0123})
+    return lambda: metrics.on_event(event)
+
+
+@suite.case("callbacks.prometheus", params=["render"])
+def callbacks_prometheus(kind):
+    exporter = PrometheusExporter()
+    for i in range(1000):
+        exporter.on_event(AgentEvent(
+            event_type=EventType.TOOL_CALL_END,
+            data={"tool_name": f"tool_{i % 10}", "execution_time": 0.001 * (i + 1)}
+        ))
+    return exporter.render
+
+
+# Tools
+
+
+@suite.case("tool.execute", params=["plain", "cached"])
+def tool_execute(kind):
+    def add(a: int, b: int) -> int:
+        """Add two numbers"""
+        return a + b
+
+    tool = Tool("add", add, cache=ToolCachePolicy() if kind == "cached" else None)
+    return lambda: tool.execute("call_1", a=5, b=3)
+
+
+# Workflows
+
+
+def chain_workflow(size: int) -> WorkflowGraph:
+    """A chain of ``size`` identity nodes."""
+    workflow = WorkflowGraph(name="bench")
+    previous = None
+    for i in range(size):
+        node = workflow.add_node(lambda x: x, name=f"node_{i}")
+        if previous is not None:
+            workflow.add_edge(previous, node)
+        previous = node
+    return workflow
+
+
+@suite.case("workflow.compile", params=[10, 1000, 10000], repeat=3)
+def workflow_compile(size):
+    workflow = chain_workflow(size)
+    return workflow.compile
+
+
+@suite.case("workflow.run", params=[10, 1000, 10000], repeat=3)
+def workflow_run(size):
+    workflow = chain_workflow(size).compile()
+    return lambda: workflow.run("input")
+
+
+# A2A
+
+
+@suite.case("a2a.round_trip", ops=100)
+def a2a_round_trip():
+    protocol = A2AProtocol()
+    protocol.register_handler(
+        MessageType.REQUEST,
+        lambda message: message.create_response("receiver", message.task)
+    )
+
+    def round_trips():
+        for i in range(100):
+            protocol.handle_message(protocol.send_message("sender", "receiver", i))
+        protocol.clear_history()
+
+    return round_trips
+
+
+def print_result(result: Result) -> None:
+    print(f"{result.name:<28}{format_time(result.best):>12}{format_time(result.median):>12}{result.ops_per_sec:>14,.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filter", nargs="+", help="run cases whose name contains any of these")
+    parser.add_argument("--min-time", type=float, default=0.1, help="minimum seconds per sample")
+    parser.add_argument("--repeat", type=int, help="override the number of samples per case")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare with a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for case in suite.select(args.filter):
+            print(case.name)
+        return
+
+    set_log_level(LogLevel.WARNING)
+
+    print(f"{'case':<28}{'best':>12}{'median':>12}{'ops/sec':>14}")
+    results = suite.run(args.filter, min_time=args.min_time, repeat=args.repeat, progress=print_result)
+
+    if args.save:
+        save_baseline(results, args.save)
+        print(f"\nBaseline written to {args.save}")
+
+    if args.compare:
+        comparisons = compare(results, load_baseline(args.compare), args.tolerance)
+        print(f"\n{'case':<28}{'baseline':>12}{'current':>12}{'ratio':>8}  status")
+        for comparison in comparisons:
+            baseline = format_time(comparison.baseline) if comparison.baseline is not None else "-"
+            ratio = f"{comparison.ratio:.2f}x" if comparison.ratio is not None else "-"
+            print(f"{comparison.name:<28}{baseline:>12}{format_time(comparison.current):>12}{ratio:>8}  {comparison.status}")
+        regressed = [comparison.name for comparison in comparisons if comparison.status == "regressed"]
+        if regressed:
+            print(f"\n{len(regressed)} regression(s) beyond {args.tolerance:.0%}: {', '.join(regressed)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
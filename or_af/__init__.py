@@ -16,12 +16,14 @@ Key Concepts:
 5. Edges can have conditions for dynamic routing
 
 Module Structure:
-- core/     : Agent, Tool
+- core/     : Agent, AgentSpec, ContextWindow, Tool
 - mcp/      : MCPServer, MCPClient (official MCP SDK wrappers)
 - workflow/ : WorkflowGraph, Sequential, Parallel, visualization
 - a2a/      : A2AAgent, A2AExecutor (official A2A SDK wrappers)
 - models/   : Pydantic models
 - callbacks/: Event callbacks
+- cache/    : Response and tool result caching
+- llm/      : Shared LLM client pool, request scheduler and backends
 - exceptions/: Custom exceptions
 - utils/    : Logger and utilities
 
@@ -31,7 +33,7 @@ Official SDK Documentation:
 """
 
 # Core classes
-from .core import Agent, Tool
+from .core import Agent, AgentSpec, ContextWindow, Tool
 
 # MCP Server (using official MCP SDK)
 from .mcp import (
@@ -52,6 +54,7 @@ from .workflow import (
     EdgeCondition,
     NodeStatus,
     NodeResult,
+    MergedInputs,
     workflow,
     WorkflowVisualizer,
     visualize_workflow
@@ -74,6 +77,7 @@ from .a2a import (
 from .models import (
     AgentConfig,
     AgentResponse,
+    BatchStats,
     AgentEvent,
     EventType,
     ToolCall,
@@ -81,7 +85,9 @@ from .models import (
     ToolSchema,
     IterationState,
     Message,
-    MessageRole
+    MessageRole,
+    StreamChunk,
+    StreamChunkType
 )
 
 # Callbacks
@@ -89,10 +95,30 @@ from .callbacks import (
     BaseCallback,
     CallbackHandler,
     ConsoleCallback,
+    DispatchConfig,
     FileCallback,
-    MetricsCallback
+    MetricsCallback,
+    PrometheusExporter,
+    StreamingHistogram
 )
 
+# LLM client infrastructure
+from .llm import (
+    ClientPool,
+    ClientPoolConfig,
+    default_client_pool,
+    RequestScheduler,
+    SchedulerConfig,
+    LLMBackend,
+    AzureOpenAIBackend,
+    ReplayBackend,
+    ReplayTiming,
+    RecordingBackend,
+)
+
+# Caching
+from .cache import ResponseCache, InMemoryResponseCache, SQLiteResponseCache, ToolCachePolicy
+
 # Exceptions
 from .exceptions import (
     ORAFError,
@@ -115,6 +141,8 @@ from .exceptions import (
     A2AError,
     A2AMessageError,
     A2ARoutingError,
+    LLMError,
+    LLMConfigurationError,
     CallbackError,
     CallbackExecutionError
 )
@@ -128,6 +156,8 @@ __author__ = "OR-AF Framework Team"
 __all__ = [
     # Core classes
     "Agent",
+    "AgentSpec",
+    "ContextWindow",
     "Tool",
     
     # MCP Server (official SDK wrappers)
@@ -146,6 +176,7 @@ __all__ = [
     "EdgeCondition",
     "NodeStatus",
     "NodeResult",
+    "MergedInputs",
     "workflow",
     "WorkflowVisualizer",
     "visualize_workflow",
@@ -172,13 +203,37 @@ __all__ = [
     "IterationState",
     "Message",
     "MessageRole",
+    "StreamChunk",
+    "StreamChunkType",
+    "BatchStats",
     
     # Callbacks
     "BaseCallback",
     "CallbackHandler",
     "ConsoleCallback",
+    "DispatchConfig",
     "FileCallback",
     "MetricsCallback",
+    "PrometheusExporter",
+    "StreamingHistogram",
+    
+    # LLM client infrastructure
+    "ClientPool",
+    "ClientPoolConfig",
+    "default_client_pool",
+    "RequestScheduler",
+    "SchedulerConfig",
+    "LLMBackend",
+    "AzureOpenAIBackend",
+    "ReplayBackend",
+    "ReplayTiming",
+    "RecordingBackend",
+    
+    # Caching
+    "ResponseCache",
+    "InMemoryResponseCache",
+    "SQLiteResponseCache",
+    "ToolCachePolicy",
     
     # Exceptions
     "ORAFError",
@@ -201,6 +256,8 @@ __all__ = [
     "A2AError",
     "A2AMessageError",
     "A2ARoutingError",
+    "LLMError",
+    "LLMConfigurationError",
     "CallbackError",
     "CallbackExecutionError",
     
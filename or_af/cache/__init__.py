@@ -0,0 +1,17 @@
+"""
+OR-AF Cache Module
+
+Caching layers that avoid repeating expensive work: LLM responses and
+deterministic tool results.
+"""
+
+from .response_cache import ResponseCache, InMemoryResponseCache, SQLiteResponseCache
+from .tool_cache import ToolCachePolicy, ToolResultCache
+
+__all__ = [
+    "ResponseCache",
+    "InMemoryResponseCache",
+    "SQLiteResponseCache",
+    "ToolCachePolicy",
+    "ToolResultCache",
+]
@@ -0,0 +1,217 @@
+"""
+OR-AF Response Cache
+
+Caches chat completion responses keyed on a canonical hash of the request,
+so identical LLM calls are answered without a round trip to the model.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class ResponseCache(ABC):
+    """
+    Base class for response caches.
+
+    A cache entry is a plain dict ``{"content": ..., "tool_calls": [...]}``
+    describing the assistant message. Subclasses only implement storage;
+    key building and hit/miss accounting live here.
+    """
+
+    # Request parameters that do not change the model's answer
+    IGNORED_PARAMS = ("stream", "stream_options")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    @classmethod
+    def make_key(cls, api_params: Dict[str, Any]) -> str:
+        """Build a canonical SHA-256 key from chat completion request parameters."""
+        payload = {k: v for k, v in api_params.items() if k not in cls.IGNORED_PARAMS}
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored entry or None if missing or expired"""
+        pass
+
+    @abstractmethod
+    def _set(self, key: str, entry: Dict[str, Any]) -> None:
+        """Store an entry"""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all entries"""
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    def lookup(self, api_params: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Look up a request, recording a hit or miss.
+
+        Returns:
+            Tuple of (key, entry or None) so the caller can store under the same key
+        """
+        key = self.make_key(api_params)
+        entry = self._get(key)
+        with self._stats_lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return key, entry
+
+    def store(self, key: str, message: Any) -> None:
+        """Store an assistant message (OpenAI SDK message or equivalent) under a key."""
+        self._set(key, self.entry_from_message(message))
+
+    @staticmethod
+    def entry_from_message(message: Any) -> Dict[str, Any]:
+        """Convert an assistant message into a JSON-serializable cache entry."""
+        tool_calls = None
+        if message.tool_calls:
+            tool_calls = [
+                {
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {"name": tc.function.name, "arguments": tc.function.arguments}
+                }
+                for tc in message.tool_calls
+            ]
+        return {"content": message.content, "tool_calls": tool_calls}
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else None,
+            "size": len(self)
+        }
+
+
+class InMemoryResponseCache(ResponseCache):
+    """
+    In-process LRU response cache with optional time-to-live.
+
+    Example:
+        ```python
+        cache = InMemoryResponseCache(max_size=1024, ttl=3600)
+        agent = Agent(system_prompt="...", response_cache=cache)
+        ```
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        """
+        Args:
+            max_size: Maximum number of entries before the least recently used is evicted
+            ttl: Seconds an entry stays valid (None for no expiry)
+        """
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            stored_at, entry = item
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _set(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    On-disk response cache backed by SQLite, shared across processes and restarts.
+
+    Example:
+        ```python
+        cache = SQLiteResponseCache(".or_af_cache.sqlite", ttl=24 * 3600)
+        agent = Agent(system_prompt="...", response_cache=cache)
+        ```
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        """
+        Args:
+            path: SQLite database file path
+            ttl: Seconds an entry stays valid (None for no expiry)
+        """
+        super().__init__()
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, entry TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+
+    def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT entry, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            entry, stored_at = row
+            if self.ttl is not None and time.time() - stored_at > self.ttl:
+                with self._conn:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            return json.loads(entry)
+
+    def _set(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, entry, stored_at) VALUES (?, ?, ?)",
+                (key, json.dumps(entry), time.time())
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
@@ -0,0 +1,110 @@
+"""
+OR-AF Tool Result Cache
+
+Memoizes results of deterministic tools (solvers, lookups) per argument set.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from ..models.tool_models import ToolResult
+
+
+@dataclass
+class ToolCachePolicy:
+    """
+    Caching policy for a single tool.
+
+    Attributes:
+        max_size: Maximum cached argument sets before the least recently used is evicted
+        ttl: Seconds a cached result stays valid (None for no expiry)
+        key_func: Optional function called with the tool's keyword arguments that
+            returns a hashable cache key; defaults to the canonical JSON of the arguments
+    """
+    max_size: int = 128
+    ttl: Optional[float] = None
+    key_func: Optional[Callable[..., Hashable]] = None
+
+
+class ToolResultCache:
+    """LRU + TTL store of successful ToolResults for one tool."""
+
+    def __init__(self, policy: ToolCachePolicy):
+        self.policy = policy
+        self._entries: "OrderedDict[Hashable, Tuple[float, ToolResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.time_saved = 0.0
+
+    def make_key(self, arguments: Dict[str, Any]) -> Optional[Hashable]:
+        """Build the cache key for a call, or None if the arguments cannot be keyed."""
+        try:
+            if self.policy.key_func is not None:
+                key = self.policy.key_func(**arguments)
+                hash(key)
+                return key
+            return json.dumps(arguments, sort_keys=True, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return None
+
+    def get(self, key: Hashable, tool_call_id: str) -> Optional[ToolResult]:
+        """
+        Get a cached result re-addressed to the given tool call.
+
+        The returned result is a deep copy with ``cached=True`` and
+        ``saved_time`` set to the execution time of the original call, so
+        callers may mutate it without changing the cached entry.
+        """
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and self.policy.ttl is not None:
+                if time.monotonic() - item[0] > self.policy.ttl:
+                    del self._entries[key]
+                    item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            original = item[1]
+            self.time_saved += original.execution_time
+
+        return original.model_copy(update={
+            "tool_call_id": tool_call_id,
+            "cached": True,
+            "saved_time": original.execution_time,
+            "execution_time": 0.0
+        }, deep=True)
+
+    def set(self, key: Hashable, result: ToolResult) -> None:
+        """Store a copy of a successful result"""
+        if not result.success:
+            return
+        # The caller keeps the original and may mutate its value
+        result = result.model_copy(deep=True)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.policy.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached results"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics and total execution time saved"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else None,
+            "size": len(self._entries),
+            "time_saved": self.time_saved
+        }
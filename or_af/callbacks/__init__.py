@@ -7,15 +7,23 @@ Event-driven callback system for monitoring agent execution.
 from .handlers import (
     BaseCallback,
     CallbackHandler,
+    CallbackStats,
     ConsoleCallback,
+    DispatchConfig,
     FileCallback,
     MetricsCallback
 )
+from .histogram import StreamingHistogram
+from .prometheus import PrometheusExporter
 
 __all__ = [
     "BaseCallback",
     "CallbackHandler",
+    "CallbackStats",
     "ConsoleCallback",
+    "DispatchConfig",
     "FileCallback",
     "MetricsCallback",
+    "PrometheusExporter",
+    "StreamingHistogram",
 ]
@@ -4,12 +4,41 @@ OR-AF Callbacks System
 Event-driven callback system for monitoring agent execution.
 """
 
-from typing import Any, Callable, Dict, List, Optional
+import atexit
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+import warnings
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, FrozenSet, List, Optional, Tuple
 from enum import Enum
 from abc import ABC, abstractmethod
 from datetime import datetime
 
-from ..models import EventType, AgentEvent
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+from ..exceptions import CallbackError
+from ..models import EventType, AgentEvent, StreamChunkEvent
+from ..models.event_models import EVENT_TYPES
+from .histogram import StreamingHistogram
+
+
+# What asynchronous dispatch does with an event when the buffer is full
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+# Seconds the interpreter waits at exit for each dispatcher to drain
+EXIT_DRAIN_TIMEOUT = 5.0
+
+# Compression of rotated event files, with the suffix added to their names
+COMPRESSIONS = {None: "", "gzip": ".gz", "zstd": ".zst"}
 
 
 class BaseCallback(ABC):
@@ -21,19 +50,280 @@ class BaseCallback(ABC):
         pass
 
 
+@dataclass(frozen=True)
+class DispatchConfig:
+    """
+    Settings for asynchronous callback dispatch.
+    
+    Attributes:
+        buffer_size: Events the ring buffer holds before the overflow policy applies
+        batch_size: Maximum events the worker takes from the buffer at once
+        overflow: "drop_oldest" evicts the oldest queued event, "drop_newest"
+            discards the incoming one, "block" makes the emitter wait for room
+        block_timeout: Seconds "block" waits before discarding the incoming event
+            (None waits indefinitely)
+    """
+    buffer_size: int = 10_000
+    batch_size: int = 256
+    overflow: str = "drop_oldest"
+    block_timeout: Optional[float] = None
+    
+    def __post_init__(self):
+        if self.overflow not in OVERFLOW_POLICIES:
+            raise CallbackError(f"Unknown overflow policy '{self.overflow}'")
+        if self.buffer_size < 1 or self.batch_size < 1:
+            raise CallbackError("buffer_size and batch_size must be at least 1")
+
+
+@dataclass(slots=True)
+class CallbackStats:
+    """Call count, errors and latency of one callback"""
+    calls: int = 0
+    errors: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_time": self.total_time,
+            "mean_time": self.mean_time,
+            "max_time": self.max_time
+        }
+
+
+def _callback_name(callback: Callable) -> str:
+    """Readable name of a callback, e.g. 'MetricsCallback.on_event'"""
+    return getattr(callback, "__qualname__", None) or type(callback).__qualname__
+
+
+class _AsyncDispatcher:
+    """
+    Bounded ring buffer of pending events drained by one background thread.
+    
+    Handlers enqueue (handler, event) pairs; the worker takes them in
+    batches and runs each handler's callbacks in order, timing every call.
+    The worker thread starts with the first event.
+    """
+    
+    def __init__(self, config: DispatchConfig):
+        self.config = config
+        evicting = config.overflow == "drop_oldest"
+        self._queue: Deque[Tuple["CallbackHandler", AgentEvent]] = deque(
+            maxlen=config.buffer_size if evicting else None
+        )
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._idle = threading.Condition(self._lock)
+        self._worker: Optional[threading.Thread] = None
+        self._busy = 0
+        self._closed = False
+        self._callback_stats: Dict[int, Tuple[str, CallbackStats]] = {}
+        
+        self.enqueued = 0
+        self.dispatched = 0
+        self.dropped = 0
+        _live_dispatchers.add(self)
+    
+    def put(self, handler: "CallbackHandler", event: AgentEvent) -> bool:
+        """
+        Queue an event, applying the overflow policy.
+        
+        Returns:
+            False if the caller should dispatch the event itself (the
+            dispatcher is closed, or the caller is the worker thread)
+        """
+        queue = self._queue
+        config = self.config
+        with self._lock:
+            if self._closed or threading.current_thread() is self._worker:
+                return False
+            if len(queue) >= config.buffer_size:
+                if config.overflow == "drop_newest":
+                    self.dropped += 1
+                    return True
+                if config.overflow == "block":
+                    room = self._not_full.wait_for(
+                        lambda: len(queue) < config.buffer_size or self._closed,
+                        config.block_timeout
+                    )
+                    if self._closed:
+                        return False
+                    if not room:
+                        self.dropped += 1
+                        return True
+                else:
+                    # The deque evicts the oldest event on append
+                    self.dropped += 1
+            queue.append((handler, event))
+            self.enqueued += 1
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="or-af-callbacks", daemon=True)
+                self._worker.start()
+            elif len(queue) == 1:
+                # The worker only waits when the buffer is empty
+                self._not_empty.notify()
+        return True
+    
+    def _run(self) -> None:
+        queue = self._queue
+        while True:
+            with self._lock:
+                while not queue and not self._closed:
+                    self._not_empty.wait()
+                if not queue:
+                    return
+                batch = [queue.popleft() for _ in range(min(self.config.batch_size, len(queue)))]
+                self._busy = len(batch)
+                self._not_full.notify_all()
+            
+            for handler, event in batch:
+                handler._dispatch(event, self._record)
+            
+            with self._lock:
+                self.dispatched += self._busy
+                self._busy = 0
+                if not queue:
+                    self._idle.notify_all()
+    
+    def _record(self, callback: Callable, elapsed: float, failed: bool) -> None:
+        entry = self._callback_stats.get(id(callback))
+        if entry is None:
+            with self._lock:
+                entry = self._callback_stats.setdefault(
+                    id(callback), (_callback_name(callback), CallbackStats())
+                )
+        stats = entry[1]
+        stats.calls += 1
+        stats.total_time += elapsed
+        if elapsed > stats.max_time:
+            stats.max_time = elapsed
+        if failed:
+            stats.errors += 1
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        if threading.current_thread() is self._worker:
+            return False
+        with self._lock:
+            return self._idle.wait_for(lambda: not self._queue and not self._busy, timeout)
+    
+    def close(self, timeout: Optional[float] = None) -> bool:
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+            worker = self._worker
+        if worker is None or worker is threading.current_thread():
+            return True
+        worker.join(timeout)
+        return not worker.is_alive()
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = list(self._callback_stats.values())
+            stats = {
+                "queued": len(self._queue),
+                "enqueued": self.enqueued,
+                "dispatched": self.dispatched,
+                "dropped": self.dropped
+            }
+        callbacks: Dict[str, Dict[str, Any]] = {}
+        for name, callback_stats in entries:
+            key, n = name, 1
+            while key in callbacks:
+                n += 1
+                key = f"{name} #{n}"
+            callbacks[key] = callback_stats.to_dict()
+        stats["callbacks"] = callbacks
+        return stats
+
+
+_live_dispatchers: "weakref.WeakSet[_AsyncDispatcher]" = weakref.WeakSet()
+_open_files: "weakref.WeakSet[FileCallback]" = weakref.WeakSet()
+
+
+@atexit.register
+def _drain_at_exit() -> None:
+    """Deliver queued events and write buffered ones before the interpreter exits"""
+    for dispatcher in list(_live_dispatchers):
+        dispatcher.close(EXIT_DRAIN_TIMEOUT)
+    for file_callback in list(_open_files):
+        try:
+            file_callback.close()
+        except Exception:
+            pass
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize values json does not handle natively"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, 'model_dump'):
+        return value.model_dump()
+    return str(value)
+
+
+# Shared encoder; json.dumps() with options builds a new one per call
+_event_encoder = json.JSONEncoder(default=_json_default)
+
+
 class CallbackHandler(BaseCallback):
     """
     Callback handler for agent events.
     
     Register callbacks for specific event types to monitor
     and respond to agent execution events.
+    
+    By default callbacks run inline in the thread emitting the event. With a
+    ``DispatchConfig`` events are instead pushed onto a bounded ring buffer
+    and delivered in order by a background worker, so slow callbacks never
+    hold up the agent; what happens when the buffer is full is set by the
+    overflow policy. Call ``flush()`` before reading state that callbacks
+    collect, and ``stats()`` for drop counts and per-callback latency.
+    
+    Example:
+        ```python
+        handler = CallbackHandler(dispatch=DispatchConfig(buffer_size=50_000, overflow="drop_oldest"))
+        handler.register_global(metrics.on_event)
+        agent.callback_handler = handler
+        
+        agent.run("...")
+        handler.flush()
+        print(metrics.get_metrics(), handler.stats()["dropped"])
+        ```
     """
     
-    def __init__(self):
+    def __init__(self, dispatch: Optional[DispatchConfig] = None):
+        """
+        Args:
+            dispatch: Optional settings enabling asynchronous dispatch
+        """
         self._callbacks: Dict[EventType, List[Callable[[AgentEvent], None]]] = {
             event_type: [] for event_type in EventType
         }
         self._global_callbacks: List[Callable[[AgentEvent], None]] = []
+        # Event types with at least one callback; emit() skips all others
+        self._listening: FrozenSet[EventType] = frozenset()
+        self._dispatcher = _AsyncDispatcher(dispatch) if dispatch is not None else None
+    
+    def _update_listening(self) -> None:
+        if self._global_callbacks:
+            self._listening = frozenset(EventType)
+        else:
+            self._listening = frozenset(
+                EVENT_TYPES.get(event_type, event_type)
+                for event_type, callbacks in self._callbacks.items() if callbacks
+            )
+    
+    def is_listening(self, event_type: EventType) -> bool:
+        """Whether any callback receives events of this type"""
+        return event_type in self._listening
     
     def register(
         self,
@@ -44,10 +334,12 @@ class CallbackHandler(BaseCallback):
         if event_type not in self._callbacks:
             self._callbacks[event_type] = []
         self._callbacks[event_type].append(callback)
+        self._update_listening()
     
     def register_global(self, callback: Callable[[AgentEvent], None]) -> None:
         """Register a callback for all events"""
         self._global_callbacks.append(callback)
+        self._update_listening()
     
     def unregister(
         self,
@@ -58,36 +350,116 @@ class CallbackHandler(BaseCallback):
         if event_type in self._callbacks:
             try:
                 self._callbacks[event_type].remove(callback)
-                return True
             except ValueError:
                 return False
+            self._update_listening()
+            return True
         return False
     
+    def copy(self) -> "CallbackHandler":
+        """
+        Create an independent handler with the same registrations.
+        
+        An asynchronous handler's copy shares its dispatcher (buffer, worker and stats).
+        """
+        handler = CallbackHandler.__new__(CallbackHandler)
+        handler._callbacks = {
+            event_type: list(callbacks) for event_type, callbacks in self._callbacks.items()
+        }
+        handler._global_callbacks = list(self._global_callbacks)
+        handler._listening = self._listening
+        handler._dispatcher = self._dispatcher
+        return handler
+    
     def on_event(self, event: AgentEvent) -> None:
-        """Handle an event by calling registered callbacks"""
-        # Call global callbacks
-        for callback in self._global_callbacks:
-            try:
-                callback(event)
-            except Exception:
-                pass  # Don't let callback errors crash the agent
+        """Handle an event by calling registered callbacks, or queue it in asynchronous mode"""
+        if self._dispatcher is not None and self._dispatcher.put(self, event):
+            return
+        self._dispatch(event)
+    
+    def _dispatch(
+        self,
+        event: AgentEvent,
+        record: Optional[Callable[[Callable, float, bool], None]] = None
+    ) -> None:
+        """Call the registered callbacks, reporting each call's latency to ``record`` if given"""
+        typed_callbacks = self._callbacks.get(EVENT_TYPES.get(event.event_type, event.event_type), ())
         
-        # Call event-specific callbacks
-        event_type = EventType(event.event_type) if isinstance(event.event_type, str) else event.event_type
-        if event_type in self._callbacks:
-            for callback in self._callbacks[event_type]:
+        if record is None:
+            for callback in self._global_callbacks:
+                try:
+                    callback(event)
+                except Exception:
+                    pass  # Don't let callback errors crash the agent
+            for callback in typed_callbacks:
                 try:
                     callback(event)
                 except Exception:
                     pass
+            return
+        
+        # The worker iterates a snapshot, as registrations may change concurrently
+        for callback in [*self._global_callbacks, *typed_callbacks]:
+            start = time.perf_counter()
+            failed = False
+            try:
+                callback(event)
+            except Exception:
+                failed = True
+            record(callback, time.perf_counter() - start, failed)
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued event has been delivered.
+        
+        Returns:
+            True if the buffer drained (always, for a synchronous handler)
+        """
+        return self._dispatcher.flush(timeout) if self._dispatcher is not None else True
+    
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Deliver the queued events and stop the worker.
+        
+        Events emitted afterwards are dispatched synchronously.
+        
+        Returns:
+            True if the worker finished within ``timeout``
+        """
+        return self._dispatcher.close(timeout) if self._dispatcher is not None else True
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get dispatch statistics.
+        
+        For asynchronous handlers: events queued, enqueued, dispatched and
+        dropped, and per-callback calls, errors and total/mean/max latency.
+        """
+        if self._dispatcher is None:
+            return {"mode": "sync"}
+        return {"mode": "async", **self._dispatcher.stats()}
+    
+    def __enter__(self) -> "CallbackHandler":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
     
     def emit(
         self,
         event_type: EventType,
         iteration: Optional[int] = None,
         **data
-    ) -> AgentEvent:
-        """Create and emit an event"""
+    ) -> Optional[AgentEvent]:
+        """
+        Create and emit an event.
+        
+        Returns:
+            The event, or None if no callback listens to ``event_type``, in
+            which case no event is created
+        """
+        if event_type not in self._listening:
+            return None
         event = AgentEvent(
             event_type=event_type,
             iteration=iteration,
@@ -95,6 +467,19 @@ class CallbackHandler(BaseCallback):
         )
         self.on_event(event)
         return event
+    
+    def emit_chunk(self, chunk: str, iteration: Optional[int] = None) -> Optional[StreamChunkEvent]:
+        """
+        Emit a STREAM_CHUNK event for a streamed text fragment.
+        
+        Same as ``emit(EventType.STREAM_CHUNK, chunk=chunk)`` but creates a
+        lightweight StreamChunkEvent instead of an AgentEvent.
+        """
+        if EventType.STREAM_CHUNK not in self._listening:
+            return None
+        event = StreamChunkEvent(chunk, iteration)
+        self.on_event(event)
+        return event
 
 
 class ConsoleCallback(BaseCallback):
@@ -114,7 +499,8 @@ class ConsoleCallback(BaseCallback):
             EventType.TOOL_ERROR: "❌",
             EventType.STREAM_CHUNK: "📝",
             EventType.ERROR: "⚠️",
-            EventType.WARNING: "⚡"
+            EventType.WARNING: "⚡",
+            EventType.NODE_END: "🧩"
         }
     
     def on_event(self, event: AgentEvent) -> None:
@@ -122,7 +508,7 @@ class ConsoleCallback(BaseCallback):
         if not self.verbose:
             return
         
-        event_type = EventType(event.event_type) if isinstance(event.event_type, str) else event.event_type
+        event_type = EVENT_TYPES.get(event.event_type, event.event_type)
         icon = self._event_icons.get(event_type, "📌")
         
         timestamp = event.timestamp.strftime("%H:%M:%S")
@@ -144,100 +530,415 @@ class ConsoleCallback(BaseCallback):
 
 
 class FileCallback(BaseCallback):
-    """Callback that writes events to a file"""
+    """
+    Callback that writes events to a file as JSON lines.
+    
+    The file stays open; lines are buffered and written in batches when
+    ``buffer_size`` events are pending and every ``flush_interval`` seconds
+    from a background thread. Rotation (``max_bytes`` and/or
+    ``rotate_interval``) renames the file to ``<filepath>.1`` (shifting older
+    backups up to ``backup_count``) between batches, optionally compressing
+    the backups with gzip or zstd (``pip install zstandard``). Call
+    ``close()`` (or use it as a context manager) to write the remaining
+    events; open callbacks are also closed at interpreter exit.
     
-    def __init__(self, filepath: str, append: bool = True):
+    Example:
+        ```python
+        events = FileCallback("events.jsonl", max_bytes=50_000_000, backup_count=10, compression="gzip")
+        agent = Agent(system_prompt="...", callbacks=[events])
+        ```
+    """
+    
+    def __init__(
+        self,
+        filepath: str,
+        append: bool = True,
+        buffer_size: int = 1000,
+        flush_interval: Optional[float] = 1.0,
+        max_bytes: Optional[int] = None,
+        rotate_interval: Optional[float] = None,
+        backup_count: int = 5,
+        compression: Optional[str] = None
+    ):
+        """
+        Args:
+            filepath: File to write to
+            append: Append to an existing file instead of truncating it
+            buffer_size: Pending events that trigger a write
+            flush_interval: Seconds between background flushes (None disables the thread)
+            max_bytes: Rotate once the file would exceed this size
+            rotate_interval: Rotate once the file has been open this many seconds
+            backup_count: Rotated files to keep
+            compression: None, "gzip" or "zstd" for rotated files
+        """
+        if compression not in COMPRESSIONS:
+            raise CallbackError(f"Unknown compression '{compression}'")
+        if compression == "zstd" and zstandard is None:
+            raise CallbackError("zstd compression requires the zstandard package")
+        if buffer_size < 1:
+            raise CallbackError("buffer_size must be at least 1")
+        
         self.filepath = filepath
-        self.mode = 'a' if append else 'w'
+        self.mode = 'ab' if append else 'wb'
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.compression = compression
+        
+        self._lines: List[str] = []
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._file: Optional[Any] = None
+        self._size = 0
+        self._opened_at = 0.0
+        self._closed = False
+        self.rotations = 0
+        
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval:
+            self._flusher = threading.Thread(target=self._flush_periodically, name="or-af-file-flush", daemon=True)
+            self._flusher.start()
+        _open_files.add(self)
     
     def on_event(self, event: AgentEvent) -> None:
-        """Write event to file"""
-        import json
-        
-        log_entry = {
+        """Buffer the event, writing the batch once it is full"""
+        if self._closed:
+            return
+        event_type = event.event_type
+        line = _event_encoder.encode({
             "timestamp": event.timestamp.isoformat(),
-            "event_type": event.event_type.value if hasattr(event.event_type, 'value') else event.event_type,
+            "event_type": event_type.value if isinstance(event_type, Enum) else event_type,
             "iteration": event.iteration,
-            "data": self._serialize_data(event.data)
-        }
+            "data": event.data
+        })
+        with self._buffer_lock:
+            self._lines.append(line)
+            full = len(self._lines) >= self.buffer_size
+        if full:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Write the buffered events"""
+        with self._buffer_lock:
+            if not self._lines:
+                return
+            lines, self._lines = self._lines, []
+        data = ("\n".join(lines) + "\n").encode("utf-8")
         
-        with open(self.filepath, self.mode) as f:
-            f.write(json.dumps(log_entry) + "\n")
-    
-    def _serialize_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Serialize data for JSON output"""
-        result = {}
-        for key, value in data.items():
-            if isinstance(value, datetime):
-                result[key] = value.isoformat()
-            elif hasattr(value, 'model_dump'):
-                result[key] = value.model_dump()
-            elif hasattr(value, '__dict__'):
-                result[key] = str(value)
+        with self._write_lock:
+            if self._closed:
+                return
+            if self._file is None:
+                self._open()
+            elif self._should_rotate(len(data)):
+                self._rotate()
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data)
+    
+    def _open(self) -> None:
+        self._file = open(self.filepath, self.mode)
+        self._size = self._file.tell() if self.mode == 'ab' else 0
+        self._opened_at = time.time()
+        # A file reopened after rotation starts empty either way
+        self.mode = 'ab'
+    
+    def _should_rotate(self, pending: int) -> bool:
+        if self._size == 0:
+            return False
+        if self.max_bytes is not None and self._size + pending > self.max_bytes:
+            return True
+        return self.rotate_interval is not None and time.time() - self._opened_at >= self.rotate_interval
+    
+    def _backup_name(self, index: int) -> str:
+        suffix = COMPRESSIONS[self.compression]
+        return f"{self.filepath}.{index}{suffix}"
+    
+    def _rotate(self) -> None:
+        """Close the file, shift the backups and start a new file"""
+        self._file.close()
+        self._file = None
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = self._backup_name(index)
+                if os.path.exists(source):
+                    os.replace(source, self._backup_name(index + 1))
+            if self.compression is None:
+                os.replace(self.filepath, self._backup_name(1))
             else:
-                try:
-                    import json
-                    json.dumps(value)
-                    result[key] = value
-                except (TypeError, ValueError):
-                    result[key] = str(value)
-        return result
+                self._compress(self.filepath, self._backup_name(1))
+                os.remove(self.filepath)
+        else:
+            os.remove(self.filepath)
+        self.rotations += 1
+        self._open()
+    
+    def _compress(self, source: str, target: str) -> None:
+        with open(source, 'rb') as src:
+            if self.compression == "gzip":
+                with gzip.open(target, 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+            else:
+                with open(target, 'wb') as dst:
+                    zstandard.ZstdCompressor().copy_stream(src, dst)
+    
+    def _flush_periodically(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                pass  # Don't let a failed write stop the flush thread
+    
+    def close(self) -> None:
+        """
+        Write the remaining events, stop the flush thread and close the file.
+        
+        Events received afterwards are discarded.
+        """
+        self._stop.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        self.flush()
+        with self._write_lock:
+            self._closed = True
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        _open_files.discard(self)
+    
+    def __enter__(self) -> "FileCallback":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
 
 class MetricsCallback(BaseCallback):
-    """Callback that collects metrics about agent execution"""
+    """
+    Callback that collects metrics about agent execution.
+    
+    Durations are recorded in fixed-memory StreamingHistograms, so memory
+    stays bounded however long the callback runs: run, iteration, LLM
+    request, time-to-first-token and tool call latencies (overall and per
+    tool), workflow node execution times (from NODE_END events), plus
+    completion tokens per second. Token totals, run outcomes and errors by
+    exception class are counted alongside. One instance can be shared by
+    many agents, workflows and threads; ``snapshot()`` and ``reset()`` are
+    safe to call from any thread.
+    
+    Example:
+        ```python
+        metrics = MetricsCallback()
+        agent = Agent(system_prompt="...", callbacks=[metrics])
+        agent.run("...")
+        snapshot = metrics.snapshot()
+        print(snapshot["latency"]["tool_call"]["p95"], snapshot["tools"]["search"]["p99"])
+        ```
+    """
     
-    def __init__(self):
+    def __init__(self, relative_error: float = 0.01):
+        """
+        Args:
+            relative_error: Maximum relative error of the reported percentiles
+        """
+        self.relative_error = relative_error
+        self._lock = threading.Lock()
         self.reset()
     
+    def _histogram(self) -> StreamingHistogram:
+        return StreamingHistogram(relative_error=self.relative_error)
+    
+    @property
+    def tool_execution_times(self) -> List[float]:
+        """
+        Deprecated: use ``tool_durations``.
+        
+        Tool call durations in ascending order, each within ``relative_error``
+        of the recorded value.
+        """
+        warnings.warn(
+            "MetricsCallback.tool_execution_times is deprecated; use tool_durations",
+            DeprecationWarning,
+            stacklevel=2
+        )
+        with self._lock:
+            return self.tool_durations.values()
+    
     def reset(self) -> None:
         """Reset all metrics"""
-        self.total_iterations = 0
-        self.total_tool_calls = 0
-        self.successful_tool_calls = 0
-        self.failed_tool_calls = 0
-        self.start_time: Optional[datetime] = None
-        self.end_time: Optional[datetime] = None
-        self.tool_execution_times: List[float] = []
+        with self._lock:
+            self.total_iterations = 0
+            self.total_tool_calls = 0
+            self.successful_tool_calls = 0
+            self.failed_tool_calls = 0
+            self.successful_runs = 0
+            self.failed_runs = 0
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
+            self.start_time: Optional[datetime] = None
+            self.end_time: Optional[datetime] = None
+            self.event_counts: Dict[str, int] = {}
+            self.run_durations = self._histogram()
+            self.iteration_durations = self._histogram()
+            self.llm_durations = self._histogram()
+            self.time_to_first_token = self._histogram()
+            self.tokens_per_second = self._histogram()
+            self.tool_durations = self._histogram()
+            self.tool_durations_by_name: Dict[str, StreamingHistogram] = {}
+            self.tool_successes_by_name: Dict[str, int] = {}
+            self.tool_errors_by_name: Dict[str, int] = {}
+            self.errors_by_type: Dict[str, int] = {}
+            # Keyed by (workflow, node) and (workflow, node, status)
+            self.node_durations: Dict[Tuple[str, str], StreamingHistogram] = {}
+            self.node_results: Dict[Tuple[str, str, str], int] = {}
     
     def on_event(self, event: AgentEvent) -> None:
         """Collect metrics from events"""
-        event_type = EventType(event.event_type) if isinstance(event.event_type, str) else event.event_type
-        
-        if event_type == EventType.AGENT_START:
-            self.start_time = event.timestamp
-        elif event_type == EventType.AGENT_END:
-            self.end_time = event.timestamp
-        elif event_type == EventType.ITERATION_END:
-            self.total_iterations += 1
-        elif event_type == EventType.TOOL_CALL_END:
-            self.total_tool_calls += 1
-            self.successful_tool_calls += 1
-            if 'execution_time' in event.data:
-                self.tool_execution_times.append(event.data['execution_time'])
-        elif event_type == EventType.TOOL_ERROR:
-            self.total_tool_calls += 1
-            self.failed_tool_calls += 1
-    
-    def get_metrics(self) -> Dict[str, Any]:
-        """Get collected metrics"""
-        total_time = None
-        if self.start_time and self.end_time:
-            total_time = (self.end_time - self.start_time).total_seconds()
+        event_type = EVENT_TYPES.get(event.event_type, event.event_type)
         
-        avg_tool_time = None
-        if self.tool_execution_times:
-            avg_tool_time = sum(self.tool_execution_times) / len(self.tool_execution_times)
+        with self._lock:
+            self.event_counts[event_type.value] = self.event_counts.get(event_type.value, 0) + 1
+            
+            if event_type == EventType.AGENT_START:
+                self.start_time = event.timestamp
+            elif event_type == EventType.AGENT_END:
+                self.end_time = event.timestamp
+                if event.data.get('success'):
+                    self.successful_runs += 1
+                else:
+                    self.failed_runs += 1
+                duration = event.data.get('duration')
+                if duration is not None:
+                    self.run_durations.record(duration)
+            elif event_type == EventType.ITERATION_END:
+                self.total_iterations += 1
+                self._record_iteration(event.data)
+            elif event_type == EventType.TOOL_CALL_END:
+                self.total_tool_calls += 1
+                data = event.data
+                tool_name = data.get('tool_name')
+                # Tools that raised return an error result rather than a TOOL_ERROR
+                if data.get('success', True):
+                    self.successful_tool_calls += 1
+                    self.tool_successes_by_name[tool_name] = self.tool_successes_by_name.get(tool_name, 0) + 1
+                else:
+                    self.failed_tool_calls += 1
+                    self.tool_errors_by_name[tool_name] = self.tool_errors_by_name.get(tool_name, 0) + 1
+                    self._record_error(data)
+                execution_time = data.get('execution_time')
+                if execution_time is not None:
+                    self.tool_durations.record(execution_time)
+                    histogram = self.tool_durations_by_name.get(tool_name)
+                    if histogram is None:
+                        histogram = self.tool_durations_by_name[tool_name] = self._histogram()
+                    histogram.record(execution_time)
+            elif event_type == EventType.TOOL_ERROR:
+                self.total_tool_calls += 1
+                self.failed_tool_calls += 1
+                tool_name = event.data.get('tool_name')
+                self.tool_errors_by_name[tool_name] = self.tool_errors_by_name.get(tool_name, 0) + 1
+                self._record_error(event.data)
+            elif event_type == EventType.ERROR:
+                self._record_error(event.data)
+            elif event_type == EventType.NODE_END:
+                self._record_node(event.data)
+    
+    def _record_error(self, data: Dict[str, Any]) -> None:
+        error_type = data.get('error_type') or "Exception"
+        self.errors_by_type[error_type] = self.errors_by_type.get(error_type, 0) + 1
+    
+    def _record_node(self, data: Dict[str, Any]) -> None:
+        node = (data.get('workflow'), data.get('node'))
+        key = node + (data.get('status'),)
+        self.node_results[key] = self.node_results.get(key, 0) + 1
+        if data.get('error_type'):
+            self._record_error(data)
+        execution_time = data.get('execution_time')
+        if execution_time is not None:
+            histogram = self.node_durations.get(node)
+            if histogram is None:
+                histogram = self.node_durations[node] = self._histogram()
+            histogram.record(execution_time)
+    
+    def _record_iteration(self, data: Dict[str, Any]) -> None:
+        duration = data.get('duration')
+        if duration is not None:
+            self.iteration_durations.record(duration)
+        self.prompt_tokens += data.get('prompt_tokens') or 0
+        self.completion_tokens += data.get('completion_tokens') or 0
+        llm_time = data.get('llm_time')
+        if llm_time is None:
+            return
+        self.llm_durations.record(llm_time)
+        time_to_first_token = data.get('time_to_first_token')
+        if time_to_first_token is not None:
+            self.time_to_first_token.record(time_to_first_token)
+        completion_tokens = data.get('completion_tokens')
+        generation_time = llm_time - (time_to_first_token or 0.0)
+        if completion_tokens and generation_time > 0:
+            self.tokens_per_second.record(completion_tokens / generation_time)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a consistent copy of all metrics.
         
-        return {
-            "total_iterations": self.total_iterations,
-            "total_tool_calls": self.total_tool_calls,
-            "successful_tool_calls": self.successful_tool_calls,
-            "failed_tool_calls": self.failed_tool_calls,
-            "total_execution_time": total_time,
-            "average_tool_execution_time": avg_tool_time,
-            "tool_success_rate": (
-                self.successful_tool_calls / self.total_tool_calls
-                if self.total_tool_calls > 0 else None
-            )
-        }
+        Returns:
+            The get_metrics() totals plus ``event_counts``, ``latency`` (summaries
+            with count, mean, min, max, p50, p95 and p99 for agent_run, iteration,
+            llm_call, time_to_first_token and tool_call), ``tokens_per_second``,
+            ``tools`` (per tool name, including ``errors``), ``runs``, ``tokens``,
+            ``errors_by_type`` and ``nodes`` (per "workflow/node", including
+            counts by ``status``)
+        """
+        with self._lock:
+            total_time = None
+            if self.start_time and self.end_time:
+                total_time = (self.end_time - self.start_time).total_seconds()
+            tools: Dict[str, Dict[str, Any]] = {
+                name: histogram.summary() for name, histogram in self.tool_durations_by_name.items()
+            }
+            for name, errors in self.tool_errors_by_name.items():
+                tools.setdefault(name, self._histogram().summary())["errors"] = errors
+            for summary in tools.values():
+                summary.setdefault("errors", 0)
+            nodes: Dict[str, Dict[str, Any]] = {
+                f"{workflow}/{node}": dict(histogram.summary(), status={})
+                for (workflow, node), histogram in self.node_durations.items()
+            }
+            for (workflow, node, status), count in self.node_results.items():
+                summary = nodes.setdefault(f"{workflow}/{node}", dict(self._histogram().summary(), status={}))
+                summary["status"][status] = count
+            
+            return {
+                "total_iterations": self.total_iterations,
+                "total_tool_calls": self.total_tool_calls,
+                "successful_tool_calls": self.successful_tool_calls,
+                "failed_tool_calls": self.failed_tool_calls,
+                "total_execution_time": total_time,
+                "average_tool_execution_time": self.tool_durations.mean,
+                "tool_success_rate": (
+                    self.successful_tool_calls / self.total_tool_calls
+                    if self.total_tool_calls > 0 else None
+                ),
+                "event_counts": dict(self.event_counts),
+                "latency": {
+                    "agent_run": self.run_durations.summary(),
+                    "iteration": self.iteration_durations.summary(),
+                    "llm_call": self.llm_durations.summary(),
+                    "time_to_first_token": self.time_to_first_token.summary(),
+                    "tool_call": self.tool_durations.summary()
+                },
+                "tokens_per_second": self.tokens_per_second.summary(),
+                "tools": tools,
+                "runs": {"succeeded": self.successful_runs, "failed": self.failed_runs},
+                "tokens": {"prompt": self.prompt_tokens, "completion": self.completion_tokens},
+                "errors_by_type": dict(self.errors_by_type),
+                "nodes": nodes
+            }
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get collected metrics (same as snapshot())"""
+        return self.snapshot()
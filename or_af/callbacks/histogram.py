@@ -0,0 +1,163 @@
+"""
+OR-AF Streaming Histogram
+
+Fixed-memory latency histogram used by the metrics callbacks.
+"""
+
+import bisect
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+
+class StreamingHistogram:
+    """
+    Histogram of positive values in logarithmic buckets (HDR style).
+    
+    Bucket boundaries grow geometrically so every recorded value is
+    represented within ``relative_error`` of its true value, and memory is
+    bounded by the number of buckets between ``lowest`` and ``highest``
+    (about 1,400 for the defaults, allocated only when used). Values outside
+    that range are clamped to the outermost buckets; count, sum, min and
+    max are exact.
+    
+    Not thread-safe on its own; MetricsCallback guards its histograms with a lock.
+    
+    Example:
+        ```python
+        latencies = StreamingHistogram()
+        for seconds in samples:
+            latencies.record(seconds)
+        print(latencies.percentile(99), latencies.summary())
+        ```
+    """
+    
+    __slots__ = (
+        "lowest", "highest", "relative_error",
+        "_log_lowest", "_log_growth", "_max_index", "_buckets",
+        "count", "total", "min", "max"
+    )
+    
+    def __init__(self, lowest: float = 1e-6, highest: float = 1e6, relative_error: float = 0.01):
+        """
+        Args:
+            lowest: Smallest value resolved by the buckets
+            highest: Largest value resolved by the buckets
+            relative_error: Maximum relative error of reported percentiles
+        """
+        if not 0 < lowest < highest:
+            raise ValueError("Histogram range must satisfy 0 < lowest < highest")
+        if not 0 < relative_error < 1:
+            raise ValueError("relative_error must be between 0 and 1")
+        self.lowest = lowest
+        self.highest = highest
+        self.relative_error = relative_error
+        # A bucket's geometric midpoint is within relative_error of its whole range
+        self._log_growth = math.log((1 + relative_error) / (1 - relative_error))
+        self._log_lowest = math.log(lowest)
+        self._max_index = int((math.log(highest) - self._log_lowest) / self._log_growth)
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def record(self, value: float) -> None:
+        """Add one value"""
+        if value < self.lowest:
+            index = -1
+        else:
+            index = min(int((math.log(value) - self._log_lowest) / self._log_growth), self._max_index)
+        buckets = self._buckets
+        buckets[index] = buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+    
+    def bucket_upper_bound(self, index: int) -> float:
+        """Exclusive upper boundary of a bucket"""
+        return math.exp(self._log_lowest + (index + 1) * self._log_growth)
+    
+    def _bucket_value(self, index: int) -> float:
+        if index < 0:
+            return self.min
+        value = math.exp(self._log_lowest + (index + 0.5) * self._log_growth)
+        return min(max(value, self.min), self.max)
+    
+    def percentile(self, percent: float) -> Optional[float]:
+        """Nearest-rank percentile, or None if nothing was recorded"""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(percent / 100 * self.count))
+        if rank >= self.count:
+            return self.max
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return self._bucket_value(index)
+        return self.max
+    
+    def cumulative_counts(self, bounds: Sequence[float]) -> List[int]:
+        """
+        Number of values less than or equal to each bound, for exporting
+        fixed-boundary histograms (e.g. Prometheus ``le`` buckets).
+        
+        Each bucket is attributed to its representative value, so counts near
+        a bound are accurate to within ``relative_error`` of that bound.
+        
+        Args:
+            bounds: Upper bounds in ascending order
+        """
+        counts = [0] * len(bounds)
+        for index, count in self._buckets.items():
+            position = bisect.bisect_left(bounds, self._bucket_value(index))
+            if position < len(counts):
+                counts[position] += count
+        for position in range(1, len(counts)):
+            counts[position] += counts[position - 1]
+        return counts
+    
+    def values(self) -> List[float]:
+        """Every recorded value as its bucket's representative value, in ascending order"""
+        return [
+            self._bucket_value(index)
+            for index in sorted(self._buckets)
+            for _ in range(self._buckets[index])
+        ]
+    
+    def buckets(self) -> Dict[int, int]:
+        """Non-empty bucket counts by bucket index (-1 holds values below ``lowest``)"""
+        return dict(self._buckets)
+    
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+    
+    def summary(self) -> Dict[str, Any]:
+        """Count, sum, mean, min, max and p50/p95/p99"""
+        if not self.count:
+            return {"count": 0, "sum": 0.0, "mean": None, "min": None, "max": None, "p50": None, "p95": None, "p99": None}
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99)
+        }
+    
+    def reset(self) -> None:
+        """Drop all recorded values"""
+        self._buckets.clear()
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def __repr__(self) -> str:
+        return f"StreamingHistogram(count={self.count}, p50={self.percentile(50)}, p99={self.percentile(99)})"
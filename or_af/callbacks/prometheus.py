@@ -0,0 +1,270 @@
+"""
+OR-AF Prometheus Exporter
+
+Publishes the metrics collected by MetricsCallback in the Prometheus text
+and OpenMetrics exposition formats.
+"""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from ..exceptions import CallbackError
+from .handlers import MetricsCallback
+from .histogram import StreamingHistogram
+
+
+# Default bucket bounds, in seconds, of the latency histograms
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Default bucket bounds of the completion tokens per second histogram
+DEFAULT_THROUGHPUT_BUCKETS = (1.0, 5.0, 10.0, 25.0, 50.0, 75.0, 100.0, 150.0, 250.0, 500.0)
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_INF_BUCKET = 'le="+Inf"'
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{name}="{_escape_label(value)}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Family:
+    """Samples of one metric family being rendered"""
+    
+    __slots__ = ("name", "kind", "help", "lines")
+    
+    def __init__(self, name: str, kind: str, help: str):
+        self.name = name
+        self.kind = kind
+        self.help = help
+        self.lines: List[str] = []
+    
+    def counter(self, value: int, labels: Labels = ()) -> None:
+        self.lines.append(f"{self.name}_total{_format_labels(labels)} {_format_value(value)}")
+    
+    def histogram(self, histogram: StreamingHistogram, bounds: Sequence[float], labels: Labels = ()) -> None:
+        for bound, count in zip(bounds, histogram.cumulative_counts(bounds)):
+            le = f'le="{_format_value(float(bound))}"'
+            self.lines.append(f"{self.name}_bucket{_format_labels(labels, le)} {count}")
+        self.lines.append(f"{self.name}_bucket{_format_labels(labels, _INF_BUCKET)} {histogram.count}")
+        self.lines.append(f"{self.name}_count{_format_labels(labels)} {histogram.count}")
+        self.lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(histogram.total)}")
+    
+    def render(self, openmetrics: bool) -> Iterable[str]:
+        help_text = self.help.replace("\\", "\\\\").replace("\n", "\\n")
+        # Prometheus text names counters by their sample name, OpenMetrics by the family
+        name = self.name if openmetrics or self.kind != "counter" else f"{self.name}_total"
+        yield f"# HELP {name} {help_text}"
+        yield f"# TYPE {name} {self.kind}"
+        yield from self.lines
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serves the exporter of its server at /metrics"""
+    
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+        body = self.server.exporter.render(openmetrics=openmetrics).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class PrometheusExporter(MetricsCallback):
+    """
+    MetricsCallback that exposes its metrics to Prometheus.
+    
+    Events are recorded exactly as MetricsCallback records them (a dict
+    update and a histogram bucket increment under a lock), and the
+    exposition text is only built when it is scraped or written, so the
+    per-event overhead is that of MetricsCallback. Histograms keep their
+    fixed-memory log buckets and are folded into the configured ``le``
+    bounds at render time.
+    
+    Exported families (prefixed with ``namespace``): agent runs by status,
+    run, iteration, LLM request and time-to-first-token durations, LLM calls,
+    prompt and completion tokens, tokens per second, tool calls and durations
+    by tool, workflow node executions by status and durations by node
+    (NODE_END events from WorkflowGraph callbacks), errors by exception class
+    and events by type.
+    
+    Example:
+        ```python
+        exporter = PrometheusExporter()
+        exporter.serve(port=9464)  # scrape http://127.0.0.1:9464/metrics
+        agent = Agent(system_prompt="...", callbacks=[exporter])
+        workflow = WorkflowGraph(name="pipeline", callbacks=[exporter])
+        ```
+    """
+    
+    def __init__(
+        self,
+        namespace: str = "or_af",
+        latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+        throughput_buckets: Sequence[float] = DEFAULT_THROUGHPUT_BUCKETS,
+        relative_error: float = 0.01
+    ):
+        """
+        Args:
+            namespace: Prefix of every metric name
+            latency_buckets: Ascending upper bounds, in seconds, of the duration histograms
+            throughput_buckets: Ascending upper bounds of the tokens per second histogram
+            relative_error: Maximum relative error of the underlying histograms
+        """
+        for buckets in (latency_buckets, throughput_buckets):
+            if not buckets or list(buckets) != sorted(set(buckets)):
+                raise CallbackError("Histogram buckets must be non-empty and strictly ascending")
+        self.namespace = namespace
+        self.latency_buckets = tuple(float(bound) for bound in latency_buckets)
+        self.throughput_buckets = tuple(float(bound) for bound in throughput_buckets)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._server_thread: Optional[threading.Thread] = None
+        super().__init__(relative_error=relative_error)
+    
+    def _collect(self) -> List[_Family]:
+        def family(name: str, kind: str, help: str) -> _Family:
+            families.append(_Family(f"{self.namespace}_{name}", kind, help))
+            return families[-1]
+        
+        families: List[_Family] = []
+        latency = self.latency_buckets
+        
+        runs = family("agent_runs", "counter", "Agent runs by outcome")
+        runs.counter(self.successful_runs, (("status", "succeeded"),))
+        runs.counter(self.failed_runs, (("status", "failed"),))
+        family("agent_run_duration_seconds", "histogram", "Agent run duration").histogram(self.run_durations, latency)
+        family("agent_iterations", "counter", "Agent loop iterations").counter(self.total_iterations)
+        family("agent_iteration_duration_seconds", "histogram", "Agent iteration duration").histogram(
+            self.iteration_durations, latency
+        )
+        
+        family("llm_calls", "counter", "LLM requests").counter(self.llm_durations.count)
+        family("llm_request_duration_seconds", "histogram", "LLM request duration").histogram(
+            self.llm_durations, latency
+        )
+        family("llm_time_to_first_token_seconds", "histogram", "Time to the first streamed token").histogram(
+            self.time_to_first_token, latency
+        )
+        tokens = family("llm_tokens", "counter", "LLM tokens by type")
+        tokens.counter(self.prompt_tokens, (("type", "prompt"),))
+        tokens.counter(self.completion_tokens, (("type", "completion"),))
+        family("llm_tokens_per_second", "histogram", "Completion tokens generated per second").histogram(
+            self.tokens_per_second, self.throughput_buckets
+        )
+        
+        tool_calls = family("tool_calls", "counter", "Tool calls by tool and outcome")
+        tool_durations = family("tool_duration_seconds", "histogram", "Tool execution time")
+        for name in sorted(set(self.tool_successes_by_name) | set(self.tool_errors_by_name), key=str):
+            tool = (("tool", name),)
+            tool_calls.counter(self.tool_successes_by_name.get(name, 0), tool + (("status", "success"),))
+            tool_calls.counter(self.tool_errors_by_name.get(name, 0), tool + (("status", "error"),))
+        for name, histogram in sorted(self.tool_durations_by_name.items(), key=lambda item: str(item[0])):
+            tool_durations.histogram(histogram, latency, (("tool", name),))
+        
+        node_results = family("workflow_node_executions", "counter", "Workflow node executions by status")
+        for (workflow, node, status), count in sorted(self.node_results.items(), key=str):
+            node_results.counter(count, (("workflow", workflow), ("node", node), ("status", status)))
+        node_durations = family("workflow_node_duration_seconds", "histogram", "Workflow node execution time")
+        for (workflow, node), histogram in sorted(self.node_durations.items(), key=lambda item: str(item[0])):
+            node_durations.histogram(histogram, latency, (("workflow", workflow), ("node", node)))
+        
+        errors = family("errors", "counter", "Agent and tool errors by exception class")
+        for error_type, count in sorted(self.errors_by_type.items()):
+            errors.counter(count, (("error_type", error_type),))
+        events = family("events", "counter", "Callback events by type")
+        for event_type, count in sorted(self.event_counts.items()):
+            events.counter(count, (("event_type", event_type),))
+        return families
+    
+    def render(self, openmetrics: bool = True) -> str:
+        """
+        Current metrics in exposition format.
+        
+        Args:
+            openmetrics: OpenMetrics 1.0 text (ending in ``# EOF``) if True,
+                otherwise the Prometheus 0.0.4 text format
+        """
+        with self._lock:
+            families = self._collect()
+        lines = [line for family in families for line in family.render(openmetrics)]
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+    
+    def write(self, path: str, openmetrics: bool = False) -> None:
+        """
+        Dump the metrics to a file, replacing it atomically (e.g. for the
+        node_exporter textfile collector).
+        
+        Args:
+            path: Destination file
+            openmetrics: Write OpenMetrics instead of Prometheus text
+        """
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.render(openmetrics=openmetrics))
+        os.replace(temp_path, path)
+    
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> Tuple[str, int]:
+        """
+        Serve the metrics over HTTP at ``/metrics`` from a daemon thread.
+        
+        Scrapers asking for ``application/openmetrics-text`` get OpenMetrics,
+        others the Prometheus text format.
+        
+        Args:
+            port: Port to listen on (0 picks a free one)
+            host: Interface to bind
+        
+        Returns:
+            The bound (host, port)
+        """
+        if self._server is not None:
+            raise CallbackError("Prometheus exporter is already serving")
+        server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+        server.daemon_threads = True
+        server.exporter = self
+        self._server = server
+        self._server_thread = threading.Thread(
+            target=server.serve_forever, name="or-af-prometheus", daemon=True
+        )
+        self._server_thread.start()
+        return server.server_address[:2]
+    
+    def shutdown(self) -> None:
+        """Stop the HTTP server started by serve()"""
+        server, self._server = self._server, None
+        if server is None:
+            return
+        server.shutdown()
+        server.server_close()
+        self._server_thread.join()
+        self._server_thread = None
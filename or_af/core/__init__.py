@@ -1,10 +1,23 @@
 """
 OR-AF Core Module
 
-Contains the core Agent and Tool classes.
+Contains the core Agent, AgentSpec, ContextWindow and Tool classes.
 """
 
 from .agent import Agent
+from .batch import AsyncBatchRun, BatchRun
+from .context import ContextWindow
+from .streaming import AssistantMessage, StreamAccumulator
+from .spec import AgentSpec
 from .tool import Tool
 
-__all__ = ["Agent", "Tool"]
+__all__ = [
+    "Agent",
+    "AgentSpec",
+    "AssistantMessage",
+    "AsyncBatchRun",
+    "BatchRun",
+    "ContextWindow",
+    "StreamAccumulator",
+    "Tool",
+]
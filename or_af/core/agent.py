@@ -2,19 +2,33 @@
 OR-AF Core Module - Agent implementation
 """
 
+import asyncio
+import copy
+import inspect
 import json
+import queue
+import threading
+import time
 import uuid
-from typing import Dict, List, Any, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait as futures_wait
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Any, Optional
 from datetime import datetime
-from openai import AzureOpenAI
-from dotenv import load_dotenv
+from openai import AsyncAzureOpenAI
 import os
 
 from ..models.agent_models import AgentConfig, AgentResponse, IterationState
 from ..models.tool_models import ToolCall
 from ..models.message_models import Message, MessageRole
 from ..models.event_models import EventType
-from ..callbacks import CallbackHandler, ConsoleCallback
+from ..models.stream_models import StreamChunk, StreamChunkType
+from .batch import AsyncBatchRun, BatchRun
+from .context import ContextWindow
+from .streaming import AssistantMessage, AssistantToolCall, StreamAccumulator
+from ..cache import ResponseCache
+from ..llm.pool import ClientPool, default_client_pool, load_credentials
+from ..llm.backends import LLMBackend
+from ..llm.scheduler import CHARS_PER_TOKEN, RequestScheduler
+from ..callbacks import BaseCallback, CallbackHandler, ConsoleCallback, DispatchConfig
 from ..exceptions import (
     ToolNotFoundError, AgentExecutionError,
     AgentConfigurationError, MCPConnectionError
@@ -22,6 +36,129 @@ from ..exceptions import (
 from ..utils.logger import default_logger
 
 
+def _message_to_dict(message: Message) -> Dict[str, Any]:
+    """Convert a conversation history Message into a chat API message dict."""
+    msg_dict: Dict[str, Any] = {"role": message.role.value}
+    if message.content is not None:
+        msg_dict["content"] = message.content
+    if message.tool_calls:
+        msg_dict["tool_calls"] = message.tool_calls
+    if message.tool_call_id is not None:
+        msg_dict["tool_call_id"] = message.tool_call_id
+    return msg_dict
+
+
+def _message_from_dict(msg_dict: Dict[str, Any], timestamp: Optional[datetime] = None) -> Message:
+    """Convert a chat API message dict into a conversation history Message."""
+    message = Message(
+        role=MessageRole(msg_dict["role"]),
+        content=msg_dict.get("content"),
+        tool_calls=msg_dict.get("tool_calls"),
+        tool_call_id=msg_dict.get("tool_call_id")
+    )
+    if timestamp is not None:
+        message.timestamp = timestamp
+    return message
+
+
+def _close_stream(stream: Any) -> None:
+    """Close a completion stream, releasing its connection (and scheduler slot)."""
+    close = getattr(stream, "close", None)
+    if close is not None:
+        close()
+
+
+async def _aclose_stream(stream: Any) -> None:
+    """Close an async completion stream, releasing its connection (and scheduler slot)."""
+    close = getattr(stream, "aclose", None) or getattr(stream, "close", None)
+    if close is not None:
+        result = close()
+        if inspect.isawaitable(result):
+            await result
+
+
+# Chunks stream() and astream() buffer ahead of a slow consumer before the run waits
+STREAM_BUFFER_SIZE = 256
+
+
+class _StreamClosed(BaseException):
+    """Raised into a stream() run when its consumer stops iterating."""
+
+
+class _StreamedReply:
+    """One streamed LLM reply being assembled, with its request timing and token usage."""
+    
+    __slots__ = ("accumulator", "request_start", "first_chunk_at", "usage")
+    
+    def __init__(self, on_tool_call: Optional[Callable[[AssistantToolCall], None]] = None):
+        self.accumulator = StreamAccumulator(on_tool_call)
+        self.request_start = time.perf_counter()
+        self.first_chunk_at: Optional[float] = None
+        self.usage: Any = None
+    
+    def add(self, chunk: Any) -> Optional[str]:
+        """Add a raw stream chunk, returning its text delta if any."""
+        if not chunk.choices:
+            # The final chunk carries the usage when requested
+            self.usage = getattr(chunk, "usage", None) or self.usage
+            return None
+        if self.first_chunk_at is None:
+            self.first_chunk_at = time.perf_counter()
+        return self.accumulator.add(chunk.choices[0].delta)
+    
+    def build(self) -> AssistantMessage:
+        return self.accumulator.build()
+
+
+class _RunState:
+    """Progress of one agent run, shared by the sync and async execution loops."""
+    
+    __slots__ = (
+        "task", "session", "start_time", "context", "turn_start", "tokens_saved_before",
+        "iterations", "iteration", "final_response", "success", "error_message", "started"
+    )
+    
+    def __init__(self, task: str, session: bool, context: ContextWindow, start_time: datetime):
+        self.task = task
+        self.session = session
+        self.start_time = start_time
+        self.context = context
+        self.turn_start = len(context) - 1
+        self.tokens_saved_before = context.tokens_saved
+        self.iterations: List[IterationState] = []
+        self.iteration = 0
+        self.final_response = ""
+        self.success = False
+        self.error_message: Optional[str] = None
+        # Tool calls dispatched mid-stream in the current iteration
+        self.started: Optional[Dict[str, Any]] = None
+
+
+# Version of the save_session() format
+SESSION_FORMAT_VERSION = 1
+
+
+class _ToolIndex:
+    """
+    An agent's tool schema list and tool-name routes, rebuilt when stale.
+    
+    Connected MCPServers invalidate it when a tool is registered, so lookups
+    never poll the servers.
+    """
+    
+    __slots__ = ("schema", "routes", "version", "lock", "__weakref__")
+    
+    def __init__(self):
+        self.schema: Optional[List[Dict[str, Any]]] = None
+        self.routes: Dict[str, str] = {}
+        self.version = 0
+        self.lock = threading.Lock()
+    
+    def invalidate(self) -> None:
+        self.version += 1
+        self.schema = None
+
+
 class Agent:
     """
     Lightweight AI Agent with MCP server support, streaming, and observability.
@@ -43,6 +180,14 @@ class Agent:
         
         # Run task
         result = agent.run("Calculate 5 + 3")
+        
+        # Or from a coroutine, sharing one event loop across many runs
+        result = await agent.arun("Calculate 5 + 3")
+        
+        # Or stream typed chunks as they arrive
+        for chunk in agent.stream("Calculate 5 + 3"):
+            if chunk.type == StreamChunkType.TEXT_DELTA:
+                print(chunk.content, end="")
         ```
     """
     
@@ -56,7 +201,17 @@ class Agent:
         stream: bool = True,
         verbose: bool = True,
         callbacks: Optional[List] = None,
-        mcp_servers: Optional[List] = None
+        mcp_servers: Optional[List] = None,
+        parallel_tool_calls: bool = False,
+        max_tool_concurrency: int = 8,
+        response_cache: Optional[ResponseCache] = None,
+        client_pool: Optional[ClientPool] = None,
+        max_context_tokens: Optional[int] = None,
+        context_summarizer: Optional[Callable[[str], str]] = None,
+        early_tool_dispatch: bool = False,
+        scheduler: Optional[RequestScheduler] = None,
+        backend: Optional[LLMBackend] = None,
+        callback_dispatch: Optional[DispatchConfig] = None
     ):
         """
         Initialize the agent.
@@ -71,9 +226,25 @@ class Agent:
             verbose: Enable verbose output
             callbacks: List of callback objects for observability
             mcp_servers: List of MCP servers to connect to for tools
+            parallel_tool_calls: Execute the tool calls of one model reply concurrently
+            max_tool_concurrency: Maximum tool calls executing at once in parallel mode
+            response_cache: Optional cache answering identical LLM requests without an API call
+            client_pool: Pool providing shared OpenAI clients (defaults to the process-wide pool)
+            max_context_tokens: Token budget for the messages sent to the model; older
+                tool outputs are truncated (or summarized) to stay within it
+            context_summarizer: Optional function shortening a tool output, used
+                instead of truncation when the token budget is exceeded
+            early_tool_dispatch: When streaming, start each tool call as soon as its
+                arguments are complete instead of after the whole reply
+            scheduler: Optional request scheduler applying rate limits, a concurrency
+                cap and retries to LLM calls; share one across agents of a deployment.
+                The agent's pooled clients then do not retry on their own
+            backend: Optional LLM backend to send requests to instead of Azure OpenAI
+                (e.g. a ReplayBackend for offline tests and benchmarks)
+            callback_dispatch: Optional settings to deliver callback events from a
+                background worker instead of inline, so slow callbacks never stall the agent
         """
-        load_dotenv()
-        
+
         self.agent_id = str(uuid.uuid4())
         self.name = name or f"agent_{self.agent_id[:8]}"
         
@@ -84,39 +255,127 @@ class Agent:
                 temperature=temperature,
                 max_iterations=max_iterations,
                 stream=stream,
-                verbose=verbose
+                verbose=verbose,
+                parallel_tool_calls=parallel_tool_calls,
+                max_tool_concurrency=max_tool_concurrency,
+                max_context_tokens=max_context_tokens,
+                early_tool_dispatch=early_tool_dispatch
             )
         except Exception as e:
             raise AgentConfigurationError(f"Invalid configuration: {str(e)}")
         
         self.logger = default_logger
         self.conversation_history: List[Message] = []
+        self._session: Optional[ContextWindow] = None
+        self.response_cache = response_cache
+        self.context_summarizer = context_summarizer
         
         self._mcp_servers: Dict[str, Any] = {}
         self._mcp_clients: Dict[str, Any] = {}
+        self._tool_executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._tool_index = _ToolIndex()
+        # Set on agents spawned from an AgentSpec until they first modify their own copy
+        self._registry_shared = False
+        self._handler_shared = False
         
         if mcp_servers:
             for server in mcp_servers:
                 self.connect_mcp(server)
         
         # Setup callback handler
-        self.callback_handler = CallbackHandler()
+        self._callback_handler = CallbackHandler(dispatch=callback_dispatch)
         if verbose:
-            self.callback_handler.register_global(
-                lambda e: ConsoleCallback(verbose=True).on_event(e)
+            self._callback_handler.register_global(ConsoleCallback(verbose=True).on_event)
+        for callback in callbacks or []:
+            self._callback_handler.register_global(
+                callback.on_event if isinstance(callback, BaseCallback) else callback
             )
         
+        self.client_pool = client_pool or default_client_pool
+        self.scheduler = scheduler
+        self.backend = backend
+        self._credentials = load_credentials()
+        # Retries are left to the scheduler when there is one
+        self._client_retries = 0 if scheduler is not None else None
+        self._async_client: Optional[AsyncAzureOpenAI] = None
+        
         try:
-            self.client = AzureOpenAI(
-                api_key=os.getenv("subscription_key"),
-                api_version=os.getenv("api_version"),
-                azure_endpoint=os.getenv("endpoint")
+            self.client = (
+                self.client_pool.get_client(*self._credentials, max_retries=self._client_retries)
+                if backend is None else None
             )
             self.model_name = model_name or os.getenv("deployment", "gpt-4")
             self.logger.info(f"Agent '{self.name}' initialized with model: {self.model_name}")
         except Exception as e:
             raise AgentExecutionError(f"Failed to initialize OpenAI client: {str(e)}")
     
+    @property
+    def async_client(self) -> AsyncAzureOpenAI:
+        """
+        Async OpenAI client used by arun()/astream().
+        
+        Taken from the client pool for the running event loop unless one was
+        assigned explicitly.
+        """
+        if self._async_client is not None:
+            return self._async_client
+        try:
+            return self.client_pool.get_async_client(*self._credentials, max_retries=self._client_retries)
+        except Exception as e:
+            raise AgentExecutionError(f"Failed to initialize async OpenAI client: {str(e)}")
+    
+    @async_client.setter
+    def async_client(self, client: AsyncAzureOpenAI) -> None:
+        self._async_client = client
+    
+    @property
+    def callback_handler(self) -> CallbackHandler:
+        """
+        Callback handler receiving this agent's events.
+        
+        Agents spawned from an AgentSpec share the spec's handler until this
+        property is first accessed, which gives them a private copy.
+        """
+        if self._handler_shared:
+            self._callback_handler = self._callback_handler.copy()
+            self._handler_shared = False
+        return self._callback_handler
+    
+    @callback_handler.setter
+    def callback_handler(self, handler: CallbackHandler) -> None:
+        self._callback_handler = handler
+        self._handler_shared = False
+    
+    def _spawn(self, name: Optional[str] = None) -> "Agent":
+        """
+        Create a lightweight copy of this agent with fresh per-run state.
+        
+        Configuration, clients, caches, the tool registry and the callback
+        handler are shared; the registry and handler are copied on first
+        modification. Used by AgentSpec.instantiate().
+        """
+        agent = copy.copy(self)
+        agent.agent_id = str(uuid.uuid4())
+        agent.name = name or f"agent_{agent.agent_id[:8]}"
+        agent.conversation_history = []
+        agent._session = None
+        agent._tool_executor = None
+        agent._executor_lock = threading.Lock()
+        agent._registry_shared = True
+        agent._handler_shared = True
+        return agent
+    
+    def _own_registry(self) -> None:
+        """Give a spawned agent private MCP server maps and tool index before it modifies them"""
+        if self._registry_shared:
+            self._mcp_servers = dict(self._mcp_servers)
+            self._mcp_clients = dict(self._mcp_clients)
+            self._tool_index = _ToolIndex()
+            for client in self._mcp_clients.values():
+                client._tool_indexes.add(self._tool_index)
+            self._registry_shared = False
+    
     def connect_mcp(self, server: Any) -> "Agent":
         """Connect to an MCP server."""
         from ..mcp import MCPServer
@@ -124,9 +383,25 @@ class Agent:
         if not isinstance(server, MCPServer):
             raise AgentConfigurationError("Expected an MCPServer instance")
         
+        self._refresh_tool_registry()
+        routes = self._tool_index.routes
+        conflicts = sorted(
+            tool_name for tool_name in server.tools
+            if routes.get(tool_name, server.name) != server.name
+        )
+        if conflicts:
+            owners = ", ".join(f"'{t}' (from '{routes[t]}')" for t in conflicts)
+            raise AgentConfigurationError(
+                f"Cannot connect MCP server '{server.name}': duplicate tool names {owners}"
+            )
+        
         # For local MCP servers, we directly reference the server
         # The server already contains the tools and can execute them
+        self._own_registry()
         self._mcp_servers[server.name] = server
+        self._mcp_clients[server.name] = server
+        server._tool_indexes.add(self._tool_index)
+        self._tool_index.invalidate()
         
         self.logger.info(f"Agent '{self.name}' connected to MCP server '{server.name}'")
         
@@ -139,9 +414,11 @@ class Agent:
     def disconnect_mcp(self, server_name: str) -> bool:
         """Disconnect from an MCP server."""
         if server_name in self._mcp_servers:
-            del self._mcp_servers[server_name]
-            if server_name in self._mcp_clients:
-                del self._mcp_clients[server_name]
+            self._own_registry()
+            server = self._mcp_servers.pop(server_name)
+            self._mcp_clients.pop(server_name, None)
+            server._tool_indexes.discard(self._tool_index)
+            self._tool_index.invalidate()
             self.logger.info(f"Disconnected from MCP server '{server_name}'")
             return True
         return False
@@ -157,73 +434,380 @@ class Agent:
             tools[name] = server.list_tools()
         return tools
     
+    def _refresh_tool_registry(self) -> List[Dict[str, Any]]:
+        """
+        Rebuild the cached tool schema list and tool routing index if stale.
+        
+        Both are invalidated only by connect_mcp(), disconnect_mcp(), or a tool
+        being registered on a connected server, so a current index costs one
+        attribute check.
+        
+        Returns:
+            The tool schema list
+        """
+        index = self._tool_index
+        schema = index.schema
+        if schema is not None:
+            return schema
+        
+        # Concurrent runs of one agent may all find the index stale
+        with index.lock:
+            while index.schema is None:
+                version = index.version
+                schemas = []
+                routes: Dict[str, str] = {}
+                for server_name, client in self._mcp_clients.items():
+                    for tool_name in client.tools:
+                        if tool_name in routes:
+                            raise AgentConfigurationError(
+                                f"Tool '{tool_name}' is provided by both MCP servers "
+                                f"'{routes[tool_name]}' and '{server_name}'"
+                            )
+                        routes[tool_name] = server_name
+                    schemas.extend(client.get_tools())
+                
+                index.routes = routes
+                # A tool registered during the rebuild leaves the index stale
+                if index.version == version:
+                    index.schema = schemas
+            return index.schema
+    
     def _get_tools_schema(self) -> List[Dict[str, Any]]:
         """Get all tools in OpenAI format from connected MCP servers."""
-        schemas = []
-        for client in self._mcp_clients.values():
-            schemas.extend(client.get_tools())
-        return schemas
+        schema = self._tool_index.schema
+        return schema if schema is not None else self._refresh_tool_registry()
     
     def _find_tool_server(self, tool_name: str) -> Optional[str]:
         """Find which MCP server has a specific tool."""
-        for server_name, server in self._mcp_servers.items():
-            if tool_name in server.tools:
-                return server_name
-        return None
+        if self._tool_index.schema is None:
+            self._refresh_tool_registry()
+        return self._tool_index.routes.get(tool_name)
+    
+    def _prepare_tool_call(self, tool_call) -> tuple[Dict[str, Any], Any]:
+        """Parse tool call arguments, emit the start event and resolve the serving client."""
+        tool_name = tool_call.function.name
+        arguments = json.loads(tool_call.function.arguments)
+        
+        self._callback_handler.emit(
+            EventType.TOOL_CALL_START,
+            tool_name=tool_name,
+            arguments=arguments
+        )
+        
+        server_name = self._find_tool_server(tool_name)
+        if not server_name:
+            # Reported as a TOOL_ERROR by the caller's _tool_call_failed()
+            raise ToolNotFoundError(f"Tool '{tool_name}' not found in any connected MCP server")
+        
+        return arguments, self._mcp_clients[server_name]
+    
+    def _finish_tool_call(self, tool_name: str, tool_result: Any) -> str:
+        """Emit the end event for a tool call and render its result for the model."""
+        self._callback_handler.emit(
+            EventType.TOOL_CALL_END,
+            tool_name=tool_name,
+            result=tool_result.result,
+            execution_time=tool_result.execution_time,
+            cached=tool_result.cached,
+            success=tool_result.success,
+            error_type=tool_result.error_type
+        )
+        
+        if tool_result.success:
+            return str(tool_result.result)
+        else:
+            return tool_result.error
+    
+    def _tool_call_failed(self, tool_name: str, error: Exception) -> str:
+        """Log and report a tool call that raised."""
+        error_msg = f"Error executing {tool_name}: {str(error)}"
+        self.logger.error(error_msg, exc_info=True)
+        self._callback_handler.emit(
+            EventType.TOOL_ERROR, tool_name=tool_name, error=str(error), error_type=type(error).__name__
+        )
+        return error_msg
     
     def _execute_tool_call(self, tool_call) -> str:
         """Execute a tool call via MCP server and return the result."""
         tool_name = tool_call.function.name
         
         try:
-            arguments = json.loads(tool_call.function.arguments)
-            
-            tracked_call = ToolCall(
-                id=tool_call.id,
-                name=tool_name,
-                arguments=arguments
-            )
-            
-            self.callback_handler.emit(
-                EventType.TOOL_CALL_START,
-                tool_name=tool_name,
-                arguments=arguments
-            )
-            
-            server_name = self._find_tool_server(tool_name)
-            if not server_name:
-                error_msg = f"Tool '{tool_name}' not found in any connected MCP server"
-                self.callback_handler.emit(EventType.TOOL_ERROR, tool_name=tool_name, error=error_msg)
-                raise ToolNotFoundError(error_msg)
-            
-            client = self._mcp_clients[server_name]
+            arguments, client = self._prepare_tool_call(tool_call)
             tool_result = client.execute_tool(tool_name, tool_call.id, **arguments)
-            
-            self.callback_handler.emit(
-                EventType.TOOL_CALL_END,
-                tool_name=tool_name,
-                result=tool_result.result,
-                execution_time=tool_result.execution_time
-            )
-            
-            if tool_result.success:
-                return str(tool_result.result)
-            else:
-                return tool_result.error
+            return self._finish_tool_call(tool_name, tool_result)
+        
+        except Exception as e:
+            return self._tool_call_failed(tool_name, e)
+    
+    async def _aexecute_tool_call(self, tool_call) -> str:
+        """Execute a tool call via MCP server from a coroutine and return the result."""
+        tool_name = tool_call.function.name
+        
+        try:
+            arguments, client = self._prepare_tool_call(tool_call)
+            tool_result = await client.aexecute_tool(tool_name, tool_call.id, **arguments)
+            return self._finish_tool_call(tool_name, tool_result)
         
         except Exception as e:
-            error_msg = f"Error executing {tool_name}: {str(e)}"
-            self.logger.error(error_msg, exc_info=True)
-            self.callback_handler.emit(EventType.TOOL_ERROR, tool_name=tool_name, error=str(e))
-            return error_msg
+            return self._tool_call_failed(tool_name, e)
     
-    def _stream_response(self, messages: List[Dict], iteration: int) -> tuple[str, Any]:
-        """Stream response from OpenAI."""
+    async def _abounded_tool_call(
+        self,
+        tool_call,
+        semaphore: asyncio.Semaphore,
+        after: Optional[asyncio.Future] = None
+    ) -> str:
+        """Execute a tool call once ``after`` (an earlier call) is done and one of the iteration's tool slots is free."""
+        if after is not None:
+            await asyncio.wait([after])
+        async with semaphore:
+            return await self._aexecute_tool_call(tool_call)
+    
+    def _dispatch_tool_call(self, started: Dict[str, Future], tool_call: Any) -> None:
+        """
+        Start a tool call on the tool thread pool while the reply is still streaming.
+        
+        Without parallel_tool_calls a call starts only when the previously
+        dispatched one is done, so calls run one at a time in call order.
+        """
+        executor = self._get_tool_executor()
+        if self.config.parallel_tool_calls or not started:
+            started[tool_call.id] = executor.submit(self._execute_tool_call, tool_call)
+            return
+        
+        future: Future = Future()
+        
+        def run() -> None:
+            if future.set_running_or_notify_cancel():
+                future.set_result(self._execute_tool_call(tool_call))
+        
+        def start(previous: Future) -> None:
+            if previous.cancelled():
+                future.cancel()
+            else:
+                executor.submit(run)
+        
+        next(reversed(started.values())).add_done_callback(start)
+        started[tool_call.id] = future
+    
+    def _adispatch_tool_call(
+        self,
+        started: Dict[str, asyncio.Task],
+        tool_call: Any,
+        semaphore: asyncio.Semaphore
+    ) -> None:
+        """Schedule a tool call while the reply is still streaming, after the previous one unless parallel."""
+        after = None
+        if not self.config.parallel_tool_calls and started:
+            after = next(reversed(started.values()))
+        started[tool_call.id] = asyncio.ensure_future(self._abounded_tool_call(tool_call, semaphore, after))
+    
+    @staticmethod
+    def _abandon_tool_calls(started: Optional[Dict[str, Future]]) -> None:
+        """Cancel early-dispatched tool calls that have not started and wait for the rest."""
+        if not started:
+            return
+        for future in started.values():
+            future.cancel()
+        futures_wait(started.values())
+    
+    @staticmethod
+    async def _aabandon_tool_calls(started: Optional[Dict[str, asyncio.Task]]) -> None:
+        """Cancel early-dispatched tool tasks and retrieve their outcomes."""
+        if not started:
+            return
+        for task in started.values():
+            task.cancel()
+        await asyncio.gather(*started.values(), return_exceptions=True)
+    
+    @staticmethod
+    def _tool_result_sink(
+        sink: Optional[Callable[[StreamChunk], None]],
+        iteration: int
+    ) -> Optional[Callable[[Any, str], None]]:
+        """Callback emitting a TOOL_RESULT chunk to ``sink`` as each tool call finishes."""
+        if sink is None:
+            return None
+        
+        def on_result(tool_call: Any, result: str) -> None:
+            sink(StreamChunk(
+                StreamChunkType.TOOL_RESULT,
+                iteration=iteration,
+                content=result,
+                tool_call_id=tool_call.id,
+                tool_name=tool_call.function.name
+            ))
+        
+        return on_result
+    
+    @staticmethod
+    def _atool_result_sink(
+        sink: Optional[Callable[[StreamChunk], Awaitable[None]]],
+        iteration: int
+    ) -> Optional[Callable[[Any, str], Awaitable[None]]]:
+        """Coroutine callback awaiting ``sink`` with a TOOL_RESULT chunk as each tool call finishes."""
+        if sink is None:
+            return None
+        
+        async def on_result(tool_call: Any, result: str) -> None:
+            await sink(StreamChunk(
+                StreamChunkType.TOOL_RESULT,
+                iteration=iteration,
+                content=result,
+                tool_call_id=tool_call.id,
+                tool_name=tool_call.function.name
+            ))
+        
+        return on_result
+    
+    def _get_tool_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool used for parallel and early tool calls, creating it on first use."""
+        if self._tool_executor is None:
+            with self._executor_lock:
+                if self._tool_executor is None:
+                    self._tool_executor = ThreadPoolExecutor(
+                        max_workers=self.config.max_tool_concurrency,
+                        thread_name_prefix=f"{self.name}-tools"
+                    )
+        return self._tool_executor
+    
+    def close(self) -> None:
+        """
+        Shut down the thread pool used for parallel and early tool calls.
+        
+        Call it (or use the agent as a context manager) when discarding an
+        agent that ran tools in parallel. The agent stays usable; the pool is
+        created again when next needed.
+        """
+        with self._executor_lock:
+            executor, self._tool_executor = self._tool_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+    
+    def __enter__(self) -> "Agent":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+    
+    def _execute_tool_calls(
+        self,
+        tool_calls: List[Any],
+        started: Optional[Dict[str, Future]] = None,
+        on_result: Optional[Callable[[Any, str], None]] = None
+    ) -> List[str]:
+        """
+        Execute all tool calls of one model reply, returning results in call order.
+        
+        In parallel mode calls run on a thread pool capped at max_tool_concurrency,
+        so the iteration takes as long as its slowest tool. Calls already
+        dispatched during streaming (``started``, keyed by tool call id) are
+        awaited instead of executed again; otherwise they lead the reply's
+        calls and are finished before the rest run one at a time.
+        ``on_result(tool_call, result)`` is called from this thread as each
+        call finishes.
+        """
+        results: List[Optional[str]] = [None] * len(tool_calls)
+        futures: Dict[Future, int] = {}
+        pending = []
+        for index, tool_call in enumerate(tool_calls):
+            if started and tool_call.id in started:
+                futures[started[tool_call.id]] = index
+            else:
+                pending.append(index)
+        
+        def finish(index: int, result: str) -> None:
+            results[index] = result
+            if on_result is not None:
+                on_result(tool_calls[index], result)
+        
+        parallel = self.config.parallel_tool_calls
+        if parallel and len(pending) >= 2:
+            executor = self._get_tool_executor()
+            for index in pending:
+                futures[executor.submit(self._execute_tool_call, tool_calls[index])] = index
+        else:
+            if not parallel:
+                for future in as_completed(futures):
+                    finish(futures[future], future.result())
+                futures = {}
+            for index in pending:
+                finish(index, self._execute_tool_call(tool_calls[index]))
+        
+        for future in as_completed(futures):
+            finish(futures[future], future.result())
+        return results
+    
+    async def _aexecute_tool_calls(
+        self,
+        tool_calls: List[Any],
+        started: Optional[Dict[str, asyncio.Task]] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        on_result: Optional[Callable[[Any, str], Awaitable[None]]] = None
+    ) -> List[str]:
+        """
+        Execute all tool calls of one model reply from a coroutine, preserving call order.
+        
+        Calls dispatched during streaming (``started``) hold slots of the
+        iteration's ``semaphore``, which the remaining calls share, so at most
+        max_tool_concurrency tools run at once; without parallel_tool_calls
+        they are finished before the remaining calls run one at a time.
+        ``on_result(tool_call, result)`` is awaited as each call finishes.
+        """
+        results: List[Optional[str]] = [None] * len(tool_calls)
+        tasks: Dict[asyncio.Future, int] = {}
+        pending = []
+        for index, tool_call in enumerate(tool_calls):
+            if started and tool_call.id in started:
+                tasks[started[tool_call.id]] = index
+            else:
+                pending.append(index)
+        
+        async def finish(index: int, result: str) -> None:
+            results[index] = result
+            if on_result is not None:
+                await on_result(tool_calls[index], result)
+        
+        own_tasks = []
+        parallel = self.config.parallel_tool_calls
+        if parallel and len(pending) >= 2:
+            semaphore = semaphore or asyncio.Semaphore(self.config.max_tool_concurrency)
+            own_tasks = [
+                asyncio.ensure_future(self._abounded_tool_call(tool_calls[index], semaphore))
+                for index in pending
+            ]
+            tasks.update(zip(own_tasks, pending))
+        else:
+            if not parallel:
+                for task in list(tasks):
+                    await finish(tasks.pop(task), await task)
+            for index in pending:
+                if semaphore is None:
+                    await finish(index, await self._aexecute_tool_call(tool_calls[index]))
+                else:
+                    await finish(index, await self._abounded_tool_call(tool_calls[index], semaphore))
+        
+        try:
+            waiting = set(tasks)
+            while waiting:
+                done, waiting = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    await finish(tasks[task], task.result())
+        finally:
+            for task in own_tasks:
+                task.cancel()
+        return results
+    
+    def _build_api_params(self, messages: List[Dict], stream: bool) -> Dict[str, Any]:
+        """Build chat completion request parameters."""
         api_params = {
             "model": self.model_name,
-            "messages": messages,
-            "stream": True
+            "messages": messages
         }
+        if stream:
+            api_params["stream"] = True
+            # Streams report token usage only when asked to
+            api_params["stream_options"] = {"include_usage": True}
         
         if self.config.temperature != 1.0:
             api_params["temperature"] = self.config.temperature
@@ -233,87 +817,452 @@ class Agent:
             api_params["tools"] = tools_schema
             api_params["tool_choice"] = "auto"
         
+        return api_params
+    
+    def _create_completion(self, api_params: Dict[str, Any]) -> Any:
+        """Send a chat completion request to the backend or client, through the scheduler if one is set."""
+        create = self.backend.create if self.backend is not None else self.client.chat.completions.create
+        if self.scheduler is None:
+            return create(**api_params)
+        return self.scheduler.call(create, api_params)
+    
+    async def _acreate_completion(self, api_params: Dict[str, Any]) -> Any:
+        """Send a chat completion request from a coroutine, through the scheduler if one is set."""
+        if self.backend is not None:
+            create = self.backend.acreate
+        else:
+            create = self.async_client.chat.completions.create
+        if self.scheduler is None:
+            return await create(**api_params)
+        return await self.scheduler.acall(create, api_params)
+    
+    def _cache_lookup(self, api_params: Dict[str, Any]) -> tuple[Optional[str], Any]:
+        """Look up a request in the response cache, returning (key, cached message or None)."""
+        if self.response_cache is None:
+            return None, None
+        
+        key, entry = self.response_cache.lookup(api_params)
+        if entry is None:
+            return key, None
+        
+        self.logger.debug(f"Response cache hit for agent '{self.name}'")
+        return key, AssistantMessage.from_parts(entry["content"], entry["tool_calls"])
+    
+    def _prepare_request(self, messages: List[Dict], stream: bool) -> tuple[Dict[str, Any], Optional[str], Any]:
+        """Build a chat completion request and look it up, returning (params, cache key, cached message or None)."""
+        api_params = self._build_api_params(messages, stream=stream)
+        cache_key, cached = self._cache_lookup(api_params)
+        return api_params, cache_key, cached
+    
+    def _replay_cached(self, assistant_message: Any, iteration: int) -> Optional[StreamChunk]:
+        """Replay a cached reply through the normal streaming callbacks, returning its text chunk if any."""
+        if not assistant_message.content:
+            return None
+        self._callback_handler.emit_chunk(assistant_message.content, iteration)
+        return StreamChunk(StreamChunkType.TEXT_DELTA, iteration=iteration, content=assistant_message.content)
+    
+    def _stream_text(self, reply: "_StreamedReply", chunk: Any, iteration: int, sink: Optional[Callable]) -> Optional[StreamChunk]:
+        """Add a raw stream chunk to the reply and emit its text, returning a TEXT_DELTA chunk for ``sink``."""
+        text = reply.add(chunk)
+        if not text:
+            return None
+        self._callback_handler.emit_chunk(text, iteration)
+        if sink is None:
+            return None
+        return StreamChunk(StreamChunkType.TEXT_DELTA, iteration=iteration, content=text)
+    
+    def _store_reply(
+        self,
+        cache_key: Optional[str],
+        state: Optional[IterationState],
+        assistant_message: Any,
+        request_start: float,
+        first_chunk_at: Optional[float] = None,
+        usage: Any = None
+    ) -> Any:
+        """Record an LLM reply on the iteration and in the response cache, and return it."""
+        if state is not None:
+            self._record_llm_call(state, request_start, first_chunk_at, usage, assistant_message)
+        if cache_key is not None:
+            self.response_cache.store(cache_key, assistant_message)
+        return assistant_message
+    
+    def _stream_response(
+        self,
+        messages: List[Dict],
+        iteration: int,
+        sink: Optional[Callable[[StreamChunk], None]] = None,
+        started: Optional[Dict[str, Future]] = None,
+        state: Optional[IterationState] = None
+    ) -> tuple[str, Any]:
+        """
+        Stream response from OpenAI.
+        
+        If ``started`` is given, tool calls whose arguments complete mid-stream
+        are submitted to the tool thread pool and their futures stored in it.
+        Request timing and token usage are recorded on ``state``.
+        """
+        api_params, cache_key, cached = self._prepare_request(messages, stream=True)
+        if cached is not None:
+            chunk = self._replay_cached(cached, iteration)
+            if chunk is not None and sink is not None:
+                sink(chunk)
+            return cached.content or "", cached
+        
+        on_tool_call = None
+        if started is not None:
+            def on_tool_call(tool_call: AssistantToolCall) -> None:
+                self._dispatch_tool_call(started, tool_call)
+        
+        stream = None
         try:
-            stream = self.client.chat.completions.create(**api_params)
-            
-            collected_messages = []
-            collected_tool_calls = []
-            
+            reply = _StreamedReply(on_tool_call)
+            stream = self._create_completion(api_params)
             for chunk in stream:
-                if not chunk.choices:
-                    continue
-                
-                delta = chunk.choices[0].delta
-                
-                if delta.content:
-                    collected_messages.append(delta.content)
-                    self.callback_handler.emit(EventType.STREAM_CHUNK, chunk=delta.content)
-                
-                if delta.tool_calls:
-                    for tool_call_chunk in delta.tool_calls:
-                        while len(collected_tool_calls) <= tool_call_chunk.index:
-                            collected_tool_calls.append({
-                                "id": "",
-                                "type": "function",
-                                "function": {"name": "", "arguments": ""}
-                            })
-                        
-                        if tool_call_chunk.id:
-                            collected_tool_calls[tool_call_chunk.index]["id"] = tool_call_chunk.id
-                        
-                        if tool_call_chunk.function.name:
-                            collected_tool_calls[tool_call_chunk.index]["function"]["name"] = tool_call_chunk.function.name
-                        
-                        if tool_call_chunk.function.arguments:
-                            collected_tool_calls[tool_call_chunk.index]["function"]["arguments"] += tool_call_chunk.function.arguments
+                text_chunk = self._stream_text(reply, chunk, iteration, sink)
+                if text_chunk is not None:
+                    sink(text_chunk)
             
-            content = "".join(collected_messages) if collected_messages else None
+            assistant_message = self._store_reply(
+                cache_key, state, reply.build(), reply.request_start, reply.first_chunk_at, reply.usage
+            )
+            return assistant_message.content or "", assistant_message
             
-            class MockMessage:
-                def __init__(self, content, tool_calls):
-                    self.content = content
-                    self.tool_calls = None
-                    if tool_calls:
-                        class MockToolCall:
-                            def __init__(self, tc):
-                                self.id = tc["id"]
-                                self.type = tc["type"]
-                                class MockFunction:
-                                    def __init__(self, func):
-                                        self.name = func["name"]
-                                        self.arguments = func["arguments"]
-                                self.function = MockFunction(tc["function"])
-                        
-                        self.tool_calls = [MockToolCall(tc) for tc in tool_calls]
+        except Exception as e:
+            raise AgentExecutionError(f"OpenAI API error: {str(e)}")
+        finally:
+            if stream is not None:
+                _close_stream(stream)
+    
+    async def _astream_response(
+        self,
+        messages: List[Dict],
+        iteration: int,
+        sink: Optional[Callable[[StreamChunk], Awaitable[None]]] = None,
+        started: Optional[Dict[str, asyncio.Task]] = None,
+        state: Optional[IterationState] = None,
+        tool_semaphore: Optional[asyncio.Semaphore] = None
+    ) -> tuple[str, Any]:
+        """
+        Stream response from OpenAI using the async client.
+        
+        If ``started`` is given, tool calls whose arguments complete mid-stream
+        are scheduled as tasks, bounded by ``tool_semaphore``, and stored in it.
+        Request timing and token usage are recorded on ``state``.
+        """
+        api_params, cache_key, cached = self._prepare_request(messages, stream=True)
+        if cached is not None:
+            chunk = self._replay_cached(cached, iteration)
+            if chunk is not None and sink is not None:
+                await sink(chunk)
+            return cached.content or "", cached
+        
+        on_tool_call = None
+        if started is not None:
+            semaphore = tool_semaphore or asyncio.Semaphore(self.config.max_tool_concurrency)
             
-            assistant_message = MockMessage(content, collected_tool_calls if collected_tool_calls else None)
+            def on_tool_call(tool_call: AssistantToolCall) -> None:
+                self._adispatch_tool_call(started, tool_call, semaphore)
+        
+        stream = None
+        try:
+            reply = _StreamedReply(on_tool_call)
+            stream = await self._acreate_completion(api_params)
+            async for chunk in stream:
+                text_chunk = self._stream_text(reply, chunk, iteration, sink)
+                if text_chunk is not None:
+                    await sink(text_chunk)
             
-            return content or "", assistant_message
+            assistant_message = self._store_reply(
+                cache_key, state, reply.build(), reply.request_start, reply.first_chunk_at, reply.usage
+            )
+            return assistant_message.content or "", assistant_message
             
         except Exception as e:
-            raise OpenAIError(f"OpenAI API error: {str(e)}")
+            raise AgentExecutionError(f"OpenAI API error: {str(e)}")
+        finally:
+            if stream is not None:
+                await _aclose_stream(stream)
     
-    def _non_stream_response(self, messages: List[Dict]) -> Any:
+    def _non_stream_response(self, messages: List[Dict], state: Optional[IterationState] = None) -> Any:
         """Get non-streaming response from OpenAI."""
-        api_params = {
-            "model": self.model_name,
-            "messages": messages
-        }
-        
-        if self.config.temperature != 1.0:
-            api_params["temperature"] = self.config.temperature
+        api_params, cache_key, cached = self._prepare_request(messages, stream=False)
+        if cached is not None:
+            return cached
         
-        tools_schema = self._get_tools_schema()
-        if tools_schema:
-            api_params["tools"] = tools_schema
-            api_params["tool_choice"] = "auto"
+        try:
+            request_start = time.perf_counter()
+            response = self._create_completion(api_params)
+            return self._store_reply(
+                cache_key, state, response.choices[0].message, request_start, usage=getattr(response, "usage", None)
+            )
+        except Exception as e:
+            raise AgentExecutionError(f"OpenAI API error: {str(e)}")
+    
+    async def _anon_stream_response(self, messages: List[Dict], state: Optional[IterationState] = None) -> Any:
+        """Get non-streaming response from OpenAI using the async client."""
+        api_params, cache_key, cached = self._prepare_request(messages, stream=False)
+        if cached is not None:
+            return cached
         
         try:
-            response = self.client.chat.completions.create(**api_params)
-            return response.choices[0].message
+            request_start = time.perf_counter()
+            response = await self._acreate_completion(api_params)
+            return self._store_reply(
+                cache_key, state, response.choices[0].message, request_start, usage=getattr(response, "usage", None)
+            )
         except Exception as e:
             raise AgentExecutionError(f"OpenAI API error: {str(e)}")
     
+    def _record_llm_call(
+        self,
+        state: IterationState,
+        request_start: float,
+        first_chunk_at: Optional[float],
+        usage: Any,
+        assistant_message: Any
+    ) -> None:
+        """Record an LLM request's duration, time to first token and token usage on the iteration."""
+        state.llm_time = time.perf_counter() - request_start
+        if first_chunk_at is not None:
+            state.time_to_first_token = first_chunk_at - request_start
+        completion_tokens = getattr(usage, "completion_tokens", None)
+        if isinstance(completion_tokens, int):
+            state.prompt_tokens = getattr(usage, "prompt_tokens", None)
+            state.completion_tokens = completion_tokens
+            return
+        # Backends that report no usage (e.g. replayed traces without it) get an estimate
+        chars = len(assistant_message.content or "")
+        for tool_call in assistant_message.tool_calls or ():
+            chars += len(tool_call.function.arguments)
+        state.completion_tokens = max(1, chars // CHARS_PER_TOKEN) if chars else 0
+    
+    def _end_iteration(self, iteration_state: IterationState, iterations: List[IterationState]) -> None:
+        """Close an iteration and emit its end event with its timings."""
+        iteration_state.end_time = datetime.now()
+        iterations.append(iteration_state)
+        self._callback_handler.emit(
+            EventType.ITERATION_END,
+            iteration=iteration_state.iteration_number,
+            duration=iteration_state.duration,
+            llm_time=iteration_state.llm_time,
+            time_to_first_token=iteration_state.time_to_first_token,
+            prompt_tokens=iteration_state.prompt_tokens,
+            completion_tokens=iteration_state.completion_tokens
+        )
+    
+    def _initial_messages(self, task: str) -> List[Dict]:
+        """Build the opening message list for a task."""
+        return [
+            {"role": "system", "content": self.config.system_prompt},
+            {"role": "user", "content": task}
+        ]
+    
+    def _new_context(self, task: str) -> ContextWindow:
+        """Create the token-budgeted message list for a task."""
+        context = ContextWindow(
+            max_tokens=self.config.max_context_tokens,
+            model_name=self.model_name,
+            summarizer=self.context_summarizer
+        )
+        context.extend(self._initial_messages(task))
+        return context
+    
+    def _session_context(self, message: str) -> ContextWindow:
+        """Get the chat session's message list with a new user message appended."""
+        if self._session is None:
+            self._session = ContextWindow(
+                max_tokens=self.config.max_context_tokens,
+                model_name=self.model_name,
+                summarizer=self.context_summarizer
+            )
+            self._session.append({"role": "system", "content": self.config.system_prompt})
+            self._session.extend([_message_to_dict(m) for m in self.conversation_history])
+        self._session.append({"role": "user", "content": message})
+        return self._session
+    
+    def _end_session_turn(self, context: ContextWindow, turn_start: int, success: bool) -> None:
+        """Record a successful chat turn in the conversation history, or drop a failed one."""
+        if not success:
+            context.rollback(turn_start)
+            return
+        self.conversation_history.extend(
+            _message_from_dict(context.original(index)) for index in range(turn_start, len(context))
+        )
+    
+    def _record_assistant_message(
+        self,
+        context: ContextWindow,
+        iteration_state: IterationState,
+        content: str,
+        assistant_message: Any
+    ) -> None:
+        """Record the model's reply on the iteration state and context."""
+        if content and not assistant_message.tool_calls:
+            iteration_state.thinking = content
+            self._callback_handler.emit(EventType.THINKING, iteration=iteration_state.iteration_number, content=content)
+        
+        msg_dict = {"role": "assistant"}
+        if assistant_message.content:
+            msg_dict["content"] = assistant_message.content
+        if assistant_message.tool_calls:
+            msg_dict["tool_calls"] = [
+                {
+                    "id": tc.id,
+                    "type": "function",
+                    "function": {
+                        "name": tc.function.name,
+                        "arguments": tc.function.arguments
+                    }
+                }
+                for tc in assistant_message.tool_calls
+            ]
+        context.append(msg_dict)
+    
+    def _build_response(
+        self,
+        task: str,
+        final_response: str,
+        iterations: List[IterationState],
+        success: bool,
+        error_message: Optional[str],
+        start_time: datetime,
+        tokens_saved: int = 0
+    ) -> AgentResponse:
+        """Assemble the AgentResponse and emit the end event."""
+        end_time = datetime.now()
+        total_tool_calls = sum(len(iter_state.tool_calls) for iter_state in iterations)
+        
+        response = AgentResponse(
+            task=task,
+            response=final_response,
+            iterations=iterations,
+            total_tool_calls=total_tool_calls,
+            success=success,
+            error_message=error_message,
+            start_time=start_time,
+            end_time=end_time,
+            tokens_saved=tokens_saved
+        )
+        
+        self._callback_handler.emit(
+            EventType.AGENT_END,
+            response=final_response,
+            success=success,
+            duration=response.total_duration
+        )
+        self.logger.info(f"Agent finished. Success: {success}, Duration: {response.total_duration:.2f}s")
+        
+        return response
+    
+    def _start_run(self, task: str, session: bool) -> _RunState:
+        """Emit the start event and open the run's message context."""
+        start_time = datetime.now()
+        
+        self._callback_handler.emit(EventType.AGENT_START, task=task)
+        self.logger.info(f"Agent started with task: {task}")
+        
+        context = self._session_context(task) if session else self._new_context(task)
+        return _RunState(task, session, context, start_time)
+    
+    def _start_iteration(self, run: _RunState) -> IterationState:
+        """Begin the run's next iteration and fit its context to the token budget."""
+        run.iteration += 1
+        self._callback_handler.emit(EventType.ITERATION_START, iteration=run.iteration)
+        self.logger.debug(f"Starting iteration {run.iteration}")
+        
+        iteration_state = IterationState(
+            iteration_number=run.iteration,
+            start_time=datetime.now()
+        )
+        
+        run.context.fit()
+        run.started = {} if self.config.early_tool_dispatch else None
+        return iteration_state
+    
+    def _take_reply(
+        self,
+        run: _RunState,
+        iteration_state: IterationState,
+        content: str,
+        assistant_message: Any,
+        want_chunks: bool
+    ) -> List[StreamChunk]:
+        """
+        Record the model's reply; a reply without tool calls completes the run.
+        
+        Returns a TOOL_CALL_START chunk per requested tool call if ``want_chunks``.
+        """
+        self._record_assistant_message(run.context, iteration_state, content, assistant_message)
+        
+        if not assistant_message.tool_calls:
+            run.final_response = assistant_message.content or ""
+            iteration_state.response = run.final_response
+            run.success = True
+            
+            self._end_iteration(iteration_state, run.iterations)
+            self.logger.info(f"Task completed in {run.iteration} iteration(s)")
+            return []
+        
+        self.logger.info(f"Agent requested {len(assistant_message.tool_calls)} tool(s)")
+        
+        chunks = []
+        for tool_call in assistant_message.tool_calls:
+            tracked_call = ToolCall(
+                id=tool_call.id,
+                name=tool_call.function.name,
+                arguments=json.loads(tool_call.function.arguments)
+            )
+            iteration_state.tool_calls.append(tracked_call)
+            if want_chunks:
+                chunks.append(StreamChunk(
+                    StreamChunkType.TOOL_CALL_START,
+                    iteration=run.iteration,
+                    tool_call_id=tracked_call.id,
+                    tool_name=tracked_call.name,
+                    arguments=tracked_call.arguments
+                ))
+        return chunks
+    
+    def _take_tool_results(
+        self,
+        run: _RunState,
+        iteration_state: IterationState,
+        tool_calls: List[Any],
+        results: List[str]
+    ) -> None:
+        """Append the tool results to the context and close the iteration."""
+        for tool_call, result in zip(tool_calls, results):
+            run.context.append({
+                "role": "tool",
+                "tool_call_id": tool_call.id,
+                "content": result
+            })
+        self._end_iteration(iteration_state, run.iterations)
+    
+    def _check_run_finished(self, run: _RunState) -> None:
+        """Fail a run whose iterations ran out before the model answered."""
+        if not run.success:
+            error_message = f"Maximum iterations ({self.config.max_iterations}) reached"
+            self.logger.warning(error_message)
+            raise AgentExecutionError(error_message)
+    
+    def _run_failed(self, run: _RunState, error: Exception) -> None:
+        """Log and report an error that ended the run."""
+        run.error_message = str(error)
+        self.logger.error(f"Error during execution: {run.error_message}", exc_info=True)
+        self._callback_handler.emit(EventType.ERROR, error=run.error_message, error_type=type(error).__name__)
+        run.success = False
+    
+    def _finish_run(self, run: _RunState) -> AgentResponse:
+        """Close a chat turn and build the run's AgentResponse."""
+        if run.session:
+            self._end_session_turn(run.context, run.turn_start, run.success)
+        return self._build_response(
+            run.task, run.final_response, run.iterations, run.success, run.error_message, run.start_time,
+            run.context.tokens_saved - run.tokens_saved_before
+        )
+    
     def run(self, task: str, stream: Optional[bool] = None) -> AgentResponse:
         """
         Run a task using the agent.
@@ -325,132 +1274,374 @@ class Agent:
         Returns:
             AgentResponse with complete execution details
         """
-        start_time = datetime.now()
         use_stream = stream if stream is not None else self.config.stream
+        return self._run(task, use_stream)
+    
+    def stream(self, task: str) -> Iterator[StreamChunk]:
+        """
+        Run a task and yield typed chunks as they arrive.
         
-        self.callback_handler.emit(EventType.AGENT_START, task=task)
-        self.logger.info(f"Agent started with task: {task}")
+        The run executes on a background thread; text deltas are yielded as soon
+        as the model produces them, followed by tool call chunks and a tool
+        result chunk as each tool finishes, and finally a FINAL_RESPONSE chunk
+        carrying the AgentResponse. At most STREAM_BUFFER_SIZE chunks are
+        buffered ahead of the caller. If the caller stops iterating early
+        (``break`` or ``close()``), the run is stopped at its next chunk and the
+        background thread is joined.
         
-        messages = [
-            {"role": "system", "content": self.config.system_prompt},
-            {"role": "user", "content": task}
-        ]
+        Example:
+            ```python
+            for chunk in agent.stream("Calculate 5 + 3"):
+                if chunk.type == StreamChunkType.TEXT_DELTA:
+                    print(chunk.content, end="", flush=True)
+                elif chunk.type == StreamChunkType.FINAL_RESPONSE:
+                    result = chunk.response
+            ```
+        """
+        chunks: queue.Queue = queue.Queue(maxsize=STREAM_BUFFER_SIZE)
+        done = object()
+        stop = threading.Event()
         
-        iterations: List[IterationState] = []
-        iteration = 0
-        final_response = ""
-        success = False
-        error_message = None
+        def put(chunk: StreamChunk) -> None:
+            if stop.is_set():
+                raise _StreamClosed()
+            chunks.put(chunk)
         
+        def runner() -> None:
+            try:
+                self._run(task, True, sink=put)
+            except _StreamClosed:
+                pass
+            finally:
+                if not stop.is_set():
+                    chunks.put(done)
+        
+        thread = threading.Thread(target=runner, name=f"{self.name}-stream", daemon=True)
+        thread.start()
         try:
-            while iteration < self.config.max_iterations:
-                iteration += 1
-                iter_start = datetime.now()
-                
-                self.callback_handler.emit(EventType.ITERATION_START, iteration=iteration)
-                self.logger.debug(f"Starting iteration {iteration}")
-                
-                iteration_state = IterationState(
-                    iteration_number=iteration,
-                    start_time=iter_start
-                )
-                
+            while True:
+                item = chunks.get()
+                if item is done:
+                    break
+                yield item
+        finally:
+            stop.set()
+            # Free the buffer so a put blocked on it returns; the next one raises
+            while True:
+                try:
+                    chunks.get_nowait()
+                except queue.Empty:
+                    break
+            thread.join()
+    
+    def _run(
+        self,
+        task: str,
+        use_stream: bool,
+        sink: Optional[Callable[[StreamChunk], None]] = None,
+        session: bool = False
+    ) -> AgentResponse:
+        """Sync execution loop shared by run(), stream() and chat()."""
+        run = self._start_run(task, session)
+        
+        try:
+            while not run.success and run.iteration < self.config.max_iterations:
+                iteration_state = self._start_iteration(run)
                 if use_stream:
-                    content, assistant_message = self._stream_response(messages, iteration)
+                    content, assistant_message = self._stream_response(
+                        run.context.messages, run.iteration, sink, run.started, iteration_state
+                    )
                 else:
-                    assistant_message = self._non_stream_response(messages)
+                    assistant_message = self._non_stream_response(run.context.messages, iteration_state)
                     content = assistant_message.content or ""
+                    if content and sink is not None:
+                        sink(StreamChunk(StreamChunkType.TEXT_DELTA, iteration=run.iteration, content=content))
                 
-                if content and not assistant_message.tool_calls:
-                    iteration_state.thinking = content
-                    self.callback_handler.emit(EventType.THINKING, iteration=iteration, content=content)
-                
-                msg_dict = {"role": "assistant"}
-                if assistant_message.content:
-                    msg_dict["content"] = assistant_message.content
-                if assistant_message.tool_calls:
-                    msg_dict["tool_calls"] = [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments
-                            }
-                        }
-                        for tc in assistant_message.tool_calls
-                    ]
-                messages.append(msg_dict)
+                for chunk in self._take_reply(run, iteration_state, content, assistant_message, sink is not None):
+                    sink(chunk)
                 
                 if assistant_message.tool_calls:
-                    self.logger.info(f"Agent requested {len(assistant_message.tool_calls)} tool(s)")
-                    
-                    for tool_call in assistant_message.tool_calls:
-                        tracked_call = ToolCall(
-                            id=tool_call.id,
-                            name=tool_call.function.name,
-                            arguments=json.loads(tool_call.function.arguments)
-                        )
-                        iteration_state.tool_calls.append(tracked_call)
-                        
-                        result = self._execute_tool_call(tool_call)
-                        
-                        messages.append({
-                            "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "content": result
-                        })
-                
-                else:
-                    final_response = assistant_message.content or ""
-                    iteration_state.response = final_response
-                    success = True
-                    
-                    iteration_state.end_time = datetime.now()
-                    iterations.append(iteration_state)
-                    
-                    self.callback_handler.emit(EventType.ITERATION_END, iteration=iteration)
-                    self.logger.info(f"Task completed in {iteration} iteration(s)")
-                    
+                    results = self._execute_tool_calls(
+                        assistant_message.tool_calls, run.started,
+                        on_result=self._tool_result_sink(sink, run.iteration)
+                    )
+                    self._take_tool_results(run, iteration_state, assistant_message.tool_calls, results)
+            
+            self._check_run_finished(run)
+        
+        except Exception as e:
+            self._run_failed(run, e)
+        finally:
+            # Tool calls dispatched before a failure must not outlive the run
+            self._abandon_tool_calls(run.started)
+        
+        response = self._finish_run(run)
+        if sink is not None:
+            sink(StreamChunk(StreamChunkType.FINAL_RESPONSE, content=run.final_response, response=response))
+        return response
+    
+    async def arun(self, task: str, stream: Optional[bool] = None) -> AgentResponse:
+        """
+        Run a task using the agent from a coroutine.
+        
+        Uses the async OpenAI client and awaits tool execution, so a single
+        event loop can multiplex many concurrent agent runs.
+        
+        Args:
+            task: The task/prompt for the agent
+            stream: Override default streaming setting
+            
+        Returns:
+            AgentResponse with complete execution details
+        """
+        use_stream = stream if stream is not None else self.config.stream
+        return await self._arun(task, use_stream)
+    
+    async def astream(self, task: str) -> AsyncIterator[StreamChunk]:
+        """
+        Run a task from a coroutine and yield typed chunks as they arrive.
+        
+        Yields the same chunks as stream(), ending with a FINAL_RESPONSE chunk
+        carrying the AgentResponse. The run is a task on the caller's event
+        loop that waits once STREAM_BUFFER_SIZE chunks are buffered ahead of
+        the caller. If the caller stops iterating early (``break`` or
+        ``aclose()``), the task is cancelled and awaited.
+        
+        Example:
+            ```python
+            async for chunk in agent.astream("Calculate 5 + 3"):
+                if chunk.type == StreamChunkType.TEXT_DELTA:
+                    await send(chunk.content)
+            ```
+        """
+        chunks: asyncio.Queue = asyncio.Queue(maxsize=STREAM_BUFFER_SIZE)
+        done = object()
+        stop = asyncio.Event()
+        
+        async def runner() -> AgentResponse:
+            try:
+                return await self._arun(task, True, sink=chunks.put)
+            finally:
+                if not stop.is_set():
+                    await chunks.put(done)
+        
+        run_task = asyncio.ensure_future(runner())
+        try:
+            while True:
+                item = await chunks.get()
+                if item is done:
                     break
+                yield item
+            await run_task
+        finally:
+            stop.set()
+            if not run_task.done():
+                run_task.cancel()
+                try:
+                    await run_task
+                except asyncio.CancelledError:
+                    pass
+    
+    async def _arun(
+        self,
+        task: str,
+        use_stream: bool,
+        sink: Optional[Callable[[StreamChunk], Awaitable[None]]] = None,
+        session: bool = False
+    ) -> AgentResponse:
+        """Async execution loop shared by arun(), astream() and achat(); see _run()."""
+        run = self._start_run(task, session)
+        
+        try:
+            while not run.success and run.iteration < self.config.max_iterations:
+                iteration_state = self._start_iteration(run)
+                # Shared by tool calls dispatched mid-stream and the remaining ones
+                tool_semaphore = asyncio.Semaphore(self.config.max_tool_concurrency) if run.started is not None else None
+                if use_stream:
+                    content, assistant_message = await self._astream_response(
+                        run.context.messages, run.iteration, sink, run.started, iteration_state, tool_semaphore
+                    )
+                else:
+                    assistant_message = await self._anon_stream_response(run.context.messages, iteration_state)
+                    content = assistant_message.content or ""
+                    if content and sink is not None:
+                        await sink(StreamChunk(StreamChunkType.TEXT_DELTA, iteration=run.iteration, content=content))
+                
+                for chunk in self._take_reply(run, iteration_state, content, assistant_message, sink is not None):
+                    await sink(chunk)
                 
-                iteration_state.end_time = datetime.now()
-                iterations.append(iteration_state)
-                self.callback_handler.emit(EventType.ITERATION_END, iteration=iteration)
+                if assistant_message.tool_calls:
+                    results = await self._aexecute_tool_calls(
+                        assistant_message.tool_calls, run.started, tool_semaphore,
+                        on_result=self._atool_result_sink(sink, run.iteration)
+                    )
+                    self._take_tool_results(run, iteration_state, assistant_message.tool_calls, results)
             
-            if iteration >= self.config.max_iterations and not success:
-                error_message = f"Maximum iterations ({self.config.max_iterations}) reached"
-                self.logger.warning(error_message)
-                raise AgentExecutionError(error_message)
+            self._check_run_finished(run)
         
         except Exception as e:
-            error_message = str(e)
-            self.logger.error(f"Error during execution: {error_message}", exc_info=True)
-            self.callback_handler.emit(EventType.ERROR, error=error_message)
-            success = False
+            self._run_failed(run, e)
+        finally:
+            # Tool calls dispatched before a failure must not outlive the run
+            await self._aabandon_tool_calls(run.started)
         
-        end_time = datetime.now()
-        total_tool_calls = sum(len(iter_state.tool_calls) for iter_state in iterations)
+        response = self._finish_run(run)
+        if sink is not None:
+            await sink(StreamChunk(StreamChunkType.FINAL_RESPONSE, content=run.final_response, response=response))
+        return response
+    
+    def run_many(
+        self,
+        tasks: Iterable[str],
+        concurrency: int = 8,
+        stream: Optional[bool] = None
+    ) -> BatchRun:
+        """
+        Run many independent tasks concurrently on a thread pool.
         
-        response = AgentResponse(
-            task=task,
-            response=final_response,
-            iterations=iterations,
-            total_tool_calls=total_tool_calls,
-            success=success,
-            error_message=error_message,
-            start_time=start_time,
-            end_time=end_time
+        All runs share this agent's client, tool registry and caches. Responses
+        are yielded as they complete (use ``response.task`` to match them to
+        inputs); failed runs are yielded with ``success=False`` rather than
+        raising. Breaking out of the loop early does not interrupt the runs
+        already in flight; they finish in the background.
+        
+        Args:
+            tasks: Task prompts; consumed lazily, so a generator works for large batches
+            concurrency: Maximum runs in flight at once
+            stream: Override default streaming setting
+            
+        Returns:
+            BatchRun iterating AgentResponses, with aggregate ``stats`` at the end
+            
+        Example:
+            ```python
+            batch = agent.run_many(questions, concurrency=16)
+            for response in batch:
+                print(response.task, "->", response.response)
+            print(f"{batch.stats.throughput:.1f} tasks/s, p95 {batch.stats.latency_p95:.2f}s")
+            ```
+        """
+        if concurrency < 1:
+            raise AgentConfigurationError("concurrency must be at least 1")
+        self._refresh_tool_registry()
+        use_stream = stream if stream is not None else self.config.stream
+        return BatchRun(self, tasks, concurrency, use_stream)
+    
+    def arun_many(
+        self,
+        tasks: Iterable[str],
+        concurrency: int = 32,
+        stream: Optional[bool] = None
+    ) -> AsyncBatchRun:
+        """
+        Run many independent tasks concurrently on the current event loop.
+        
+        Async counterpart of run_many(); iterate the result with ``async for``.
+        
+        Args:
+            tasks: Task prompts; consumed lazily
+            concurrency: Maximum runs in flight at once
+            stream: Override default streaming setting
+            
+        Returns:
+            AsyncBatchRun iterating AgentResponses, with aggregate ``stats`` at the end
+        """
+        if concurrency < 1:
+            raise AgentConfigurationError("concurrency must be at least 1")
+        self._refresh_tool_registry()
+        use_stream = stream if stream is not None else self.config.stream
+        return AsyncBatchRun(self, tasks, concurrency, use_stream)
+    
+    def chat(self, message: str, stream: Optional[bool] = None) -> AgentResponse:
+        """
+        Send a message in this agent's ongoing conversation.
+        
+        Unlike run(), earlier turns (including tool calls and their results)
+        are kept and sent with every request, so follow-up questions can refer
+        to them without tools being re-run. Successful turns are appended to
+        ``conversation_history``; a failed turn leaves the conversation as it was.
+        A single agent should not chat from several threads at once.
+        
+        Args:
+            message: The user message
+            stream: Override default streaming setting
+            
+        Returns:
+            AgentResponse for this turn
+            
+        Example:
+            ```python
+            agent.chat("What is 5 + 3?")
+            agent.chat("And times 2?")
+            saved = agent.save_session()
+            ```
+        """
+        use_stream = stream if stream is not None else self.config.stream
+        return self._run(message, use_stream, session=True)
+    
+    async def achat(self, message: str, stream: Optional[bool] = None) -> AgentResponse:
+        """
+        Send a message in this agent's ongoing conversation from a coroutine.
+        
+        See chat().
+        
+        Args:
+            message: The user message
+            stream: Override default streaming setting
+            
+        Returns:
+            AgentResponse for this turn
+        """
+        use_stream = stream if stream is not None else self.config.stream
+        return await self._arun(message, use_stream, session=True)
+    
+    def save_session(self) -> str:
+        """
+        Serialize the conversation history to compact JSON.
+        
+        Returns:
+            A string that load_session() restores
+        """
+        messages = []
+        for message in self.conversation_history:
+            entry = _message_to_dict(message)
+            entry["ts"] = round(message.timestamp.timestamp(), 3)
+            messages.append(entry)
+        return json.dumps(
+            {"version": SESSION_FORMAT_VERSION, "messages": messages},
+            separators=(",", ":"),
+            ensure_ascii=False
         )
+    
+    def load_session(self, data: str) -> "Agent":
+        """
+        Restore a conversation saved with save_session(), replacing the current one.
         
-        self.callback_handler.emit(EventType.AGENT_END, response=final_response, success=success)
-        self.logger.info(f"Agent finished. Success: {success}, Duration: {response.total_duration:.2f}s")
+        Args:
+            data: Output of save_session()
+            
+        Returns:
+            The agent, for chaining
+        """
+        try:
+            session = json.loads(data)
+            if session.get("version") != SESSION_FORMAT_VERSION:
+                raise ValueError(f"unsupported session version {session.get('version')!r}")
+            history = [
+                _message_from_dict(entry, datetime.fromtimestamp(entry["ts"]) if "ts" in entry else None)
+                for entry in session["messages"]
+            ]
+        except (ValueError, KeyError, TypeError) as e:
+            raise AgentConfigurationError(f"Invalid session data: {str(e)}")
         
-        return response
+        self.conversation_history = history
+        self._session = None
+        return self
     
     def reset(self) -> None:
         """Reset conversation history."""
         self.conversation_history = []
+        self._session = None
         self.logger.info("Conversation history cleared")
         if self.config.verbose:
             print("✓ Conversation history cleared")
@@ -0,0 +1,200 @@
+"""
+Batch Runs for OR-AF
+
+Result streams returned by Agent.run_many() and Agent.arun_many().
+"""
+
+import asyncio
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Iterable, Iterator, List, Optional, Set
+
+from ..exceptions import AgentConfigurationError, AgentExecutionError
+from ..models.agent_models import AgentResponse, BatchStats
+
+if TYPE_CHECKING:
+    from .agent import Agent
+
+
+def _percentile(sorted_values: List[float], percent: float) -> Optional[float]:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+# Marks the end of the task input
+_NO_TASK = object()
+
+
+class _BatchResults:
+    """Collects the responses of a batch and computes its statistics."""
+    
+    def __init__(self, concurrency: int):
+        self.responses: List[AgentResponse] = []
+        self._concurrency = concurrency
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        self._consumed = False
+        self._invalid_task: Optional[AgentConfigurationError] = None
+    
+    def _start(self) -> None:
+        if self._consumed:
+            raise AgentExecutionError(f"{type(self).__name__} can only be iterated once")
+        self._consumed = True
+        self._started = time.perf_counter()
+    
+    def _record(self, response: AgentResponse) -> AgentResponse:
+        self.responses.append(response)
+        self._finished = time.perf_counter()
+        return response
+    
+    def _refill(self, tasks: Iterator[Any], pending: Set[Any], submit: Callable[[str], Any]) -> None:
+        """Start runs for the next tasks until ``concurrency`` are in flight or the input ends."""
+        while self._invalid_task is None and len(pending) < self._concurrency:
+            task = next(tasks, _NO_TASK)
+            if task is _NO_TASK:
+                return
+            if not isinstance(task, str):
+                # Raised once the runs already in flight have been yielded
+                self._invalid_task = AgentConfigurationError(
+                    f"Batch tasks must be strings, got {type(task).__name__}"
+                )
+                return
+            pending.add(submit(task))
+    
+    @property
+    def stats(self) -> BatchStats:
+        """
+        Throughput and latency statistics of the responses received so far.
+        
+        Latency is each run's total_duration; throughput is completed tasks
+        per second of wall time since the batch started.
+        """
+        latencies = sorted(response.total_duration for response in self.responses)
+        succeeded = sum(1 for response in self.responses if response.success)
+        wall_time = (
+            self._finished - self._started
+            if self._started is not None and self._finished is not None else 0.0
+        )
+        return BatchStats(
+            total=len(self.responses),
+            succeeded=succeeded,
+            failed=len(self.responses) - succeeded,
+            wall_time=wall_time,
+            throughput=len(self.responses) / wall_time if wall_time > 0 else 0.0,
+            latency_mean=sum(latencies) / len(latencies) if latencies else None,
+            latency_p50=_percentile(latencies, 50),
+            latency_p95=_percentile(latencies, 95),
+            latency_p99=_percentile(latencies, 99),
+            latency_max=latencies[-1] if latencies else None,
+            total_tool_calls=sum(response.total_tool_calls for response in self.responses)
+        )
+
+
+class BatchRun(_BatchResults):
+    """
+    Iterator over the AgentResponses of Agent.run_many(), in completion order.
+    
+    Runs execute on a thread pool with at most ``concurrency`` in flight;
+    tasks are pulled from the input lazily. Iterating drives the batch.
+    Stopping early cancels the tasks not yet started, but runs already in
+    flight cannot be interrupted: they keep going in the background and
+    their responses are discarded. A task that is not a string stops the
+    input; the runs already in flight are yielded, then
+    AgentConfigurationError is raised. ``stats`` summarizes the batch once
+    iteration is done. A batch can only be iterated once.
+    
+    Example:
+        ```python
+        batch = agent.run_many(questions, concurrency=16)
+        for response in batch:
+            store(response.task, response.response)
+        print(batch.stats.throughput, batch.stats.latency_p95)
+        ```
+    """
+    
+    def __init__(self, agent: "Agent", tasks: Iterable[str], concurrency: int, stream: bool):
+        super().__init__(concurrency)
+        self._agent = agent
+        self._tasks = tasks
+        self._stream = stream
+    
+    def __iter__(self) -> Iterator[AgentResponse]:
+        self._start()
+        return self._iterate()
+    
+    def _iterate(self) -> Iterator[AgentResponse]:
+        tasks = iter(self._tasks)
+        pending: Set[Future] = set()
+        executor = ThreadPoolExecutor(
+            max_workers=self._concurrency,
+            thread_name_prefix=f"{self._agent.name}-batch"
+        )
+        
+        def submit(task: str) -> Future:
+            return executor.submit(self._agent._run, task, self._stream)
+        
+        try:
+            self._refill(tasks, pending, submit)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                self._refill(tasks, pending, submit)
+                for future in done:
+                    yield self._record(future.result())
+            if self._invalid_task is not None:
+                raise self._invalid_task
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class AsyncBatchRun(_BatchResults):
+    """
+    Async iterator over the AgentResponses of Agent.arun_many(), in completion order.
+    
+    Runs are tasks on the current event loop with at most ``concurrency``
+    in flight. Stopping early cancels the runs still in progress and waits
+    for them to unwind. Invalid tasks are handled as in BatchRun. A batch
+    can only be iterated once.
+    
+    Example:
+        ```python
+        batch = agent.arun_many(questions, concurrency=64)
+        async for response in batch:
+            store(response.task, response.response)
+        print(batch.stats)
+        ```
+    """
+    
+    def __init__(self, agent: "Agent", tasks: Iterable[str], concurrency: int, stream: bool):
+        super().__init__(concurrency)
+        self._agent = agent
+        self._tasks = tasks
+        self._stream = stream
+    
+    def __aiter__(self) -> AsyncIterator[AgentResponse]:
+        self._start()
+        return self._iterate()
+    
+    async def _iterate(self) -> AsyncIterator[AgentResponse]:
+        tasks = iter(self._tasks)
+        pending: Set[asyncio.Future] = set()
+        
+        def submit(task: str) -> asyncio.Future:
+            return asyncio.ensure_future(self._agent._arun(task, self._stream))
+        
+        try:
+            self._refill(tasks, pending, submit)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                self._refill(tasks, pending, submit)
+                for future in done:
+                    yield self._record(future.result())
+            if self._invalid_task is not None:
+                raise self._invalid_task
+        finally:
+            for future in pending:
+                future.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,220 @@
+"""
+Context Window for OR-AF
+
+Token-budgeted message list used by the agent loop. Token counts are kept
+per message as messages are appended, and old tool outputs are truncated
+or summarized when the conversation exceeds its budget.
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+from ..llm.scheduler import CHARS_PER_TOKEN
+from ..utils.logger import default_logger
+
+
+# Tokens the chat format adds around every message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def _get_encoding(model_name: Optional[str]) -> Any:
+    """Get the tiktoken encoding for a model, or None without tiktoken."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model_name or "")
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+
+
+class ContextWindow:
+    """
+    Message list with incremental token accounting and a token budget.
+    
+    Messages are appended as the agent loop runs; each message's token count
+    is computed once. fit() is called before every model request and, while
+    the total exceeds ``max_tokens``, compacts the oldest tool outputs the
+    model has already seen, resuming after the last one it examined: each
+    is replaced by ``summarizer(content)`` if a summarizer is given,
+    otherwise truncated to ``truncate_to`` tokens. The system prompt, user
+    messages, assistant messages and tool outputs not yet answered by the
+    model are never changed.
+    
+    Token counts use tiktoken when installed (``pip install or-af[tokens]``)
+    and a characters / 4 estimate otherwise.
+    
+    Example:
+        ```python
+        context = ContextWindow(max_tokens=8000, model_name="gpt-4o")
+        context.append({"role": "system", "content": "..."})
+        context.fit()
+        client.chat.completions.create(messages=context.messages, ...)
+        ```
+    """
+    
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        model_name: Optional[str] = None,
+        summarizer: Optional[Callable[[str], str]] = None,
+        truncate_to: int = 200
+    ):
+        """
+        Args:
+            max_tokens: Token budget for the whole message list (None for unlimited)
+            model_name: Model used to pick the tokenizer
+            summarizer: Optional function returning a shorter version of a tool output
+            truncate_to: Tokens of a tool output kept when truncating
+        """
+        self.max_tokens = max_tokens
+        self.summarizer = summarizer
+        self.truncate_to = truncate_to
+        self.messages: List[Dict[str, Any]] = []
+        self.total_tokens = 0
+        self.tokens_saved = 0
+        self._token_counts: List[int] = []
+        # Index of the last assistant message, and of the first message fit() has not examined
+        self._last_assistant = -1
+        self._next_compaction = 0
+        self._originals: Dict[int, Dict[str, Any]] = {}
+        # (message count, index, original message or None if kept, tokens saved) per compaction
+        self._journal: List[Tuple[int, int, Optional[Dict[str, Any]], int]] = []
+        self._encoding = _get_encoding(model_name) if max_tokens is not None else None
+        self.logger = default_logger
+    
+    def count_tokens(self, text: str) -> int:
+        """Count the tokens of a string"""
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return len(text) // CHARS_PER_TOKEN + 1
+    
+    def _message_tokens(self, message: Dict[str, Any]) -> int:
+        tokens = MESSAGE_OVERHEAD_TOKENS + self.count_tokens(message.get("content") or "")
+        for tool_call in message.get("tool_calls") or ():
+            function = tool_call["function"]
+            tokens += self.count_tokens(function["name"]) + self.count_tokens(function["arguments"])
+        return tokens
+    
+    def append(self, message: Dict[str, Any]) -> None:
+        """Append a message, counting its tokens if a budget is set"""
+        if message.get("role") == "assistant":
+            self._last_assistant = len(self.messages)
+        self.messages.append(message)
+        if self.max_tokens is not None:
+            tokens = self._message_tokens(message)
+            self._token_counts.append(tokens)
+            self.total_tokens += tokens
+    
+    def extend(self, messages: List[Dict[str, Any]]) -> None:
+        """Append several messages"""
+        for message in messages:
+            self.append(message)
+    
+    def rollback(self, length: int) -> None:
+        """
+        Drop every message after the first ``length``.
+        
+        Compactions fit() made while the window held more than ``length``
+        messages are undone as well, restoring the earlier messages and
+        ``tokens_saved`` to their state at that length.
+        """
+        while self._journal and self._journal[-1][0] > length:
+            _, index, original, saved = self._journal.pop()
+            self._next_compaction = min(self._next_compaction, index)
+            if original is None:
+                continue
+            self.messages[index] = original
+            del self._originals[index]
+            self._token_counts[index] += saved
+            self.total_tokens += saved
+            self.tokens_saved -= saved
+        
+        del self.messages[length:]
+        if self.max_tokens is not None:
+            self.total_tokens -= sum(self._token_counts[length:])
+            del self._token_counts[length:]
+        self._next_compaction = min(self._next_compaction, length)
+        if self._last_assistant >= length:
+            self._last_assistant = next(
+                (i for i in range(length - 1, -1, -1) if self.messages[i].get("role") == "assistant"), -1
+            )
+    
+    def original(self, index: int) -> Dict[str, Any]:
+        """Get the message at an index as it was before any compaction"""
+        return self._originals.get(index, self.messages[index])
+    
+    def fit(self) -> int:
+        """
+        Compact old tool outputs until the messages fit the budget.
+        
+        Returns:
+            Tokens saved by this call
+        """
+        if self.max_tokens is None or self.total_tokens <= self.max_tokens:
+            return 0
+        
+        # Tool outputs after the last assistant message have not been seen yet
+        saved = 0
+        while self._next_compaction < self._last_assistant and self.total_tokens > self.max_tokens:
+            index = self._next_compaction
+            self._next_compaction += 1
+            message = self.messages[index]
+            if message.get("role") != "tool":
+                continue
+            
+            compacted = dict(message, content=self._compact(message.get("content") or ""))
+            tokens = self._message_tokens(compacted)
+            if tokens >= self._token_counts[index]:
+                self._journal.append((len(self.messages), index, None, 0))
+                continue
+            
+            self._journal.append((len(self.messages), index, message, self._token_counts[index] - tokens))
+            self._originals[index] = message
+            self.messages[index] = compacted
+            saved += self._token_counts[index] - tokens
+            self.total_tokens -= self._token_counts[index] - tokens
+            self._token_counts[index] = tokens
+        
+        if saved:
+            self.tokens_saved += saved
+            self.logger.debug(f"Context compacted by {saved} tokens to {self.total_tokens}")
+        if self.total_tokens > self.max_tokens:
+            self.logger.warning(
+                f"Context is {self.total_tokens} tokens after compaction, "
+                f"over the budget of {self.max_tokens}"
+            )
+        return saved
+    
+    def _compact(self, content: str) -> str:
+        """Summarize or truncate one tool output"""
+        if self.summarizer is not None:
+            try:
+                return self.summarizer(content)
+            except Exception as e:
+                self.logger.warning(f"Context summarizer failed, truncating instead: {e}")
+        
+        if self._encoding is not None:
+            tokens = self._encoding.encode(content, disallowed_special=())
+            if len(tokens) <= self.truncate_to:
+                return content
+            kept = self._encoding.decode(tokens[:self.truncate_to])
+            dropped = len(tokens) - self.truncate_to
+        else:
+            limit = self.truncate_to * CHARS_PER_TOKEN
+            if len(content) <= limit:
+                return content
+            kept = content[:limit]
+            dropped = (len(content) - limit) // CHARS_PER_TOKEN
+        return f"{kept}\n...[truncated {dropped} tokens]"
+    
+    def __len__(self) -> int:
+        return len(self.messages)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.messages)
@@ -0,0 +1,74 @@
+"""
+Agent Spec for OR-AF
+
+Reusable agent template for services that create an agent per request.
+"""
+
+from typing import Any, Optional
+
+from .agent import Agent
+from ..models.agent_models import AgentConfig
+
+
+class AgentSpec:
+    """
+    Validated, reusable recipe for creating agents cheaply.
+    
+    Configuration validation, credential and client resolution, MCP server
+    connection and callback wiring happen once when the spec is created.
+    instantiate() then produces lightweight agents that share that state and
+    only own their per-run state (id, name, conversation history).
+    
+    The tool registry and callback handler are copy-on-write: an agent that
+    connects/disconnects an MCP server or accesses ``agent.callback_handler``
+    gets its own copy, leaving the spec and other agents untouched. The
+    configuration object is shared and should be treated as read-only; create
+    another spec for different settings.
+    
+    Accepts the same arguments as Agent.
+    
+    Example:
+        ```python
+        spec = AgentSpec(
+            system_prompt="You are a support assistant.",
+            mcp_servers=[support_tools],
+            verbose=False
+        )
+        
+        def handle_request(question: str):
+            agent = spec.instantiate()
+            return agent.run(question)
+        ```
+    """
+    
+    def __init__(self, system_prompt: str, name: Optional[str] = None, **agent_kwargs: Any):
+        """
+        Create the spec.
+        
+        Args:
+            system_prompt: The system prompt defining agent behavior
+            name: Name given to instantiated agents (auto-generated per agent if not provided)
+            **agent_kwargs: Any other Agent constructor argument
+        """
+        self.name = name
+        self._template = Agent(system_prompt=system_prompt, name=name, **agent_kwargs)
+    
+    @property
+    def config(self) -> AgentConfig:
+        """Validated configuration shared by instantiated agents"""
+        return self._template.config
+    
+    def instantiate(self, name: Optional[str] = None) -> Agent:
+        """
+        Create a new agent from this spec.
+        
+        Args:
+            name: Agent name (defaults to the spec name, or an auto-generated one)
+        
+        Returns:
+            A ready-to-run Agent with empty conversation history
+        """
+        return self._template._spawn(name or self.name)
+    
+    def __repr__(self) -> str:
+        return f"AgentSpec(name={self.name!r}, model={self._template.model_name!r})"
@@ -0,0 +1,171 @@
+"""
+Stream Assembly for OR-AF
+
+Accumulates streamed chat completion deltas into an assistant message.
+Text and tool call argument fragments are collected in lists and joined
+once when the stream ends.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+@dataclass(slots=True)
+class FunctionCall:
+    """Function name and JSON arguments of a tool call"""
+    name: str
+    arguments: str
+
+
+@dataclass(slots=True)
+class AssistantToolCall:
+    """Tool call requested by the model, shaped like the OpenAI SDK's"""
+    id: str
+    function: FunctionCall
+    type: str = "function"
+
+
+@dataclass(slots=True)
+class AssistantMessage:
+    """
+    Assistant reply assembled from a stream or a cache entry.
+    
+    Exposes the same ``content`` / ``tool_calls`` attributes as the OpenAI
+    SDK message, so both can be handled by the same code.
+    """
+    content: Optional[str] = None
+    tool_calls: Optional[List[AssistantToolCall]] = None
+    
+    @classmethod
+    def from_parts(cls, content: Optional[str], tool_calls: Optional[List[Dict[str, Any]]]) -> "AssistantMessage":
+        """Build a message from content and chat API tool call dicts."""
+        return cls(
+            content=content,
+            tool_calls=[
+                AssistantToolCall(
+                    id=tc["id"],
+                    function=FunctionCall(tc["function"]["name"], tc["function"]["arguments"]),
+                    type=tc.get("type", "function")
+                )
+                for tc in tool_calls
+            ] if tool_calls else None
+        )
+
+
+@dataclass(slots=True)
+class _ToolCallBuffer:
+    """Fragments of one streamed tool call"""
+    id: str = ""
+    name: str = ""
+    fragments: List[str] = field(default_factory=list)
+    complete: bool = False
+
+
+class StreamAccumulator:
+    """
+    Collects the deltas of one streamed reply.
+    
+    Used by both the sync and async streaming paths of the agent.
+    
+    If ``on_tool_call`` is given it is called with each tool call as soon as
+    its arguments are complete, i.e. when a fragment closes the JSON object
+    and the arguments received so far parse. Calls are reported in call
+    order: one completed before an earlier call is held until that call is
+    reported. Calls never found complete mid-stream are not reported.
+    
+    Example:
+        ```python
+        accumulator = StreamAccumulator()
+        for chunk in stream:
+            text = accumulator.add(chunk.choices[0].delta)
+            if text:
+                print(text, end="")
+        message = accumulator.build()
+        ```
+    """
+    
+    __slots__ = ("_text", "_tool_calls", "_on_tool_call", "_next_report")
+    
+    def __init__(self, on_tool_call: Optional[Callable[[AssistantToolCall], None]] = None):
+        """
+        Args:
+            on_tool_call: Optional function called with each tool call completed mid-stream
+        """
+        self._text: List[str] = []
+        self._tool_calls: Dict[int, _ToolCallBuffer] = {}
+        self._on_tool_call = on_tool_call
+        self._next_report = 0
+    
+    def add(self, delta: Any) -> Optional[str]:
+        """
+        Add one streamed delta.
+        
+        Returns:
+            The delta's text content, if any, for the caller to forward
+        """
+        content = delta.content
+        if content:
+            self._text.append(content)
+        if delta.tool_calls:
+            self.add_tool_call_deltas(delta.tool_calls)
+        return content
+    
+    def add_text(self, text: str) -> None:
+        """Add a content fragment"""
+        self._text.append(text)
+    
+    def add_tool_call_deltas(self, deltas: Iterable[Any]) -> None:
+        """Add streamed tool call deltas (objects with index, id and function)"""
+        tool_calls = self._tool_calls
+        for delta in deltas:
+            buffer = tool_calls.get(delta.index)
+            if buffer is None:
+                buffer = tool_calls[delta.index] = _ToolCallBuffer()
+            if delta.id:
+                buffer.id = delta.id
+            function = delta.function
+            if function is not None:
+                if function.name:
+                    buffer.name = function.name
+                arguments = function.arguments
+                if arguments:
+                    buffer.fragments.append(arguments)
+                    # Only a fragment ending the object can complete it, so most skip the parse
+                    if self._on_tool_call is not None and not buffer.complete and arguments.rstrip().endswith("}"):
+                        self._complete(buffer)
+    
+    def _complete(self, buffer: _ToolCallBuffer) -> None:
+        """Mark a tool call complete if its arguments parse, then report completed calls in order"""
+        arguments = "".join(buffer.fragments)
+        try:
+            json.loads(arguments)
+        except ValueError:
+            return
+        buffer.fragments = [arguments]
+        buffer.complete = True
+        
+        while True:
+            buffer = self._tool_calls.get(self._next_report)
+            if buffer is None or not buffer.complete:
+                return
+            self._next_report += 1
+            self._on_tool_call(AssistantToolCall(id=buffer.id, function=FunctionCall(buffer.name, buffer.fragments[0])))
+    
+    @property
+    def content(self) -> Optional[str]:
+        """Text received so far, or None if there was none"""
+        return "".join(self._text) if self._text else None
+    
+    def build(self) -> AssistantMessage:
+        """Join the collected fragments into the assistant message"""
+        tool_calls = None
+        if self._tool_calls:
+            tool_calls = [
+                AssistantToolCall(
+                    id=buffer.id,
+                    function=FunctionCall(buffer.name, "".join(buffer.fragments))
+                )
+                for _, buffer in sorted(self._tool_calls.items())
+            ]
+        return AssistantMessage(content=self.content, tool_calls=tool_calls)
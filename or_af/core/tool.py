@@ -2,16 +2,30 @@
 OR-AF Core Module - Tool implementation
 """
 
+import asyncio
 import inspect
 import time
-from typing import Callable, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Hashable, Optional, Tuple
 from pydantic import BaseModel, Field
 
+from ..cache.tool_cache import ToolCachePolicy, ToolResultCache
 from ..models.tool_models import ToolSchema, ToolResult
 from ..exceptions import ToolExecutionError
 from ..utils.logger import default_logger
 
 
+def _run_coroutine(coroutine: Any) -> Any:
+    """Run a coroutine to completion from sync code, on a worker thread if this thread runs an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+    # e.g. a sync agent run from async code or a notebook cell
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="or-af-tool-loop") as executor:
+        return executor.submit(asyncio.run, coroutine).result()
+
+
 class Tool(BaseModel):
     """Represents a tool that can be used by agents via MCP servers."""
     
@@ -23,11 +37,37 @@ class Tool(BaseModel):
         arbitrary_types_allowed = True
         extra = "allow"
     
-    def __init__(self, name: str, func: Callable, description: Optional[str] = None, **kwargs):
-        """Initialize tool."""
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        description: Optional[str] = None,
+        cache: Optional[ToolCachePolicy] = None,
+        **kwargs
+    ):
+        """
+        Initialize tool.
+        
+        Args:
+            name: Tool name
+            func: Tool function (sync or async)
+            description: Tool description (defaults to the docstring)
+            cache: Optional policy to memoize successful results per argument set;
+                only use it for deterministic tools
+        """
         desc = description or func.__doc__ or "No description provided"
         super().__init__(name=name, func=func, description=desc, **kwargs)
         object.__setattr__(self, 'logger', default_logger)
+        object.__setattr__(self, '_result_cache', ToolResultCache(cache) if cache is not None else None)
+        
+        # Compile the schema once; it only depends on the function signature
+        schema = ToolSchema(
+            name=self.name,
+            description=self.description,
+            parameters=self._extract_parameters()
+        )
+        object.__setattr__(self, '_schema', schema)
+        object.__setattr__(self, '_openai_format', schema.to_openai_format())
     
     def _extract_parameters(self) -> Dict[str, Any]:
         """Extract function parameters and create OpenAI function schema."""
@@ -78,27 +118,70 @@ class Tool(BaseModel):
         }
     
     def get_schema(self) -> ToolSchema:
-        """Get tool schema."""
-        parameters = self._extract_parameters()
-        return ToolSchema(
-            name=self.name,
-            description=self.description,
-            parameters=parameters
-        )
+        """Get tool schema (compiled once at construction)."""
+        return object.__getattribute__(self, '_schema')
     
     def to_openai_format(self) -> Dict[str, Any]:
-        """Convert tool to OpenAI function calling format."""
-        schema = self.get_schema()
-        return schema.to_openai_format()
+        """
+        Convert tool to OpenAI function calling format.
+        
+        Returns the dict compiled at construction; treat it as read-only.
+        """
+        return object.__getattribute__(self, '_openai_format')
+    
+    def _cache_lookup(self, tool_call_id: str, kwargs: Dict[str, Any]) -> Tuple[Optional[Hashable], Optional[ToolResult]]:
+        """Return (cache key, cached result) for a call; both None when caching is off."""
+        cache = object.__getattribute__(self, '_result_cache')
+        if cache is None:
+            return None, None
+        key = cache.make_key(kwargs)
+        if key is None:
+            return None, None
+        cached = cache.get(key, tool_call_id)
+        if cached is not None:
+            logger = object.__getattribute__(self, 'logger')
+            logger.info(f"Tool {self.name} served from cache (saved {cached.saved_time:.3f}s)")
+        return key, cached
+    
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get result cache statistics, or None if the tool is not cached."""
+        cache = object.__getattribute__(self, '_result_cache')
+        return cache.stats() if cache is not None else None
+    
+    def clear_cache(self) -> None:
+        """Drop all memoized results."""
+        cache = object.__getattribute__(self, '_result_cache')
+        if cache is not None:
+            cache.clear()
     
     def execute(self, tool_call_id: str, **kwargs) -> ToolResult:
-        """Execute the tool with given arguments."""
+        """
+        Execute the tool with given arguments.
+        
+        Coroutine functions are run to completion on a fresh event loop, in a
+        worker thread if the calling thread is already running one; aexecute()
+        awaits them on the caller's loop instead.
+        """
+        key, cached = self._cache_lookup(tool_call_id, kwargs)
+        if cached is not None:
+            return cached
+        
+        result = self._execute(tool_call_id, **kwargs)
+        if key is not None:
+            object.__getattribute__(self, '_result_cache').set(key, result)
+        return result
+    
+    def _execute(self, tool_call_id: str, **kwargs) -> ToolResult:
+        """Run the tool function, bypassing the result cache."""
         logger = object.__getattribute__(self, 'logger')
         logger.info(f"Executing tool: {self.name} with args: {kwargs}")
         start_time = time.time()
         
         try:
-            result = self.func(**kwargs)
+            if inspect.iscoroutinefunction(self.func):
+                result = _run_coroutine(self.func(**kwargs))
+            else:
+                result = self.func(**kwargs)
             execution_time = time.time() - start_time
             
             logger.info(f"Tool {self.name} completed successfully in {execution_time:.3f}s")
@@ -121,6 +204,59 @@ class Tool(BaseModel):
                 tool_name=self.name,
                 result=None,
                 error=error_msg,
+                error_type=type(e).__name__,
+                execution_time=execution_time
+            )
+    
+    async def aexecute(self, tool_call_id: str, **kwargs) -> ToolResult:
+        """
+        Execute the tool from a coroutine.
+        
+        Coroutine functions are awaited directly; plain functions are run in a
+        worker thread so they never block the event loop.
+        """
+        key, cached = self._cache_lookup(tool_call_id, kwargs)
+        if cached is not None:
+            return cached
+        
+        result = await self._aexecute(tool_call_id, **kwargs)
+        if key is not None:
+            object.__getattribute__(self, '_result_cache').set(key, result)
+        return result
+    
+    async def _aexecute(self, tool_call_id: str, **kwargs) -> ToolResult:
+        """Run the tool function from a coroutine, bypassing the result cache."""
+        logger = object.__getattribute__(self, 'logger')
+        logger.info(f"Executing tool: {self.name} with args: {kwargs}")
+        start_time = time.time()
+        
+        try:
+            if inspect.iscoroutinefunction(self.func):
+                result = await self.func(**kwargs)
+            else:
+                result = await asyncio.to_thread(self.func, **kwargs)
+            execution_time = time.time() - start_time
+            
+            logger.info(f"Tool {self.name} completed successfully in {execution_time:.3f}s")
+            
+            return ToolResult(
+                tool_call_id=tool_call_id,
+                tool_name=self.name,
+                result=result,
+                execution_time=execution_time
+            )
+        
+        except Exception as e:
+            execution_time = time.time() - start_time
+            error_msg = f"Error in tool {self.name}: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            
+            return ToolResult(
+                tool_call_id=tool_call_id,
+                tool_name=self.name,
+                result=None,
+                error=error_msg,
+                error_type=type(e).__name__,
                 execution_time=execution_time
             )
     
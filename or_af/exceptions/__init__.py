@@ -86,7 +86,11 @@ class InvalidEdgeError(WorkflowError):
 
 class CycleDetectedError(WorkflowError):
     """Cycle detected in workflow graph"""
-    pass
+    
+    def __init__(self, message: str, cycle: list = None, components: list = None):
+        super().__init__(message)
+        self.cycle = cycle or []
+        self.components = components or []
 
 
 class WorkflowExecutionError(WorkflowError):
@@ -110,6 +114,17 @@ class A2ARoutingError(A2AError):
     pass
 
 
+# LLM Exceptions
+class LLMError(ORAFError):
+    """Base exception for LLM client errors"""
+    pass
+
+
+class LLMConfigurationError(LLMError):
+    """Error in LLM client configuration"""
+    pass
+
+
 # Callback Exceptions
 class CallbackError(ORAFError):
     """Base exception for callback errors"""
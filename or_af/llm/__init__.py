@@ -0,0 +1,32 @@
+"""
+OR-AF LLM Module
+
+Shared infrastructure for talking to the LLM deployment: pooled clients,
+request scheduling and pluggable backends.
+"""
+
+from .pool import ClientPool, ClientPoolConfig, default_client_pool, load_credentials
+from .backends import (
+    LLMBackend,
+    AzureOpenAIBackend,
+    ReplayBackend,
+    ReplayTiming,
+    RecordingBackend,
+)
+from .scheduler import RequestScheduler, SchedulerConfig, TokenBucket, estimate_request_tokens
+
+__all__ = [
+    "ClientPool",
+    "ClientPoolConfig",
+    "default_client_pool",
+    "load_credentials",
+    "LLMBackend",
+    "AzureOpenAIBackend",
+    "ReplayBackend",
+    "ReplayTiming",
+    "RecordingBackend",
+    "RequestScheduler",
+    "SchedulerConfig",
+    "TokenBucket",
+    "estimate_request_tokens",
+]
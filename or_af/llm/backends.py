@@ -0,0 +1,407 @@
+"""
+OR-AF LLM Backends
+
+Pluggable sources of chat completions. An agent given a backend sends its
+requests there instead of to its pooled Azure OpenAI clients, which lets
+recorded traces stand in for the live deployment in tests and benchmarks.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from ..exceptions import LLMConfigurationError, LLMError
+from .pool import ClientPool, default_client_pool, load_credentials
+
+
+# Version of the trace file format written by RecordingBackend
+TRACE_FORMAT_VERSION = 1
+
+
+class LLMBackend(ABC):
+    """
+    Interface for chat completion backends.
+
+    ``create``/``acreate`` take the keyword arguments of
+    ``client.chat.completions.create`` and return what the OpenAI SDK would:
+    a completion whose ``choices[0].message`` has ``content``/``tool_calls``,
+    or, when ``stream=True``, an (async) iterable of chunks whose
+    ``choices[0].delta`` carries content and tool call fragments.
+    """
+
+    @abstractmethod
+    def create(self, **api_params: Any) -> Any:
+        """Create a chat completion"""
+        pass
+
+    @abstractmethod
+    async def acreate(self, **api_params: Any) -> Any:
+        """Create a chat completion from a coroutine"""
+        pass
+
+
+class AzureOpenAIBackend(LLMBackend):
+    """
+    Backend sending requests to Azure OpenAI through pooled clients.
+
+    Agents without a backend behave the same way; this class makes the live
+    deployment available wherever an LLMBackend is expected, e.g. to wrap it
+    in a RecordingBackend.
+    """
+
+    def __init__(self, client_pool: Optional[ClientPool] = None, max_retries: Optional[int] = None):
+        """
+        Args:
+            client_pool: Pool providing the clients (defaults to the process-wide pool)
+            max_retries: Override of the clients' own retries (use 0 behind a RequestScheduler)
+        """
+        self.client_pool = client_pool or default_client_pool
+        self.max_retries = max_retries
+        self._credentials = load_credentials()
+
+    def create(self, **api_params: Any) -> Any:
+        client = self.client_pool.get_client(*self._credentials, max_retries=self.max_retries)
+        return client.chat.completions.create(**api_params)
+
+    async def acreate(self, **api_params: Any) -> Any:
+        client = self.client_pool.get_async_client(*self._credentials, max_retries=self.max_retries)
+        return await client.chat.completions.create(**api_params)
+
+
+# Lightweight stand-ins for the OpenAI SDK response objects
+
+
+@dataclass(slots=True)
+class _Function:
+    name: Optional[str]
+    arguments: Optional[str]
+
+
+@dataclass(slots=True)
+class _ToolCall:
+    id: Optional[str]
+    function: _Function
+    index: int = 0
+    type: str = "function"
+
+
+@dataclass(slots=True)
+class _Message:
+    content: Optional[str]
+    tool_calls: Optional[List[_ToolCall]]
+    role: str = "assistant"
+
+
+@dataclass(slots=True)
+class _Choice:
+    message: Optional[_Message] = None
+    delta: Optional[_Message] = None
+    finish_reason: Optional[str] = None
+    index: int = 0
+
+
+@dataclass(slots=True)
+class _Completion:
+    choices: List[_Choice]
+    usage: Optional[Any] = None
+    model: Optional[str] = None
+
+
+@dataclass(slots=True)
+class _Usage:
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+
+
+def _includes_usage(api_params: Dict[str, Any]) -> bool:
+    """Whether a streaming request asks for a final usage chunk."""
+    return bool((api_params.get("stream_options") or {}).get("include_usage"))
+
+
+@dataclass
+class ReplayTiming:
+    """
+    Simulated latency of a ReplayBackend.
+
+    Attributes:
+        time_to_first_token: Seconds before the first chunk (or the whole non-streaming response)
+        chunk_interval: Seconds between streamed chunks
+        chunk_chars: Characters of content or tool call arguments per streamed chunk
+    """
+    time_to_first_token: float = 0.0
+    chunk_interval: float = 0.0
+    chunk_chars: int = 16
+
+
+class ReplayBackend(LLMBackend):
+    """
+    Deterministic offline backend replaying recorded assistant responses.
+
+    A trace is a list of response entries ``{"content": ..., "tool_calls":
+    [...], "usage": {...}}`` (the format RecordingBackend writes and the
+    response cache stores). With ``match="turn"`` a request gets the entry at
+    the index of its conversation turn, i.e. the number of assistant
+    messages it already contains, so concurrent runs each replay the trace
+    from the start. With ``match="sequence"`` entries are handed out in order
+    across all requests. Streaming requests receive the entry split into
+    chunks, followed by a usage chunk if the entry has usage and the request
+    sets ``stream_options={"include_usage": True}``; timing is simulated
+    with ``ReplayTiming``.
+
+    Example:
+        ```python
+        backend = ReplayBackend.load("traces/calculator.json", timing=ReplayTiming(
+            time_to_first_token=0.3, chunk_interval=0.01
+        ))
+        agent = Agent(system_prompt="...", mcp_servers=[calculator], backend=backend)
+        agent.run("Calculate 5 + 3")  # no network access
+        ```
+    """
+
+    def __init__(
+        self,
+        responses: List[Dict[str, Any]],
+        match: str = "turn",
+        timing: Optional[ReplayTiming] = None,
+        loop: bool = False
+    ):
+        """
+        Args:
+            responses: Recorded response entries, in conversation order
+            match: "turn" (by conversation turn) or "sequence" (global order)
+            timing: Simulated latency (defaults to none)
+            loop: Start over at the first entry instead of failing when the trace runs out
+        """
+        if match not in ("turn", "sequence"):
+            raise LLMConfigurationError(f"Unknown replay match mode '{match}'")
+        if not responses:
+            raise LLMConfigurationError("Replay trace has no responses")
+        self.responses = responses
+        self.match = match
+        self.timing = timing or ReplayTiming()
+        self.loop = loop
+        self.requests = 0
+        self._position = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, **kwargs: Any) -> "ReplayBackend":
+        """Create a backend from a trace file written by RecordingBackend.save()."""
+        with open(path, "r", encoding="utf-8") as f:
+            trace = json.load(f)
+        if isinstance(trace, dict):
+            if trace.get("version") != TRACE_FORMAT_VERSION:
+                raise LLMConfigurationError(f"Unsupported trace version {trace.get('version')!r}")
+            trace = trace["responses"]
+        return cls(trace, **kwargs)
+
+    def _next_entry(self, api_params: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.requests += 1
+            if self.match == "sequence":
+                index = self._position
+                self._position += 1
+            else:
+                index = sum(1 for m in api_params.get("messages", ()) if m.get("role") == "assistant")
+        if index >= len(self.responses):
+            if not self.loop:
+                raise LLMError(f"Replay trace exhausted after {len(self.responses)} responses")
+            index %= len(self.responses)
+        return self.responses[index]
+
+    @staticmethod
+    def _tool_calls(entry: Dict[str, Any]) -> Optional[List[_ToolCall]]:
+        if not entry.get("tool_calls"):
+            return None
+        return [
+            _ToolCall(
+                id=tc["id"],
+                function=_Function(tc["function"]["name"], tc["function"]["arguments"]),
+                index=index
+            )
+            for index, tc in enumerate(entry["tool_calls"])
+        ]
+
+    def _completion(self, entry: Dict[str, Any], model: Optional[str]) -> _Completion:
+        usage = entry.get("usage")
+        message = _Message(content=entry.get("content"), tool_calls=self._tool_calls(entry))
+        return _Completion(
+            choices=[_Choice(message=message, finish_reason="tool_calls" if message.tool_calls else "stop")],
+            usage=_Usage(**usage) if usage else None,
+            model=model
+        )
+
+    def _chunks(self, entry: Dict[str, Any], include_usage: bool = False) -> List[_Completion]:
+        """Split an entry into stream chunks the way the API fragments them."""
+        size = max(1, self.timing.chunk_chars)
+        chunks = []
+        content = entry.get("content") or ""
+        for start in range(0, len(content), size):
+            delta = _Message(content=content[start:start + size], tool_calls=None)
+            chunks.append(_Completion(choices=[_Choice(delta=delta)]))
+
+        for index, tc in enumerate(entry.get("tool_calls") or ()):
+            arguments = tc["function"]["arguments"]
+            header = _ToolCall(id=tc["id"], function=_Function(tc["function"]["name"], ""), index=index)
+            chunks.append(_Completion(choices=[_Choice(delta=_Message(content=None, tool_calls=[header]))]))
+            for start in range(0, len(arguments), size):
+                fragment = _ToolCall(id=None, function=_Function(None, arguments[start:start + size]), index=index)
+                chunks.append(_Completion(choices=[_Choice(delta=_Message(content=None, tool_calls=[fragment]))]))
+
+        finish_reason = "tool_calls" if entry.get("tool_calls") else "stop"
+        chunks.append(_Completion(choices=[_Choice(delta=_Message(content=None, tool_calls=None), finish_reason=finish_reason)]))
+        if include_usage and entry.get("usage"):
+            chunks.append(_Completion(choices=[], usage=_Usage(**entry["usage"])))
+        return chunks
+
+    def _stream(self, chunks: List[_Completion]) -> Iterator[_Completion]:
+        for position, chunk in enumerate(chunks):
+            if position and self.timing.chunk_interval:
+                time.sleep(self.timing.chunk_interval)
+            yield chunk
+
+    async def _astream(self, chunks: List[_Completion]) -> AsyncIterator[_Completion]:
+        for position, chunk in enumerate(chunks):
+            if position and self.timing.chunk_interval:
+                await asyncio.sleep(self.timing.chunk_interval)
+            yield chunk
+
+    def create(self, **api_params: Any) -> Any:
+        entry = self._next_entry(api_params)
+        if self.timing.time_to_first_token:
+            time.sleep(self.timing.time_to_first_token)
+        if api_params.get("stream"):
+            return self._stream(self._chunks(entry, _includes_usage(api_params)))
+        return self._completion(entry, api_params.get("model"))
+
+    async def acreate(self, **api_params: Any) -> Any:
+        entry = self._next_entry(api_params)
+        if self.timing.time_to_first_token:
+            await asyncio.sleep(self.timing.time_to_first_token)
+        if api_params.get("stream"):
+            return self._astream(self._chunks(entry, _includes_usage(api_params)))
+        return self._completion(entry, api_params.get("model"))
+
+
+class RecordingBackend(LLMBackend):
+    """
+    Backend wrapper recording every response of another backend as a trace.
+
+    Streaming responses are passed through unchanged while their fragments
+    (and usage chunk, if requested) are collected. save() writes a file ReplayBackend.load() can replay.
+
+    Example:
+        ```python
+        recorder = RecordingBackend(AzureOpenAIBackend())
+        Agent(system_prompt="...", backend=recorder).run("Calculate 5 + 3")
+        recorder.save("traces/calculator.json")
+        ```
+    """
+
+    def __init__(self, backend: LLMBackend):
+        """
+        Args:
+            backend: Backend whose responses are recorded
+        """
+        self.backend = backend
+        self.responses: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def _record(self, content: Optional[str], tool_calls: List[Dict[str, Any]], usage: Any = None) -> None:
+        entry: Dict[str, Any] = {"content": content, "tool_calls": tool_calls or None}
+        if usage is not None:
+            entry["usage"] = {
+                "prompt_tokens": usage.prompt_tokens,
+                "completion_tokens": usage.completion_tokens,
+                "total_tokens": usage.total_tokens
+            }
+        with self._lock:
+            self.responses.append(entry)
+
+    def _record_message(self, response: Any) -> None:
+        message = response.choices[0].message
+        tool_calls = [
+            {
+                "id": tc.id,
+                "type": "function",
+                "function": {"name": tc.function.name, "arguments": tc.function.arguments}
+            }
+            for tc in message.tool_calls or ()
+        ]
+        self._record(message.content, tool_calls, getattr(response, "usage", None))
+
+    def _collect(self, chunk: Any, text: List[str], tool_calls: Dict[int, Dict[str, Any]]) -> None:
+        if not chunk.choices:
+            return
+        delta = chunk.choices[0].delta
+        if delta.content:
+            text.append(delta.content)
+        for tc in delta.tool_calls or ():
+            call = tool_calls.setdefault(tc.index, {"id": "", "name": "", "arguments": []})
+            if tc.id:
+                call["id"] = tc.id
+            if tc.function is not None:
+                if tc.function.name:
+                    call["name"] = tc.function.name
+                if tc.function.arguments:
+                    call["arguments"].append(tc.function.arguments)
+
+    def _finish_stream(self, text: List[str], tool_calls: Dict[int, Dict[str, Any]], usage: Any) -> None:
+        self._record(
+            "".join(text) if text else None,
+            [
+                {
+                    "id": call["id"],
+                    "type": "function",
+                    "function": {"name": call["name"], "arguments": "".join(call["arguments"])}
+                }
+                for _, call in sorted(tool_calls.items())
+            ],
+            usage
+        )
+
+    def _record_stream(self, stream: Any) -> Iterator[Any]:
+        text: List[str] = []
+        tool_calls: Dict[int, Dict[str, Any]] = {}
+        usage = None
+        for chunk in stream:
+            usage = getattr(chunk, "usage", None) or usage
+            self._collect(chunk, text, tool_calls)
+            yield chunk
+        self._finish_stream(text, tool_calls, usage)
+
+    async def _arecord_stream(self, stream: Any) -> AsyncIterator[Any]:
+        text: List[str] = []
+        tool_calls: Dict[int, Dict[str, Any]] = {}
+        usage = None
+        async for chunk in stream:
+            usage = getattr(chunk, "usage", None) or usage
+            self._collect(chunk, text, tool_calls)
+            yield chunk
+        self._finish_stream(text, tool_calls, usage)
+
+    def create(self, **api_params: Any) -> Any:
+        response = self.backend.create(**api_params)
+        if api_params.get("stream"):
+            return self._record_stream(response)
+        self._record_message(response)
+        return response
+
+    async def acreate(self, **api_params: Any) -> Any:
+        response = await self.backend.acreate(**api_params)
+        if api_params.get("stream"):
+            return self._arecord_stream(response)
+        self._record_message(response)
+        return response
+
+    def save(self, path: str) -> None:
+        """Write the recorded responses as a trace file"""
+        with self._lock:
+            trace = {"version": TRACE_FORMAT_VERSION, "responses": list(self.responses)}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f, indent=2)
@@ -0,0 +1,222 @@
+"""
+OR-AF LLM Client Pool
+
+Process-wide registry of OpenAI clients so agents talking to the same
+deployment share one HTTP connection pool (and TLS sessions) instead of
+each opening their own.
+"""
+
+import asyncio
+import importlib.util
+import os
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from dotenv import load_dotenv
+from openai import AzureOpenAI, AsyncAzureOpenAI
+
+from ..exceptions import LLMConfigurationError
+from ..utils.logger import default_logger
+
+
+_dotenv_loaded = False
+_dotenv_lock = threading.Lock()
+
+
+def load_credentials() -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Resolve Azure OpenAI credentials from the environment.
+
+    ``.env`` is loaded once per process rather than on every call.
+
+    Returns:
+        Tuple of (endpoint, api_version, api_key)
+    """
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        with _dotenv_lock:
+            if not _dotenv_loaded:
+                load_dotenv()
+                _dotenv_loaded = True
+    return os.getenv("endpoint"), os.getenv("api_version"), os.getenv("subscription_key")
+
+
+@dataclass(frozen=True)
+class ClientPoolConfig:
+    """
+    HTTP settings for pooled clients.
+
+    Attributes:
+        max_connections: Maximum concurrent connections per client
+        max_keepalive_connections: Idle connections kept open for reuse
+        keepalive_expiry: Seconds an idle connection is kept alive
+        http2: Use HTTP/2 (requires the ``h2`` package: ``pip install or-af[http2]``)
+        timeout: Request timeout in seconds
+        max_retries: Retries performed by the OpenAI client itself (agents with a
+            RequestScheduler use clients with 0, leaving retries to the scheduler)
+    """
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    timeout: float = 600.0
+    max_retries: int = 2
+
+
+class ClientPool:
+    """
+    Registry of shared OpenAI clients keyed by (endpoint, api_version, api_key)
+    and the client's retry count.
+
+    Sync clients are shared process-wide. Async clients are shared per event
+    loop, because an async connection pool cannot move between loops; close
+    them with ``await pool.aclose()`` from that loop, since ``close()`` can
+    only close the sync clients.
+
+    Example:
+        ```python
+        pool = ClientPool(ClientPoolConfig(max_connections=200, http2=True))
+        agent = Agent(system_prompt="...", client_pool=pool)
+        ```
+    """
+
+    def __init__(self, config: Optional[ClientPoolConfig] = None):
+        self.config = config or ClientPoolConfig()
+        if self.config.http2 and importlib.util.find_spec("h2") is None:
+            raise LLMConfigurationError(
+                "HTTP/2 requires the 'h2' package; install it with 'pip install or-af[http2]'"
+            )
+        self._clients: Dict[Tuple, AzureOpenAI] = {}
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple, AsyncAzureOpenAI]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+        self.logger = default_logger
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+            keepalive_expiry=self.config.keepalive_expiry
+        )
+
+    def _retries(self, max_retries: Optional[int]) -> int:
+        return self.config.max_retries if max_retries is None else max_retries
+
+    def get_client(
+        self,
+        endpoint: Optional[str],
+        api_version: Optional[str],
+        api_key: Optional[str],
+        max_retries: Optional[int] = None
+    ) -> AzureOpenAI:
+        """
+        Get (or create) the shared sync client for a deployment.
+
+        ``max_retries`` overrides the configured client retries.
+        """
+        max_retries = self._retries(max_retries)
+        key = (endpoint, api_version, api_key, max_retries)
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                http_client = httpx.Client(
+                    limits=self._limits(),
+                    http2=self.config.http2,
+                    timeout=self.config.timeout,
+                    follow_redirects=True
+                )
+                client = AzureOpenAI(
+                    api_key=api_key,
+                    api_version=api_version,
+                    azure_endpoint=endpoint,
+                    max_retries=max_retries,
+                    http_client=http_client
+                )
+                self._clients[key] = client
+                self.logger.debug(f"Created pooled OpenAI client for endpoint {endpoint}")
+        return client
+
+    def get_async_client(
+        self,
+        endpoint: Optional[str],
+        api_version: Optional[str],
+        api_key: Optional[str],
+        max_retries: Optional[int] = None
+    ) -> AsyncAzureOpenAI:
+        """
+        Get (or create) the shared async client for a deployment.
+
+        Must be called from a coroutine; clients are shared within the running
+        loop. ``max_retries`` overrides the configured client retries.
+        """
+        loop = asyncio.get_running_loop()
+        max_retries = self._retries(max_retries)
+        key = (endpoint, api_version, api_key, max_retries)
+
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, {})
+            client = clients.get(key)
+            if client is None:
+                http_client = httpx.AsyncClient(
+                    limits=self._limits(),
+                    http2=self.config.http2,
+                    timeout=self.config.timeout,
+                    follow_redirects=True
+                )
+                client = AsyncAzureOpenAI(
+                    api_key=api_key,
+                    api_version=api_version,
+                    azure_endpoint=endpoint,
+                    max_retries=max_retries,
+                    http_client=http_client
+                )
+                clients[key] = client
+                self.logger.debug(f"Created pooled async OpenAI client for endpoint {endpoint}")
+        return client
+
+    def close(self) -> None:
+        """
+        Close all sync clients and forget async ones.
+
+        Async clients are dropped without closing their connections, which
+        needs their event loop; code using async clients should call
+        ``aclose()`` from each loop before this.
+        """
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+            unclosed = sum(len(clients) for clients in self._async_clients.values())
+            self._async_clients.clear()
+        if unclosed:
+            self.logger.warning(
+                f"ClientPool.close() dropped {unclosed} async client(s) without closing them; "
+                "call 'await pool.aclose()' from their event loop first"
+            )
+
+    async def aclose(self) -> None:
+        """Close the async clients of the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async_clients.pop(loop, {})
+        for client in clients.values():
+            await client.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the number of pooled clients"""
+        return {
+            "sync_clients": len(self._clients),
+            "async_clients": sum(len(clients) for clients in self._async_clients.values())
+        }
+
+
+# Process-wide pool shared by agents unless they are given their own
+default_client_pool = ClientPool()
@@ -0,0 +1,508 @@
+"""
+OR-AF LLM Request Scheduler
+
+Client-side admission control for chat completion requests: token-bucket
+rate limiting on requests and tokens per minute, a concurrency cap, and
+retries with jittered exponential backoff that honor ``Retry-After``.
+One scheduler is meant to be shared by every agent using a deployment.
+"""
+
+import asyncio
+import email.utils
+import inspect
+import random
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import openai
+
+from ..utils.logger import default_logger
+
+
+# Characters per token assumed when estimating token counts without a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Marks a stream that ended before its first chunk
+_NO_CHUNK = object()
+
+
+def estimate_request_tokens(api_params: Dict[str, Any], completion_tokens: int) -> int:
+    """
+    Estimate the tokens a chat completion request counts against a TPM quota.
+
+    Uses a characters / 4 estimate of the messages plus the completion
+    allowance (``max_tokens`` if the request sets it).
+    """
+    chars = 0
+    for message in api_params.get("messages", ()):
+        chars += len(message.get("content") or "")
+        for tool_call in message.get("tool_calls") or ():
+            chars += len(tool_call["function"]["arguments"])
+    return chars // CHARS_PER_TOKEN + api_params.get("max_tokens", completion_tokens)
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Read the server's requested delay from a ``Retry-After`` (or ``retry-after-ms``) header."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled continuously at ``per_minute`` per minute.
+
+    Callers reserve capacity up front and are told how long to wait; the
+    bucket may go negative, so concurrent callers queue behind each other
+    instead of racing for the same refill.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` tokens, returning the seconds to wait before using them"""
+        with self._lock:
+            self._refill()
+            self._tokens -= min(amount, self.capacity)
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def refund(self, amount: float) -> None:
+        """Return tokens (negative to charge more) after the actual usage is known"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+
+class _ScheduledStream:
+    """
+    Streaming response of a RequestScheduler request.
+
+    Holds the request's concurrency slot until the stream is exhausted or
+    closed, then corrects the token bucket with the usage reported by the
+    stream (if any). The first chunk has already been received, so only
+    errors raised after it reach the caller from iteration. A stream
+    garbage collected without being closed releases its slot through a
+    finalizer.
+    """
+
+    def __init__(self, scheduler: "RequestScheduler", stream: Any, iterator: Any, first_chunk: Any, reserved_tokens: int):
+        self._scheduler = scheduler
+        self._stream = stream
+        self._iterator = iterator
+        self._next_chunk = first_chunk
+        self._reserved_tokens = reserved_tokens
+        self._usage = None
+        self._done = False
+        # Holds no reference to the stream, so an abandoned one can still be collected
+        self._release = weakref.finalize(self, scheduler._release_slot)
+        self._release.atexit = False
+
+    def _observe(self, chunk: Any) -> Any:
+        usage = getattr(chunk, "usage", None)
+        if usage is not None:
+            self._usage = usage
+        return chunk
+
+    def _finish(self, exhausted: bool) -> None:
+        if self._done:
+            return
+        self._done = True
+        if exhausted:
+            self._scheduler._record_usage(self._usage, self._reserved_tokens)
+        self._release()
+
+    def __iter__(self) -> "_ScheduledStream":
+        return self
+
+    def __next__(self) -> Any:
+        if self._done:
+            raise StopIteration
+        chunk, self._next_chunk = self._next_chunk, _NO_CHUNK
+        if chunk is not _NO_CHUNK:
+            return self._observe(chunk)
+        try:
+            return self._observe(next(self._iterator))
+        except StopIteration:
+            self._finish(exhausted=True)
+            raise
+        except BaseException:
+            self._scheduler._give_up()
+            self._finish(exhausted=False)
+            raise
+
+    def close(self) -> None:
+        """Stop reading the stream and release its concurrency slot"""
+        if self._done:
+            return
+        try:
+            close = getattr(self._stream, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self._finish(exhausted=False)
+
+    def __enter__(self) -> "_ScheduledStream":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class _AsyncScheduledStream(_ScheduledStream):
+    """Async counterpart of _ScheduledStream"""
+
+    def __aiter__(self) -> "_AsyncScheduledStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._done:
+            raise StopAsyncIteration
+        chunk, self._next_chunk = self._next_chunk, _NO_CHUNK
+        if chunk is not _NO_CHUNK:
+            return self._observe(chunk)
+        try:
+            return self._observe(await self._iterator.__anext__())
+        except StopAsyncIteration:
+            self._finish(exhausted=True)
+            raise
+        except BaseException:
+            self._scheduler._give_up()
+            self._finish(exhausted=False)
+            raise
+
+    async def aclose(self) -> None:
+        """Stop reading the stream and release its concurrency slot"""
+        if self._done:
+            return
+        try:
+            close = getattr(self._stream, "aclose", None) or getattr(self._stream, "close", None)
+            if close is not None:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+        finally:
+            self._finish(exhausted=False)
+
+    async def __aenter__(self) -> "_AsyncScheduledStream":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+
+@dataclass(frozen=True)
+class SchedulerConfig:
+    """
+    Limits and retry policy for a RequestScheduler.
+
+    Attributes:
+        requests_per_minute: Request quota (None for unlimited)
+        tokens_per_minute: Token quota (None for unlimited)
+        max_concurrency: Maximum requests awaiting a response at once (None for unlimited)
+        max_retries: Retries of a failed request before giving up
+        initial_backoff: Base delay in seconds for the first retry
+        max_backoff: Upper bound for the backoff delay in seconds
+        completion_tokens: Completion allowance used when estimating request tokens
+        retry_statuses: HTTP status codes that are retried
+    """
+    requests_per_minute: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+    max_concurrency: Optional[int] = None
+    max_retries: int = 5
+    initial_backoff: float = 1.0
+    max_backoff: float = 60.0
+    completion_tokens: int = 256
+    retry_statuses: Tuple[int, ...] = (408, 409, 429, 500, 502, 503, 504)
+
+
+class RequestScheduler:
+    """
+    Rate-limiting, retrying gate for LLM requests shared across agents.
+
+    Before each attempt the request reserves one request and its estimated
+    tokens from the RPM/TPM buckets, waits for a concurrency slot and for any
+    server-requested pause to end. Rate limit (429), timeout and transient
+    5xx errors are retried with jittered exponential backoff, never sooner
+    than the server's ``Retry-After``; a 429 pauses every request going
+    through the scheduler, not just the one that received it. A failed
+    attempt returns its token reservation before the retry reserves again.
+
+    Streaming requests (``stream=True``) hold their concurrency slot until
+    the returned stream is exhausted or closed, and their token usage is
+    settled from the stream's usage chunk (agents request one with
+    ``stream_options``). Errors before the first chunk
+    are retried like any other; errors after it are raised to the reader,
+    which may already have consumed part of the reply.
+
+    Agents given a scheduler take pooled clients with the OpenAI client's
+    own retries disabled, so every retry goes through the scheduler.
+
+    Example:
+        ```python
+        scheduler = RequestScheduler(SchedulerConfig(
+            requests_per_minute=600,
+            tokens_per_minute=150_000,
+            max_concurrency=32
+        ))
+        agents = [Agent(system_prompt="...", scheduler=scheduler) for _ in range(10)]
+        ```
+    """
+
+    def __init__(self, config: Optional[SchedulerConfig] = None):
+        self.config = config or SchedulerConfig()
+        self._request_bucket = (
+            TokenBucket(self.config.requests_per_minute) if self.config.requests_per_minute else None
+        )
+        self._token_bucket = (
+            TokenBucket(self.config.tokens_per_minute) if self.config.tokens_per_minute else None
+        )
+        # Re-entrant: a stream collected while this thread holds it releases its slot under it
+        self._lock = threading.RLock()
+        self._slot_released = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self.logger = default_logger
+
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.failures = 0
+        self.wait_time = 0.0
+
+    def _request_tokens(self, api_params: Dict[str, Any]) -> int:
+        """Tokens one attempt reserves from the TPM bucket (0 without a token quota)."""
+        if self._token_bucket is None:
+            return 0
+        return estimate_request_tokens(api_params, self.config.completion_tokens)
+
+    def _admission_delay(self, tokens: int) -> float:
+        """Reserve quota for one attempt, returning the seconds to wait."""
+        delay = 0.0
+        if self._request_bucket is not None:
+            delay = self._request_bucket.reserve(1)
+        if self._token_bucket is not None:
+            delay = max(delay, self._token_bucket.reserve(tokens))
+        with self._lock:
+            delay = max(delay, self._paused_until - time.monotonic())
+            self.requests += 1
+            self.wait_time += delay
+        return delay
+
+    def _refund_tokens(self, tokens: int) -> None:
+        """Return the reservation of a failed attempt."""
+        if self._token_bucket is not None and tokens:
+            self._token_bucket.refund(tokens)
+
+    def _try_acquire_slot(self) -> bool:
+        with self._lock:
+            if self.config.max_concurrency is not None and self._in_flight >= self.config.max_concurrency:
+                return False
+            self._in_flight += 1
+            return True
+
+    def _release_slot(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._slot_released.notify()
+
+    def _acquire_slot(self) -> None:
+        with self._lock:
+            while self.config.max_concurrency is not None and self._in_flight >= self.config.max_concurrency:
+                self._slot_released.wait()
+            self._in_flight += 1
+
+    def _retry_delay(self, error: Exception, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, or None if the error is not retryable."""
+        if attempt >= self.config.max_retries:
+            return None
+
+        status = getattr(error, "status_code", None)
+        if status is None:
+            if not isinstance(error, openai.APIConnectionError):
+                return None
+        elif status not in self.config.retry_statuses:
+            return None
+
+        backoff = min(self.config.max_backoff, self.config.initial_backoff * (2 ** attempt))
+        delay = random.uniform(backoff / 2, backoff)
+        retry_after = _retry_after_seconds(error)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        with self._lock:
+            self.retries += 1
+            if status == 429:
+                self.rate_limited += 1
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+        self.logger.warning(
+            f"LLM request failed ({status or type(error).__name__}), "
+            f"retry {attempt + 1}/{self.config.max_retries} in {delay:.1f}s"
+        )
+        return delay
+
+    def _record_usage(self, usage: Any, reserved_tokens: int) -> None:
+        """Correct the token bucket with the usage reported by a response."""
+        total = getattr(usage, "total_tokens", None)
+        if self._token_bucket is not None and isinstance(total, int):
+            self._token_bucket.refund(reserved_tokens - total)
+
+    def _give_up(self) -> None:
+        with self._lock:
+            self.failures += 1
+
+    def call(self, create: Callable[..., Any], api_params: Dict[str, Any]) -> Any:
+        """
+        Run a request through the scheduler.
+
+        Args:
+            create: Function performing the request (e.g. ``client.chat.completions.create``)
+            api_params: Keyword arguments for ``create``
+
+        Returns:
+            Whatever ``create`` returns; for ``stream=True`` requests, an
+            iterator over its chunks that holds the concurrency slot until it
+            is exhausted or closed
+        """
+        streaming = bool(api_params.get("stream"))
+        tokens = self._request_tokens(api_params)
+        attempt = 0
+        while True:
+            delay = self._admission_delay(tokens)
+            if delay > 0:
+                time.sleep(delay)
+
+            self._acquire_slot()
+            holds_slot = True
+            response = None
+            try:
+                response = create(**api_params)
+                if not streaming:
+                    self._record_usage(getattr(response, "usage", None), tokens)
+                    return response
+                # Receive the first chunk here so failures before it are retried
+                iterator = iter(response)
+                first_chunk = next(iterator, _NO_CHUNK)
+                holds_slot = False
+                return _ScheduledStream(self, response, iterator, first_chunk, tokens)
+            except Exception as e:
+                self._refund_tokens(tokens)
+                if streaming and response is not None:
+                    close = getattr(response, "close", None)
+                    if close is not None:
+                        close()
+                retry_delay = self._retry_delay(e, attempt)
+                if retry_delay is None:
+                    self._give_up()
+                    raise
+            finally:
+                if holds_slot:
+                    self._release_slot()
+
+            time.sleep(retry_delay)
+            attempt += 1
+
+    async def acall(self, create: Callable[..., Awaitable[Any]], api_params: Dict[str, Any]) -> Any:
+        """
+        Run a request through the scheduler from a coroutine.
+
+        Waiting for a concurrency slot polls instead of blocking, so the
+        same scheduler can be shared by threads and event loops.
+
+        Args:
+            create: Coroutine function performing the request
+            api_params: Keyword arguments for ``create``
+
+        Returns:
+            Whatever ``create`` returns; for ``stream=True`` requests, an
+            async iterator over its chunks that holds the concurrency slot
+            until it is exhausted or closed
+        """
+        streaming = bool(api_params.get("stream"))
+        tokens = self._request_tokens(api_params)
+        attempt = 0
+        while True:
+            delay = self._admission_delay(tokens)
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            poll = 0.005
+            while not self._try_acquire_slot():
+                await asyncio.sleep(poll)
+                poll = min(poll * 2, 0.1)
+            holds_slot = True
+            response = None
+            try:
+                response = await create(**api_params)
+                if not streaming:
+                    self._record_usage(getattr(response, "usage", None), tokens)
+                    return response
+                # Receive the first chunk here so failures before it are retried
+                iterator = response.__aiter__()
+                try:
+                    first_chunk = await iterator.__anext__()
+                except StopAsyncIteration:
+                    first_chunk = _NO_CHUNK
+                holds_slot = False
+                return _AsyncScheduledStream(self, response, iterator, first_chunk, tokens)
+            except Exception as e:
+                self._refund_tokens(tokens)
+                if streaming and response is not None:
+                    close = getattr(response, "aclose", None) or getattr(response, "close", None)
+                    if close is not None:
+                        result = close()
+                        if inspect.isawaitable(result):
+                            await result
+                retry_delay = self._retry_delay(e, attempt)
+                if retry_delay is None:
+                    self._give_up()
+                    raise
+            finally:
+                if holds_slot:
+                    self._release_slot()
+
+            await asyncio.sleep(retry_delay)
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Get request, retry and throttling statistics"""
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "failures": self.failures,
+            "in_flight": self._in_flight,
+            "wait_time": self.wait_time
+        }
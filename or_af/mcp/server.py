@@ -5,14 +5,17 @@ This module provides a simplified interface to the official Model Context Protoc
 from https://modelcontextprotocol.io/
 """
 
-from typing import Callable, Dict, List, Any, Optional, TypeVar
+from typing import Callable, Dict, List, Any, Optional, TypeVar, Union
 from datetime import datetime
 from enum import Enum
 import uuid
+import weakref
 
 # Import from official MCP SDK
 from mcp.server import FastMCP
 
+from ..cache.tool_cache import ToolCachePolicy
+from ..core.tool import Tool
 from ..models.tool_models import ToolResult
 from ..exceptions import MCPServerError, ToolNotFoundError
 from ..utils.logger import default_logger
@@ -100,6 +103,12 @@ class MCPServer:
         self._registered_resources: Dict[str, Dict[str, Any]] = {}
         self._registered_prompts: Dict[str, Dict[str, Any]] = {}
         
+        # Local tool objects used when agents call tools in-process
+        self.tools: Dict[str, Tool] = {}
+        self._tools_schema: List[Dict[str, Any]] = []
+        # Tool indexes of connected agents, invalidated when a tool is registered
+        self._tool_indexes: "weakref.WeakSet[Any]" = weakref.WeakSet()
+        
         self.logger.info(f"MCP Server '{name}' initialized (using official MCP SDK)")
     
     @property
@@ -111,6 +120,7 @@ class MCPServer:
         self,
         name: Optional[str] = None,
         description: Optional[str] = None,
+        cache: Union[bool, ToolCachePolicy, None] = None,
         **kwargs
     ) -> Callable:
         """
@@ -121,6 +131,8 @@ class MCPServer:
         Args:
             name: Optional tool name (defaults to function name)
             description: Optional tool description (defaults to docstring)
+            cache: Memoize successful results of this (deterministic) tool when
+                called in-process; True uses the default ToolCachePolicy
             **kwargs: Additional arguments for the official tool decorator
         
         Example:
@@ -133,6 +145,10 @@ class MCPServer:
             @server.tool(name="weather", description="Get weather data")
             async def get_weather(city: str) -> dict:
                 return {"city": city, "temp": 22.5}
+            
+            @server.tool(cache=ToolCachePolicy(max_size=256, ttl=600))
+            def shortest_path(source: str, target: str) -> list:
+                return solve(source, target)
             ```
         """
         def decorator(func: Callable) -> Callable:
@@ -149,6 +165,11 @@ class MCPServer:
                 "function": func,
                 "registered_at": datetime.now()
             }
+            policy = ToolCachePolicy() if cache is True else (cache or None)
+            self.tools[tool_name] = Tool(name=tool_name, func=func, description=tool_desc, cache=policy)
+            self._tools_schema = [tool.to_openai_format() for tool in self.tools.values()]
+            for index in list(self._tool_indexes):
+                index.invalidate()
             
             self.logger.info(f"Tool '{tool_name}' registered with MCP server '{self.name}'")
             return decorated
@@ -268,6 +289,40 @@ class MCPServer:
         """Get information about a registered tool."""
         return self._registered_tools.get(name)
     
+    def get_tools(self) -> List[Dict[str, Any]]:
+        """
+        Get all registered tools in OpenAI function calling format.
+        
+        The list is rebuilt only when a tool is registered; treat it as read-only.
+        """
+        return self._tools_schema
+    
+    def execute_tool(self, name: str, tool_call_id: str, **kwargs) -> ToolResult:
+        """
+        Execute a registered tool in-process.
+        
+        Args:
+            name: The tool name
+            tool_call_id: ID of the tool call being answered
+            **kwargs: Tool arguments
+        
+        Returns:
+            ToolResult with the tool's output or error
+        """
+        if name not in self.tools:
+            raise ToolNotFoundError(f"Tool '{name}' not found in MCP server '{self.name}'")
+        return self.tools[name].execute(tool_call_id, **kwargs)
+    
+    async def aexecute_tool(self, name: str, tool_call_id: str, **kwargs) -> ToolResult:
+        """
+        Execute a registered tool in-process from a coroutine.
+        
+        Async tools are awaited; sync tools run in a worker thread.
+        """
+        if name not in self.tools:
+            raise ToolNotFoundError(f"Tool '{name}' not found in MCP server '{self.name}'")
+        return await self.tools[name].aexecute(tool_call_id, **kwargs)
+    
     def run(
         self,
         transport: str = "stdio",
@@ -4,14 +4,16 @@ OR-AF Models Module
 Contains all Pydantic models for the framework.
 """
 
-from .agent_models import AgentConfig, AgentResponse, IterationState
+from .agent_models import AgentConfig, AgentResponse, BatchStats, IterationState
 from .tool_models import ToolParameter, ToolSchema, ToolCall, ToolResult
 from .message_models import Message, MessageRole
-from .event_models import EventType, AgentEvent
+from .event_models import EventType, AgentEvent, StreamChunkEvent
+from .stream_models import StreamChunk, StreamChunkType
 
 __all__ = [
     "AgentConfig",
     "AgentResponse",
+    "BatchStats",
     "IterationState",
     "ToolParameter",
     "ToolSchema",
@@ -21,4 +23,7 @@ __all__ = [
     "MessageRole",
     "EventType",
     "AgentEvent",
+    "StreamChunkEvent",
+    "StreamChunk",
+    "StreamChunkType",
 ]
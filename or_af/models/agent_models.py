@@ -17,6 +17,10 @@ class AgentConfig(BaseModel):
     max_iterations: int = Field(10, ge=1, le=100, description="Maximum iterations")
     stream: bool = Field(True, description="Enable streaming responses")
     verbose: bool = Field(True, description="Enable verbose logging")
+    parallel_tool_calls: bool = Field(False, description="Execute tool calls from one reply concurrently")
+    max_tool_concurrency: int = Field(8, ge=1, description="Maximum tool calls executing at once")
+    max_context_tokens: Optional[int] = Field(None, ge=1, description="Token budget for messages sent to the model")
+    early_tool_dispatch: bool = Field(False, description="Start tool calls while the reply is still streaming")
     
     @field_validator('temperature')
     @classmethod
@@ -35,6 +39,10 @@ class IterationState(BaseModel):
     response: Optional[str] = None
     start_time: datetime = Field(default_factory=datetime.now)
     end_time: Optional[datetime] = None
+    llm_time: Optional[float] = None
+    time_to_first_token: Optional[float] = None
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
     
     @property
     def duration(self) -> Optional[float]:
@@ -42,6 +50,14 @@ class IterationState(BaseModel):
         if self.end_time:
             return (self.end_time - self.start_time).total_seconds()
         return None
+    
+    @property
+    def tokens_per_second(self) -> Optional[float]:
+        """Completion tokens per second of generation (after the first token when streamed)"""
+        if not self.completion_tokens or self.llm_time is None:
+            return None
+        generation_time = self.llm_time - (self.time_to_first_token or 0.0)
+        return self.completion_tokens / generation_time if generation_time > 0 else None
 
 
 class AgentResponse(BaseModel):
@@ -54,6 +70,7 @@ class AgentResponse(BaseModel):
     error_message: Optional[str] = None
     start_time: datetime
     end_time: datetime
+    tokens_saved: int = 0
     
     @property
     def total_duration(self) -> float:
@@ -64,3 +81,23 @@ class AgentResponse(BaseModel):
     def iteration_count(self) -> int:
         """Get total number of iterations"""
         return len(self.iterations)
+
+
+class BatchStats(BaseModel):
+    """Aggregate statistics of a run_many()/arun_many() batch"""
+    total: int
+    succeeded: int
+    failed: int
+    wall_time: float = Field(..., description="Seconds from the first task start to the last completion")
+    throughput: float = Field(..., description="Completed tasks per second")
+    latency_mean: Optional[float] = None
+    latency_p50: Optional[float] = None
+    latency_p95: Optional[float] = None
+    latency_p99: Optional[float] = None
+    latency_max: Optional[float] = None
+    total_tool_calls: int = 0
+    
+    @property
+    def success_rate(self) -> Optional[float]:
+        """Fraction of tasks that succeeded"""
+        return self.succeeded / self.total if self.total else None
@@ -2,6 +2,7 @@
 OR-AF Models - Event related models
 """
 
+import time
 from typing import Any, Dict, Optional
 from pydantic import BaseModel, Field
 from datetime import datetime
@@ -21,6 +22,7 @@ class EventType(str, Enum):
     STREAM_CHUNK = "stream_chunk"
     ERROR = "error"
     WARNING = "warning"
+    NODE_END = "node_end"
 
 
 class AgentEvent(BaseModel):
@@ -32,3 +34,54 @@ class AgentEvent(BaseModel):
     
     class Config:
         use_enum_values = True
+
+
+# Event types by value, for resolving AgentEvent.event_type (stored as its value)
+EVENT_TYPES: Dict[str, EventType] = {event_type.value: event_type for event_type in EventType}
+
+
+class StreamChunkEvent:
+    """
+    Lightweight STREAM_CHUNK event.
+    
+    Emitted once per streamed text fragment, so it is a slotted class
+    instead of an AgentEvent: no validation, and ``timestamp`` / ``data``
+    are only built when a callback reads them. Exposes the same attributes
+    as AgentEvent, and ``model_dump()`` / ``dict()`` return the same fields,
+    but it is not an AgentEvent instance: callbacks should dispatch on
+    ``event_type`` rather than ``isinstance``.
+    """
+    
+    __slots__ = ("chunk", "iteration", "created")
+    
+    event_type = EventType.STREAM_CHUNK.value
+    
+    def __init__(self, chunk: str, iteration: Optional[int] = None):
+        self.chunk = chunk
+        self.iteration = iteration
+        self.created = time.time()
+    
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.created)
+    
+    @property
+    def data(self) -> Dict[str, Any]:
+        return {"chunk": self.chunk}
+    
+    def model_dump(self, mode: str = "python", **kwargs: Any) -> Dict[str, Any]:
+        """Fields as AgentEvent.model_dump() returns them (``mode="json"`` gives an ISO timestamp)"""
+        timestamp = self.timestamp
+        return {
+            "event_type": self.event_type,
+            "timestamp": timestamp.isoformat() if mode == "json" else timestamp,
+            "iteration": self.iteration,
+            "data": self.data
+        }
+    
+    def dict(self, **kwargs: Any) -> Dict[str, Any]:
+        """Pydantic v1 style alias of model_dump()"""
+        return self.model_dump(**kwargs)
+    
+    def __repr__(self) -> str:
+        return f"StreamChunkEvent(chunk={self.chunk!r}, iteration={self.iteration!r})"
@@ -0,0 +1,38 @@
+"""
+OR-AF Models - Streaming related models
+"""
+
+from typing import Any, Dict, Optional
+from dataclasses import dataclass
+from enum import Enum
+
+
+class StreamChunkType(str, Enum):
+    """Types of chunks yielded by Agent.stream() / Agent.astream()"""
+    TEXT_DELTA = "text_delta"
+    TOOL_CALL_START = "tool_call_start"
+    TOOL_RESULT = "tool_result"
+    FINAL_RESPONSE = "final_response"
+
+
+@dataclass(slots=True)
+class StreamChunk:
+    """
+    A single item streamed from an agent run.
+
+    This is a slotted dataclass rather than a Pydantic model because one is
+    created per streamed token.
+
+    Fields by type:
+    - TEXT_DELTA: content
+    - TOOL_CALL_START: tool_call_id, tool_name, arguments
+    - TOOL_RESULT: tool_call_id, tool_name, content (the result sent to the model)
+    - FINAL_RESPONSE: response (AgentResponse), content (final text)
+    """
+    type: StreamChunkType
+    iteration: Optional[int] = None
+    content: Optional[str] = None
+    tool_call_id: Optional[str] = None
+    tool_name: Optional[str] = None
+    arguments: Optional[Dict[str, Any]] = None
+    response: Optional[Any] = None
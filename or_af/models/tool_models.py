@@ -48,7 +48,10 @@ class ToolResult(BaseModel):
     tool_name: str
     result: Any
     error: Optional[str] = None
+    error_type: Optional[str] = None
     execution_time: float
+    cached: bool = False
+    saved_time: float = 0.0
     timestamp: datetime = Field(default_factory=datetime.now)
     
     @property
@@ -10,9 +10,16 @@ from .nodes import (
     NodeResult,
     EdgeCondition,
     EdgeConfig,
-    ConditionalEdge
+    ConditionalEdge,
+    MergedInputs
 )
 from .graph import WorkflowGraph
+from .validation import (
+    topological_sort,
+    strongly_connected_components,
+    cyclic_components,
+    find_cycle
+)
 from .builders import Sequential, Parallel, workflow
 from .visualization import WorkflowVisualizer, visualize_workflow
 
@@ -24,8 +31,14 @@ __all__ = [
     "EdgeCondition",
     "EdgeConfig",
     "ConditionalEdge",
+    "MergedInputs",
     # Graph
     "WorkflowGraph",
+    # Validation
+    "topological_sort",
+    "strongly_connected_components",
+    "cyclic_components",
+    "find_cycle",
     # Builders (TensorFlow-like API)
     "Sequential",
     "Parallel",
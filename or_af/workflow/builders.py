@@ -101,17 +101,20 @@ class Parallel(WorkflowGraph):
         self,
         agents: List[Any] = None,
         merge_agent: Any = None,
-        name: str = "parallel_workflow"
+        name: str = "parallel_workflow",
+        max_concurrency: Optional[int] = None
     ):
         """
         Initialize a parallel workflow.
         
         Args:
             agents: List of agents to run in parallel
-            merge_agent: Optional agent to merge parallel results
+            merge_agent: Optional agent to merge parallel results; it receives
+                the list of branch outputs once every branch has finished
             name: Workflow name
+            max_concurrency: Maximum branches executing at once
         """
-        super().__init__(name=name)
+        super().__init__(name=name, max_concurrency=max_concurrency)
         
         if agents:
             router = self.add_node(
@@ -3,11 +3,18 @@ OR-AF Workflow - Graph implementation
 """
 
 import uuid
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple, Union
 from datetime import datetime
 
-from .nodes import Node, NodeStatus, NodeResult, EdgeCondition, ConditionalEdge
+from .nodes import Node, NodeStatus, NodeResult, EdgeCondition, ConditionalEdge, MergedInputs
+from .validation import (
+    topological_sort, strongly_connected_components, cyclic_components, find_cycle
+)
 from ..a2a import A2AProtocol, A2AMessage, MessageType
+from ..callbacks import BaseCallback, CallbackHandler
+from ..models import EventType
 from ..exceptions import (
     WorkflowError, InvalidNodeError, InvalidEdgeError, CycleDetectedError
 )
@@ -34,27 +41,53 @@ class WorkflowGraph:
         ```
     """
     
-    def __init__(self, name: str = "workflow", description: str = ""):
+    def __init__(
+        self,
+        name: str = "workflow",
+        description: str = "",
+        max_concurrency: Optional[int] = None,
+        callbacks: Optional[List] = None
+    ):
         """
         Initialize the workflow graph.
         
         Args:
             name: Workflow name
             description: Workflow description
+            max_concurrency: Maximum nodes executing at once (None uses the
+                thread pool default, 1 runs nodes one at a time)
+            callbacks: Callback objects or functions receiving a NODE_END event
+                for every executed node
         """
         self.workflow_id = str(uuid.uuid4())
         self.name = name
         self.description = description
+        self.max_concurrency = max_concurrency
         
         # Graph structure
         self.nodes: Dict[str, Node] = {}
         self.edges: List[ConditionalEdge] = []
         self.entry_node: Optional[Node] = None
         self.exit_nodes: Set[str] = set()
+        self._nodes_by_name: Dict[str, Node] = {}
+        
+        # Compiled structure (rebuilt by compile())
+        self._adjacency: Dict[str, List[ConditionalEdge]] = {}
+        self._successors: Dict[str, List[str]] = {}
+        self._reverse_adjacency: Dict[str, List[ConditionalEdge]] = {}
+        self._in_degree: Dict[str, int] = {}
+        self._topological_order: List[str] = []
+        self._reachable: Set[str] = set()
         
         # A2A Protocol
         self.a2a_protocol = A2AProtocol()
         
+        self.callback_handler = CallbackHandler()
+        for callback in callbacks or []:
+            self.callback_handler.register_global(
+                callback.on_event if isinstance(callback, BaseCallback) else callback
+            )
+        
         # State
         self.compiled = False
         self.logger = default_logger
@@ -85,6 +118,7 @@ class WorkflowGraph:
         """
         node = Node(agent=agent, name=name, description=description)
         self.nodes[node.node_id] = node
+        self._nodes_by_name.setdefault(node.name, node)
         
         # Register with A2A protocol
         self.a2a_protocol.register_handler(
@@ -185,11 +219,7 @@ class WorkflowGraph:
         if node_ref in self.nodes:
             return self.nodes[node_ref]
         
-        for node in self.nodes.values():
-            if node.name == node_ref:
-                return node
-        
-        return None
+        return self._nodes_by_name.get(node_ref)
     
     def _handle_node_message(self, node: Node, message: A2AMessage) -> Optional[A2AMessage]:
         """Handle A2A message for a node"""
@@ -205,35 +235,85 @@ class WorkflowGraph:
     
     def _get_outgoing_edges(self, node: Node) -> List[ConditionalEdge]:
         """Get all outgoing edges from a node"""
+        if self.compiled:
+            return self._adjacency.get(node.node_id, [])
         return [edge for edge in self.edges if edge.source.node_id == node.node_id]
     
-    def _detect_cycles(self) -> bool:
-        """Detect cycles in the graph using DFS"""
-        visited = set()
-        rec_stack = set()
+    def _get_incoming_edges(self, node: Node) -> List[ConditionalEdge]:
+        """Get all incoming edges to a node"""
+        if self.compiled:
+            return self._reverse_adjacency.get(node.node_id, [])
+        return [edge for edge in self.edges if edge.target.node_id == node.node_id]
+    
+    def _build_adjacency(self) -> None:
+        """
+        Build adjacency and reverse-adjacency maps, in-degrees, a topological
+        order and the set of nodes reachable from the entry.
         
-        def dfs(node_id: str) -> bool:
-            visited.add(node_id)
-            rec_stack.add(node_id)
-            
-            for edge in self.edges:
-                if edge.source.node_id == node_id:
-                    target_id = edge.target.node_id
-                    if target_id not in visited:
-                        if dfs(target_id):
-                            return True
-                    elif target_id in rec_stack:
-                        return True
-            
-            rec_stack.remove(node_id)
-            return False
+        Runs in O(V + E). If the graph has cycles the topological order only
+        covers the acyclic part.
+        """
+        adjacency: Dict[str, List[ConditionalEdge]] = {node_id: [] for node_id in self.nodes}
+        successors: Dict[str, List[str]] = {node_id: [] for node_id in self.nodes}
+        reverse_adjacency: Dict[str, List[ConditionalEdge]] = {node_id: [] for node_id in self.nodes}
+        
+        for edge in self.edges:
+            if edge.source.node_id not in self.nodes or edge.target.node_id not in self.nodes:
+                raise InvalidEdgeError(f"Edge '{edge.name}' references a node outside workflow '{self.name}'")
+            adjacency[edge.source.node_id].append(edge)
+            successors[edge.source.node_id].append(edge.target.node_id)
+            reverse_adjacency[edge.target.node_id].append(edge)
+        
+        in_degree = {node_id: len(edges) for node_id, edges in reverse_adjacency.items()}
+        order = topological_sort(successors)
+        
+        reachable: Set[str] = set()
+        if self.entry_node is not None:
+            reachable.add(self.entry_node.node_id)
+            stack = [self.entry_node.node_id]
+            while stack:
+                for edge in adjacency[stack.pop()]:
+                    if edge.target.node_id not in reachable:
+                        reachable.add(edge.target.node_id)
+                        stack.append(edge.target.node_id)
+        
+        self._adjacency = adjacency
+        self._successors = successors
+        self._reverse_adjacency = reverse_adjacency
+        self._in_degree = in_degree
+        self._topological_order = order
+        self._reachable = reachable
+    
+    def _detect_cycles(self) -> bool:
+        """Detect cycles in the graph (any node left out of the topological order)"""
+        self._build_adjacency()
+        return len(self._topological_order) < len(self.nodes)
+    
+    def find_cycle(self) -> Optional[List[Node]]:
+        """
+        Find one cycle in the graph.
         
-        for node_id in self.nodes:
-            if node_id not in visited:
-                if dfs(node_id):
-                    return True
+        Returns:
+            The cycle as a closed path of nodes ``[a, b, ..., a]``, or None
+        """
+        self._build_adjacency()
+        if len(self._topological_order) == len(self.nodes):
+            return None
+        return [self.nodes[node_id] for node_id in find_cycle(self._successors)]
+    
+    def strongly_connected_components(self, cyclic_only: bool = True) -> List[List[Node]]:
+        """
+        Group nodes into strongly connected components.
         
-        return False
+        Args:
+            cyclic_only: Only return components that contain a cycle
+        """
+        self._build_adjacency()
+        if cyclic_only:
+            components = cyclic_components(self._successors)
+        else:
+            components = strongly_connected_components(self._successors)
+        return [[self.nodes[node_id] for node_id in component] for component in components]
     
     def compile(self, check_cycles: bool = True) -> "WorkflowGraph":
         """
@@ -247,12 +327,22 @@ class WorkflowGraph:
         if self.entry_node is None:
             raise WorkflowError("No entry node defined")
         
-        if check_cycles and self._detect_cycles():
-            raise CycleDetectedError("Workflow contains cycles")
+        self._build_adjacency()
+        
+        if check_cycles and len(self._topological_order) < len(self.nodes):
+            cycle = [self.nodes[node_id].name for node_id in find_cycle(self._successors)]
+            components = [
+                [self.nodes[node_id].name for node_id in component]
+                for component in cyclic_components(self._successors)
+            ]
+            raise CycleDetectedError(
+                f"Workflow contains cycles: {' -> '.join(cycle)}",
+                cycle=cycle,
+                components=components
+            )
         
         if not self.exit_nodes:
-            nodes_with_outgoing = {e.source.node_id for e in self.edges}
-            self.exit_nodes = set(self.nodes.keys()) - nodes_with_outgoing
+            self.exit_nodes = {node_id for node_id, edges in self._adjacency.items() if not edges}
         
         self.compiled = True
         self.logger.info(f"Workflow '{self.name}' compiled successfully")
@@ -262,9 +352,23 @@ class WorkflowGraph:
     def run(
         self,
         input_data: Any,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        max_concurrency: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Execute the workflow."""
+        """
+        Execute the workflow.
+        
+        All nodes whose inputs are ready run concurrently on a thread pool, so
+        fan-out branches take as long as the slowest branch. A node with several
+        incoming edges is released only once every predecessor has finished or
+        been skipped; it then receives a single input if one edge was traversed,
+        or a MergedInputs list of inputs in edge order if several were.
+        
+        Args:
+            input_data: Input passed to the entry node
+            context: Optional shared context passed to every node
+            max_concurrency: Override the graph's max_concurrency for this run
+        """
         if not self.compiled:
             self.compile()
         
@@ -275,32 +379,87 @@ class WorkflowGraph:
         for node in self.nodes.values():
             node.reset()
         
-        current_data = input_data
-        nodes_to_execute = [self.entry_node]
+        # Only edges from nodes reachable from the entry can ever resolve
+        reachable = self._reachable
+        unresolved: Dict[str, int] = {
+            node_id: sum(1 for edge in edges if edge.source.node_id in reachable)
+            for node_id, edges in self._reverse_adjacency.items()
+        }
         
-        while nodes_to_execute:
-            node = nodes_to_execute.pop(0)
-            
-            if node.node_id in results:
-                continue
-            
-            self.logger.info(f"Executing node: {node.name}")
-            
-            result = node.execute(current_data, context)
-            results[node.node_id] = result
-            execution_order.append(node.node_id)
-            
-            if result.status == NodeStatus.COMPLETED:
-                current_data = result.output
-            
-            outgoing_edges = self._get_outgoing_edges(node)
-            for edge in outgoing_edges:
-                if edge.should_traverse(result):
-                    if edge.transform:
-                        current_data = edge.transform_data(result.output)
-                    else:
-                        current_data = result.output
-                    nodes_to_execute.append(edge.target)
+        inputs: Dict[str, Dict[str, Any]] = {}
+        ready: List[Tuple[Node, Any]] = [(self.entry_node, input_data)]
+        started: Set[str] = {self.entry_node.node_id}
+        
+        def node_input(node_id: str) -> Any:
+            received = inputs.pop(node_id)
+            values = [
+                received[edge.edge_id] for edge in self._reverse_adjacency[node_id]
+                if edge.edge_id in received
+            ]
+            return values[0] if len(values) == 1 else MergedInputs(values)
+        
+        def resolve(edges: Deque[Tuple[ConditionalEdge, Any, bool]]) -> None:
+            # A worklist rather than recursion: dead paths can be thousands of nodes long
+            while edges:
+                edge, data, traversed = edges.popleft()
+                target_id = edge.target.node_id
+                if traversed:
+                    inputs.setdefault(target_id, {})[edge.edge_id] = data
+                unresolved[target_id] -= 1
+                if unresolved[target_id] > 0 or target_id in started:
+                    continue
+                started.add(target_id)
+                if target_id in inputs:
+                    ready.append((edge.target, node_input(target_id)))
+                else:
+                    # Dead path: nothing reached this node, so skip it and its successors
+                    edge.target.status = NodeStatus.SKIPPED
+                    edges.extend((next_edge, None, False) for next_edge in self._adjacency[target_id])
+        
+        workers = max_concurrency or self.max_concurrency
+        running: Dict[Future, Node] = {}
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{self.name}-nodes") as pool:
+            while ready or running:
+                for node, data in ready:
+                    self.logger.info(f"Executing node: {node.name}")
+                    running[pool.submit(node.execute, data, context)] = node
+                ready = []
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    result = future.result()
+                    results[node.node_id] = result
+                    execution_order.append(node.node_id)
+                    self.callback_handler.emit(
+                        EventType.NODE_END,
+                        workflow=self.name,
+                        node=node.name,
+                        status=result.status.value,
+                        execution_time=result.execution_time,
+                        error=result.error,
+                        error_type=result.error_type
+                    )
+                    
+                    edges: Deque[Tuple[ConditionalEdge, Any, bool]] = deque()
+                    for edge in self._adjacency[node.node_id]:
+                        traversed = edge.should_traverse(result)
+                        data = None
+                        if traversed:
+                            data = edge.transform_data(result.output) if edge.transform else result.output
+                        edges.append((edge, data, traversed))
+                    resolve(edges)
+                
+                if not ready and not running and inputs:
+                    # Only cycles (compiled with check_cycles=False) can stall the
+                    # frontier; release nodes that already received input.
+                    for node_id in list(inputs):
+                        if node_id in started:
+                            inputs.pop(node_id)
+                            continue
+                        started.add(node_id)
+                        ready.append((self.nodes[node_id], node_input(node_id)))
         
         final_outputs = []
         for exit_id in self.exit_nodes:
@@ -48,6 +48,7 @@ class NodeResult:
     status: NodeStatus
     output: Any = None
     error: Optional[str] = None
+    error_type: Optional[str] = None
     execution_time: float = 0.0
     timestamp: datetime = field(default_factory=datetime.now)
 
@@ -63,6 +64,16 @@ class EdgeConfig:
     priority: int = 0
 
 
+class MergedInputs(list):
+    """
+    Inputs of a merge node, one per traversed incoming edge in edge order.
+    
+    Agent nodes receive them joined into a single prompt; callable nodes
+    receive the list itself. A plain list output of a single predecessor is
+    passed through unchanged.
+    """
+
+
 class Node:
     """
     Base class for workflow nodes.
@@ -106,6 +117,8 @@ class Node:
         
         try:
             if hasattr(self.agent, 'run'):
+                if isinstance(input_data, MergedInputs):
+                    input_data = "\n\n".join(str(item) for item in input_data)
                 result = self.agent.run(input_data)
                 output = result.response if hasattr(result, 'response') else result
                 success = result.success if hasattr(result, 'success') else True
@@ -141,6 +154,7 @@ class Node:
                 node_id=self.node_id,
                 status=NodeStatus.FAILED,
                 error=str(e),
+                error_type=type(e).__name__,
                 execution_time=execution_time
             )
         
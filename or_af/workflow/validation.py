@@ -0,0 +1,128 @@
+"""
+OR-AF Workflow - Graph validation
+
+Iterative, linear-time graph algorithms used to validate workflow graphs.
+None of them recurse, so long Sequential chains never hit Python's
+recursion limit.
+
+All functions take a successor map: node id -> list of successor node ids.
+"""
+
+from collections import deque
+from typing import Dict, List, Optional
+
+
+def topological_sort(successors: Dict[str, List[str]]) -> List[str]:
+    """
+    Order nodes so every edge points forward (Kahn's algorithm, O(V + E)).
+
+    Nodes that sit on or behind a cycle are left out, so the result is
+    shorter than the number of nodes exactly when the graph has a cycle.
+    """
+    in_degree = {node_id: 0 for node_id in successors}
+    for targets in successors.values():
+        for target in targets:
+            in_degree[target] += 1
+
+    queue = deque(node_id for node_id, degree in in_degree.items() if degree == 0)
+    order: List[str] = []
+    while queue:
+        node_id = queue.popleft()
+        order.append(node_id)
+        for target in successors[node_id]:
+            in_degree[target] -= 1
+            if in_degree[target] == 0:
+                queue.append(target)
+
+    return order
+
+
+def strongly_connected_components(successors: Dict[str, List[str]]) -> List[List[str]]:
+    """
+    Find strongly connected components (iterative Tarjan, O(V + E)).
+
+    Components are returned in reverse topological order of the condensed
+    graph; every node appears in exactly one component.
+    """
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack: Dict[str, bool] = {}
+    stack: List[str] = []
+    components: List[List[str]] = []
+    counter = 0
+
+    for root in successors:
+        if root in index:
+            continue
+
+        # Each work item is (node, position of the next successor to visit)
+        work = [(root, 0)]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+
+        while work:
+            node_id, position = work[-1]
+            targets = successors[node_id]
+
+            if position < len(targets):
+                work[-1] = (node_id, position + 1)
+                target = targets[position]
+                if target not in index:
+                    index[target] = lowlink[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    on_stack[target] = True
+                    work.append((target, 0))
+                elif on_stack.get(target):
+                    lowlink[node_id] = min(lowlink[node_id], index[target])
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node_id])
+
+            if lowlink[node_id] == index[node_id]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == node_id:
+                        break
+                components.append(component)
+
+    return components
+
+
+def cyclic_components(successors: Dict[str, List[str]]) -> List[List[str]]:
+    """Return only the components that contain a cycle (size > 1 or a self-loop)."""
+    return [
+        component for component in strongly_connected_components(successors)
+        if len(component) > 1 or component[0] in successors[component[0]]
+    ]
+
+
+def find_cycle(successors: Dict[str, List[str]]) -> Optional[List[str]]:
+    """
+    Return one cycle as a closed path ``[a, b, ..., a]``, or None if acyclic.
+
+    The cycle is found inside the first cyclic strongly connected component
+    by walking successors that stay in that component.
+    """
+    components = cyclic_components(successors)
+    if not components:
+        return None
+
+    members = set(components[0])
+    position: Dict[str, int] = {}
+    path: List[str] = []
+    node_id = components[0][0]
+    while node_id not in position:
+        position[node_id] = len(path)
+        path.append(node_id)
+        node_id = next(target for target in successors[node_id] if target in members)
+
+    return path[position[node_id]:] + [node_id]
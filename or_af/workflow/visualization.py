@@ -153,7 +153,7 @@ class WorkflowVisualizer:
             lines.append("+" + "-" * (box_width - 2) + "+")
             
             # Draw edges from this node
-            outgoing = [e for e in wf.edges if e.source.node_id == node.node_id]
+            outgoing = wf._get_outgoing_edges(node)
             for edge in outgoing:
                 condition = edge.condition_type.value
                 lines.append(f"     |")
@@ -0,0 +1,54 @@
+"""
+Shared fixtures for the OR-AF test suite.
+
+Agents run against a ReplayBackend, so no credentials or network access
+are needed.
+"""
+
+import time
+
+import pytest
+
+from or_af import Agent, MCPServer, ReplayBackend
+from or_af.utils import LogLevel, set_log_level
+
+
+set_log_level(LogLevel.CRITICAL)
+
+
+@pytest.fixture
+def calculator() -> MCPServer:
+    """MCP server with an ``add`` tool, a ``fail`` tool that raises and a ``wait`` tool that sleeps"""
+    server = MCPServer(name="calculator")
+
+    @server.tool()
+    def add(a: int, b: int) -> int:
+        """Add two numbers"""
+        return a + b
+
+    @server.tool()
+    def fail(reason: str) -> str:
+        """Always raise"""
+        raise ValueError(reason)
+
+    @server.tool()
+    def wait(seconds: float) -> float:
+        """Sleep, then return the seconds slept"""
+        time.sleep(seconds)
+        return seconds
+
+    return server
+
+
+@pytest.fixture
+def make_agent(calculator):
+    """Factory for quiet agents replaying ``trace`` with the calculator tools"""
+    def factory(trace, backend=None, **kwargs) -> Agent:
+        kwargs.setdefault("mcp_servers", [calculator])
+        kwargs.setdefault("verbose", False)
+        return Agent(
+            system_prompt="You are a calculator.",
+            backend=backend or ReplayBackend(trace),
+            **kwargs
+        )
+    return factory
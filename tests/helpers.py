@@ -0,0 +1,47 @@
+"""
+Trace builders for ReplayBackend-driven tests.
+"""
+
+import copy
+import json
+from typing import Any, Dict, List, Optional
+
+from or_af import ReplayBackend
+
+
+def call(name: str, call_id: Optional[str] = None, **arguments: Any) -> Dict[str, Any]:
+    """A tool call as recorded in a trace entry"""
+    return {
+        "id": call_id or f"call_{name}",
+        "type": "function",
+        "function": {"name": name, "arguments": json.dumps(arguments)}
+    }
+
+
+def tool_reply(*calls: Dict[str, Any], content: Optional[str] = None) -> Dict[str, Any]:
+    """A model reply requesting tool calls"""
+    return {"content": content, "tool_calls": list(calls)}
+
+
+def answer(text: str, prompt_tokens: int = 50, completion_tokens: int = 5) -> Dict[str, Any]:
+    """A final model reply with usage"""
+    return {
+        "content": text,
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+    }
+
+
+class CapturingBackend(ReplayBackend):
+    """ReplayBackend keeping a copy of the messages of every request"""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.sent: List[List[Dict[str, Any]]] = []
+
+    def _next_entry(self, api_params: Dict[str, Any]) -> Dict[str, Any]:
+        self.sent.append(copy.deepcopy(api_params.get("messages", [])))
+        return super()._next_entry(api_params)
@@ -0,0 +1,86 @@
+"""Tests for AgentSpec and agents spawned from it."""
+
+import pytest
+
+from or_af import AgentSpec, MCPServer, ReplayBackend
+from or_af.exceptions import AgentConfigurationError
+from or_af.models import EventType
+
+from tests.helpers import answer, call, tool_reply
+
+
+TRACE = [tool_reply(call("add", a=5, b=3)), answer("8")]
+
+
+def make_spec(calculator, **kwargs):
+    kwargs.setdefault("backend", ReplayBackend(TRACE, loop=True))
+    return AgentSpec(system_prompt="You are a calculator.", mcp_servers=[calculator], verbose=False, **kwargs)
+
+
+def test_spec_validates_configuration_once(calculator):
+    with pytest.raises(AgentConfigurationError):
+        make_spec(calculator, max_iterations=0)
+
+
+def test_instances_share_configuration_and_run_independently(calculator):
+    spec = make_spec(calculator, name="calc")
+    first, second = spec.instantiate(), spec.instantiate("other")
+
+    assert first.agent_id != second.agent_id
+    assert (first.name, second.name) == ("calc", "other")
+    assert first.config is second.config is spec.config
+    assert first.run("Add 5 and 3").response == second.run("Add 5 and 3").response == "8"
+
+
+def test_instances_have_their_own_conversation(calculator):
+    spec = make_spec(calculator)
+    first, second = spec.instantiate(), spec.instantiate()
+
+    assert first.chat("Add 5 and 3").success
+
+    assert len(first.conversation_history) == 4
+    assert second.conversation_history == []
+
+
+def test_tool_registry_is_copied_on_write(calculator):
+    spec = make_spec(calculator)
+    extra = MCPServer(name="extra")
+
+    @extra.tool()
+    def echo(text: str) -> str:
+        """Echo the text"""
+        return text
+
+    changed, untouched = spec.instantiate(), spec.instantiate()
+    changed.connect_mcp(extra)
+
+    assert changed.list_mcp_servers() == ["calculator", "extra"]
+    assert untouched.list_mcp_servers() == ["calculator"]
+    assert spec.instantiate().list_mcp_servers() == ["calculator"]
+
+
+def test_instances_see_tools_registered_after_instantiation(calculator):
+    spec = make_spec(calculator)
+    shared, changed = spec.instantiate(), spec.instantiate()
+    changed.connect_mcp(MCPServer(name="extra"))
+
+    @calculator.tool()
+    def negate(x: int) -> int:
+        """Negate a number"""
+        return -x
+
+    assert shared._find_tool_server("negate") == "calculator"
+    assert changed._find_tool_server("negate") == "calculator"
+
+
+def test_callback_handler_is_copied_on_write(calculator):
+    events = []
+    spec = make_spec(calculator)
+    changed, untouched = spec.instantiate(), spec.instantiate()
+
+    changed.callback_handler.register(EventType.AGENT_START, events.append)
+    untouched.run("Add 5 and 3")
+    assert events == []
+
+    changed.run("Add 5 and 3")
+    assert len(events) == 1
@@ -0,0 +1,105 @@
+"""Tests for the async execution loop (Agent.arun / Agent.astream)."""
+
+import asyncio
+import time
+
+from or_af import ReplayBackend, ReplayTiming
+from or_af.models import EventType, StreamChunkType
+
+from tests.helpers import answer, call, tool_reply
+
+
+TRACE = [tool_reply(call("add", a=5, b=3)), answer("5 + 3 = 8")]
+
+
+def test_arun_executes_tools_and_answers(make_agent):
+    events = []
+    agent = make_agent(TRACE, callbacks=[events.append])
+
+    response = asyncio.run(agent.arun("Add 5 and 3"))
+
+    assert response.success
+    assert response.response == "5 + 3 = 8"
+    assert response.total_tool_calls == 1
+    results = [event.data["result"] for event in events if event.event_type == EventType.TOOL_CALL_END]
+    assert results == [8]
+
+
+def test_arun_without_streaming(make_agent):
+    agent = make_agent(TRACE, stream=False)
+
+    response = asyncio.run(agent.arun("Add 5 and 3"))
+
+    assert response.success
+    assert response.response == "5 + 3 = 8"
+
+
+def test_arun_matches_run(make_agent):
+    sync_response = make_agent(TRACE).run("Add 5 and 3")
+    async_response = asyncio.run(make_agent(TRACE).arun("Add 5 and 3"))
+
+    assert async_response.response == sync_response.response
+    assert async_response.total_tool_calls == sync_response.total_tool_calls
+
+
+def event_types(run, make_agent, trace, **kwargs):
+    events = []
+    run(make_agent(trace, callbacks=[events.append], **kwargs))
+    return [event.event_type for event in events]
+
+
+def test_arun_emits_the_same_events_as_run(make_agent):
+    for stream in (True, False):
+        sync_events = event_types(lambda agent: agent.run("Add"), make_agent, TRACE, stream=stream)
+        async_events = event_types(lambda agent: asyncio.run(agent.arun("Add")), make_agent, TRACE, stream=stream)
+
+        assert async_events == sync_events
+
+
+def test_arun_fails_like_run_when_iterations_run_out(make_agent):
+    trace = [tool_reply(call("add", a=1, b=1))] * 2
+    sync_response = make_agent(trace, max_iterations=2).run("Add")
+    async_response = asyncio.run(make_agent(trace, max_iterations=2).arun("Add"))
+
+    assert not async_response.success
+    assert async_response.error_message == sync_response.error_message == "Maximum iterations (2) reached"
+    assert len(async_response.iterations) == len(sync_response.iterations) == 2
+
+
+def test_arun_reports_backend_errors(make_agent):
+    agent = make_agent([tool_reply(call("add", a=1, b=1))])
+
+    response = asyncio.run(agent.arun("Add"))
+
+    assert not response.success
+    assert "exhausted" in response.error_message
+
+
+def test_concurrent_aruns_share_the_event_loop(make_agent):
+    backend = ReplayBackend([answer("done")], timing=ReplayTiming(time_to_first_token=0.2))
+    agent = make_agent(None, backend=backend)
+
+    async def main():
+        return await asyncio.gather(*(agent.arun(f"task {i}") for i in range(5)))
+
+    start = time.perf_counter()
+    responses = asyncio.run(main())
+    elapsed = time.perf_counter() - start
+
+    assert all(response.success for response in responses)
+    # Five 0.2s requests overlap instead of running back to back
+    assert elapsed < 0.6
+
+
+def test_astream_ends_with_final_response(make_agent):
+    agent = make_agent(TRACE)
+
+    async def collect():
+        return [chunk async for chunk in agent.astream("Add 5 and 3")]
+
+    chunks = asyncio.run(collect())
+
+    assert chunks[-1].type == StreamChunkType.FINAL_RESPONSE
+    assert chunks[-1].response.success
+    text = "".join(chunk.content for chunk in chunks if chunk.type == StreamChunkType.TEXT_DELTA)
+    assert text == "5 + 3 = 8"
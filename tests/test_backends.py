@@ -0,0 +1,148 @@
+"""Tests for the replay and recording LLM backends."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from or_af.exceptions import LLMConfigurationError, LLMError
+from or_af.llm import RecordingBackend, ReplayBackend, ReplayTiming
+
+from tests.helpers import answer, call, tool_reply
+
+
+TRACE = [tool_reply(call("add", a=5, b=3)), answer("8")]
+
+
+def request(turn=0, stream=False):
+    messages = [{"role": "user", "content": "Add"}] + [{"role": "assistant", "content": ""}] * turn
+    return {"model": "gpt-4o", "messages": messages, "stream": stream}
+
+
+# Replay
+
+
+def test_turn_matching_replays_by_conversation_turn():
+    backend = ReplayBackend(TRACE)
+
+    assert backend.create(**request(1)).choices[0].message.content == "8"
+    first = backend.create(**request(0))
+
+    assert first.choices[0].finish_reason == "tool_calls"
+    assert first.choices[0].message.tool_calls[0].function.name == "add"
+    assert backend.requests == 2
+
+
+def test_sequence_matching_hands_out_entries_in_order():
+    backend = ReplayBackend(TRACE, match="sequence")
+
+    replies = [backend.create(**request(0)).choices[0].message for _ in range(2)]
+
+    assert replies[0].tool_calls and replies[1].content == "8"
+    with pytest.raises(LLMError):
+        backend.create(**request(0))
+
+
+def test_loop_starts_over_when_the_trace_runs_out():
+    backend = ReplayBackend([answer("a"), answer("b")], match="sequence", loop=True)
+
+    assert [backend.create(**request()).choices[0].message.content for _ in range(3)] == ["a", "b", "a"]
+
+
+def test_invalid_traces_are_rejected():
+    with pytest.raises(LLMConfigurationError):
+        ReplayBackend([])
+    with pytest.raises(LLMConfigurationError):
+        ReplayBackend(TRACE, match="random")
+
+
+def test_non_streaming_reply_carries_usage():
+    completion = ReplayBackend([answer("8", prompt_tokens=40, completion_tokens=2)]).create(**request())
+
+    assert (completion.usage.prompt_tokens, completion.usage.total_tokens) == (40, 42)
+    assert completion.model == "gpt-4o"
+
+
+def test_timing_is_simulated():
+    timing = ReplayTiming(time_to_first_token=0.1, chunk_interval=0.02, chunk_chars=1)
+    backend = ReplayBackend([answer("abcd")], timing=timing)
+
+    start = time.perf_counter()
+    chunks = list(backend.create(**request(stream=True)))
+
+    assert time.perf_counter() - start >= 0.1 + 4 * 0.02
+    assert "".join(chunk.choices[0].delta.content or "" for chunk in chunks) == "abcd"
+    assert chunks[-1].choices[0].finish_reason == "stop"
+
+
+def test_stream_ends_with_usage_when_requested():
+    backend = ReplayBackend([answer("8", prompt_tokens=40, completion_tokens=2)])
+
+    plain = list(backend.create(**request(stream=True)))
+    chunks = list(backend.create(**request(stream=True), stream_options={"include_usage": True}))
+
+    assert chunks[:-1] == plain
+    assert chunks[-1].choices == []
+    assert chunks[-1].usage.total_tokens == 42
+
+
+def test_async_stream_matches_sync_stream():
+    backend = ReplayBackend(TRACE, timing=ReplayTiming(chunk_chars=4))
+
+    async def collect():
+        return [chunk async for chunk in await backend.acreate(**request(stream=True))]
+
+    sync_chunks = list(backend.create(**request(stream=True)))
+    async_chunks = asyncio.run(collect())
+
+    assert async_chunks == sync_chunks
+
+
+def test_agent_runs_offline_on_a_replay_backend(make_agent):
+    response = make_agent(TRACE).run("Add 5 and 3")
+
+    assert response.success
+    assert response.response == "8"
+    assert response.total_tool_calls == 1
+
+
+# Recording
+
+
+def test_recording_round_trips_through_a_trace_file(make_agent, tmp_path):
+    path = str(tmp_path / "trace.json")
+    recorder = RecordingBackend(ReplayBackend(TRACE))
+    recorded = make_agent(None, backend=recorder).run("Add 5 and 3", stream=False)
+    recorder.save(path)
+
+    assert json.load(open(path))["version"] == 1
+    replayed = make_agent(None, backend=ReplayBackend.load(path)).run("Add 5 and 3", stream=True)
+
+    assert replayed.response == recorded.response == "8"
+    assert recorder.responses[1]["usage"]["total_tokens"] == 55
+
+
+def test_recording_passes_streams_through():
+    recorder = RecordingBackend(ReplayBackend(TRACE, timing=ReplayTiming(chunk_chars=2)))
+
+    chunks = list(recorder.create(**request(stream=True)))
+
+    assert len(chunks) > 3
+    assert recorder.responses == [{"content": None, "tool_calls": TRACE[0]["tool_calls"]}]
+
+
+def test_recording_keeps_the_usage_of_streams():
+    recorder = RecordingBackend(ReplayBackend(TRACE))
+
+    list(recorder.create(**request(turn=1, stream=True), stream_options={"include_usage": True}))
+
+    assert recorder.responses[0]["usage"]["total_tokens"] == 55
+
+
+def test_loading_an_unknown_trace_version_fails(tmp_path):
+    path = tmp_path / "trace.json"
+    path.write_text(json.dumps({"version": 99, "responses": TRACE}))
+
+    with pytest.raises(LLMConfigurationError):
+        ReplayBackend.load(str(path))
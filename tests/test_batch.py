@@ -0,0 +1,121 @@
+"""Tests for Agent.run_many() / Agent.arun_many() batch runs."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from or_af import ReplayBackend, ReplayTiming
+from or_af.exceptions import AgentConfigurationError, AgentExecutionError
+
+from tests.helpers import answer
+
+
+def batch_agent(make_agent):
+    return make_agent(None, backend=ReplayBackend([answer("ok")], loop=True))
+
+
+def test_run_many_returns_every_response(make_agent):
+    batch = batch_agent(make_agent).run_many([f"task {i}" for i in range(5)], concurrency=2)
+
+    responses = list(batch)
+
+    assert sorted(response.task for response in responses) == [f"task {i}" for i in range(5)]
+    assert batch.stats.total == 5
+    assert batch.stats.succeeded == 5
+
+
+def test_run_many_rejects_a_none_task_instead_of_stopping(make_agent):
+    batch = batch_agent(make_agent).run_many(iter(["a", None, "b"]), concurrency=1)
+
+    with pytest.raises(AgentConfigurationError):
+        list(batch)
+
+
+def test_runs_in_flight_are_yielded_before_an_invalid_task_raises(make_agent):
+    batch = batch_agent(make_agent).run_many(iter(["a", "b", None, "c"]), concurrency=3)
+    received = []
+
+    with pytest.raises(AgentConfigurationError):
+        for response in batch:
+            received.append(response.task)
+
+    assert sorted(received) == ["a", "b"]
+    assert batch.stats.total == 2
+
+
+def test_async_runs_in_flight_are_yielded_before_an_invalid_task_raises(make_agent):
+    batch = batch_agent(make_agent).arun_many(iter(["a", "b", 3, "c"]), concurrency=3)
+    received = []
+
+    async def collect():
+        async for response in batch:
+            received.append(response.task)
+
+    with pytest.raises(AgentConfigurationError):
+        asyncio.run(collect())
+    assert sorted(received) == ["a", "b"]
+
+
+def test_stopping_an_async_batch_early_awaits_the_cancelled_runs(make_agent):
+    backend = ReplayBackend([answer("ok")], loop=True, timing=ReplayTiming(time_to_first_token=0.05))
+    batch = make_agent(None, backend=backend).arun_many([f"task {i}" for i in range(3)], concurrency=1)
+
+    async def first_only():
+        responses = batch.__aiter__()
+        first = await responses.__anext__()
+        await responses.aclose()
+        return first, [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    first, pending = asyncio.run(first_only())
+
+    assert first.success
+    assert pending == []
+
+
+def test_batch_run_can_only_be_iterated_once(make_agent):
+    batch = batch_agent(make_agent).run_many(["a", "b"])
+    list(batch)
+
+    with pytest.raises(AgentExecutionError):
+        iter(batch)
+    assert batch.stats.total == 2
+
+
+def test_arun_many_returns_every_response(make_agent):
+    batch = batch_agent(make_agent).arun_many(["a", "", "b", "c"], concurrency=2)
+
+    async def collect():
+        return [response async for response in batch]
+
+    assert len(asyncio.run(collect())) == 4
+    assert batch.stats.total == 4
+    with pytest.raises(AgentExecutionError):
+        batch.__aiter__()
+
+
+def test_concurrent_runs_rebuild_the_tool_registry_once(make_agent, calculator, monkeypatch):
+    agent = make_agent([answer("ok")])
+    get_tools = calculator.get_tools
+    rebuilds = []
+
+    def slow_get_tools():
+        rebuilds.append(threading.current_thread().name)
+        time.sleep(0.05)
+        return get_tools()
+
+    @calculator.tool()
+    def double(x: int) -> int:
+        """Double a number"""
+        return 2 * x
+
+    monkeypatch.setattr(calculator, "get_tools", slow_get_tools)
+    threads = [threading.Thread(target=agent._refresh_tool_registry) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(rebuilds) == 1
+    assert agent._find_tool_server("double") == "calculator"
@@ -0,0 +1,74 @@
+"""Tests for the benchmark harness behind benchmarks/run_suite.py."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks")
+sys.path.insert(0, BENCHMARKS)
+
+from harness import Case, Result, Suite, compare, load_baseline, measure, save_baseline  # noqa: E402
+
+
+def result(name, best):
+    return Result(name=name, best=best, median=best, number=1, repeat=1)
+
+
+def test_parameterized_cases_get_one_name_per_parameter():
+    suite = Suite()
+
+    @suite.case("tool.execute", params=["sync", "async"])
+    def tool_execute(kind):
+        return lambda: kind
+
+    assert [case.name for case in suite.cases] == ["tool.execute[sync]", "tool.execute[async]"]
+    assert suite.cases[1].setup()() == "async"
+    assert [case.name for case in suite.select(["[async]"])] == ["tool.execute[async]"]
+    with pytest.raises(ValueError):
+        suite.add(Case("tool.execute[sync]", lambda: None))
+
+
+def test_measure_calibrates_samples_to_min_time():
+    calls = []
+    case = Case("noop", lambda: lambda: calls.append(1), repeat=3, ops=10)
+
+    measured = measure(case, min_time=0.01, repeat=3)
+
+    assert measured.number > 1
+    assert len(calls) >= 3 * measured.number
+    assert 0 < measured.best <= measured.median
+    assert measured.best * measured.number * 10 < 0.1
+
+
+def test_baseline_round_trip_and_comparison(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    save_baseline([result("a", 1.0), result("b", 1.0), result("c", 1.0)], path)
+
+    baseline = load_baseline(path)
+    current = [result("a", 1.1), result("b", 1.5), result("c", 0.5), result("d", 1.0)]
+    statuses = {comparison.name: comparison.status for comparison in compare(current, baseline, 0.25)}
+
+    assert statuses == {"a": "ok", "b": "regressed", "c": "improved", "d": "new"}
+
+
+def test_unknown_baseline_version_is_rejected(tmp_path):
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps({"version": 99, "results": {}}))
+
+    with pytest.raises(ValueError):
+        load_baseline(str(path))
+
+
+def test_reference_baseline_covers_the_suite():
+    listed = subprocess.run(
+        [sys.executable, os.path.join(BENCHMARKS, "run_suite.py"), "--list"],
+        capture_output=True, text=True, check=True
+    ).stdout.split()
+
+    reference = load_baseline(os.path.join(BENCHMARKS, "baselines", "reference.json"))
+
+    assert listed
+    assert sorted(reference["results"]) == sorted(listed)
@@ -0,0 +1,185 @@
+"""Tests for the response cache and tool result memoization."""
+
+import time
+from fractions import Fraction
+
+from or_af import MCPServer, ReplayBackend, Tool
+from or_af.cache import InMemoryResponseCache, ResponseCache, SQLiteResponseCache, ToolCachePolicy
+from or_af.core.streaming import AssistantMessage
+from or_af.models import StreamChunkType
+
+from tests.helpers import answer, call, tool_reply
+
+
+def params(text, **kwargs):
+    return dict({"model": "gpt-4o", "messages": [{"role": "user", "content": text}]}, **kwargs)
+
+
+def message(text):
+    return AssistantMessage.from_parts(text, None)
+
+
+# Response cache
+
+
+def test_response_cache_key_ignores_stream_only():
+    assert ResponseCache.make_key(params("a", stream=True)) == ResponseCache.make_key(params("a"))
+    assert ResponseCache.make_key(params("a")) != ResponseCache.make_key(params("b"))
+    assert ResponseCache.make_key(params("a", temperature=0)) != ResponseCache.make_key(params("a"))
+
+
+def test_in_memory_cache_evicts_least_recently_used():
+    cache = InMemoryResponseCache(max_size=2)
+    for text in "abc":
+        key, _ = cache.lookup(params(text))
+        cache.store(key, message(text))
+        if text == "b":
+            cache.lookup(params("a"))
+
+    assert len(cache) == 2
+    assert cache.lookup(params("a"))[1] == {"content": "a", "tool_calls": None}
+    assert cache.lookup(params("b"))[1] is None
+    assert cache.stats()["hits"] == 2
+
+
+def test_in_memory_cache_expires_entries():
+    cache = InMemoryResponseCache(ttl=0.05)
+    key, _ = cache.lookup(params("a"))
+    cache.store(key, message("a"))
+
+    time.sleep(0.1)
+
+    assert cache.lookup(params("a"))[1] is None
+
+
+def test_sqlite_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    cache = SQLiteResponseCache(path)
+    key, _ = cache.lookup(params("a"))
+    cache.store(key, message("a"))
+    cache.close()
+
+    reopened = SQLiteResponseCache(path)
+
+    assert reopened.lookup(params("a"))[1]["content"] == "a"
+    assert len(reopened) == 1
+    reopened.close()
+
+
+def test_agent_serves_repeated_requests_from_the_cache(make_agent):
+    backend = ReplayBackend([tool_reply(call("add", a=1, b=2)), answer("3")])
+    cache = InMemoryResponseCache()
+    agent = make_agent(None, backend=backend, response_cache=cache)
+
+    first = agent.run("Add 1 and 2", stream=False)
+    chunks = list(agent.stream("Add 1 and 2"))
+
+    assert backend.requests == 2
+    assert cache.stats()["hits"] == 2
+    assert chunks[-1].response.response == first.response == "3"
+    assert [chunk.content for chunk in chunks if chunk.type == StreamChunkType.TEXT_DELTA] == ["3"]
+    assert [chunk.content for chunk in chunks if chunk.type == StreamChunkType.TOOL_RESULT] == ["3"]
+
+
+# Tool result cache
+
+
+def counting_tool(cached=True, **policy):
+    calls = []
+
+    def square(x, scale=1):
+        """Square a number"""
+        calls.append(x)
+        if x < 0:
+            raise ValueError("negative")
+        return x * x * scale
+
+    return Tool(name="square", func=square, cache=ToolCachePolicy(**policy) if cached else None), calls
+
+
+def test_cached_tool_runs_once_per_argument_set():
+    tool, calls = counting_tool()
+
+    first = tool.execute("call_1", x=3)
+    second = tool.execute("call_2", x=3)
+    other = tool.execute("call_3", x=4)
+
+    assert calls == [3, 4]
+    assert (first.result, second.result, other.result) == (9, 9, 16)
+    assert second.cached and second.tool_call_id == "call_2"
+    assert not first.cached
+    stats = tool.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 2, 2)
+
+
+def test_cached_results_are_not_shared_with_callers():
+    tool = Tool(name="listing", func=lambda n: list(range(n)), cache=ToolCachePolicy())
+
+    first = tool.execute("call_1", n=2)
+    first.result.append("changed")
+    second = tool.execute("call_2", n=2)
+    second.result.append("changed")
+
+    assert tool.execute("call_3", n=2).result == [0, 1]
+
+
+def test_tool_failures_are_not_cached():
+    tool, calls = counting_tool()
+
+    tool.execute("call_1", x=-1)
+    tool.execute("call_2", x=-1)
+
+    assert calls == [-1, -1]
+
+
+def test_tool_cache_policy_ttl_size_and_key():
+    tool, calls = counting_tool(ttl=0.05)
+    tool.execute("call_1", x=1)
+    time.sleep(0.1)
+    tool.execute("call_2", x=1)
+    assert calls == [1, 1]
+
+    tool, calls = counting_tool(max_size=1)
+    for x in (1, 2, 1):
+        tool.execute("call", x=x)
+    assert calls == [1, 2, 1]
+
+    tool, calls = counting_tool(key_func=lambda x, scale=1: x)
+    tool.execute("call_1", x=2, scale=1)
+    assert tool.execute("call_2", x=2, scale=5).result == 4
+    assert calls == [2]
+
+
+def test_unkeyable_arguments_bypass_the_cache():
+    tool, calls = counting_tool()
+
+    # Fractions are not JSON serializable
+    results = [tool.execute(f"call_{i}", x=2, scale=Fraction(1, 2)) for i in range(2)]
+
+    assert [result.result for result in results] == [2, 2]
+    assert len(calls) == 2
+    assert tool.cache_stats()["size"] == 0
+
+
+def test_uncached_tools_report_no_stats():
+    tool, _ = counting_tool(cached=False)
+
+    assert tool.cache_stats() is None
+
+
+def test_agent_reuses_cached_tool_results(make_agent):
+    server = MCPServer(name="slow")
+    calls = []
+
+    @server.tool(cache=True)
+    def lookup(key: str) -> str:
+        """Slow lookup"""
+        calls.append(key)
+        return key.upper()
+
+    trace = [tool_reply(call("lookup", "call_1", key="a")), tool_reply(call("lookup", "call_2", key="a")), answer("A")]
+    agent = make_agent(trace, mcp_servers=[server])
+
+    assert agent.run("Look up a twice").success
+    assert calls == ["a"]
+    assert server.tools["lookup"].cache_stats()["hits"] == 1
@@ -0,0 +1,167 @@
+"""Tests for CallbackHandler emission, asynchronous dispatch and StreamChunkEvent."""
+
+import threading
+import time
+
+import pytest
+
+from or_af.callbacks import CallbackHandler, DispatchConfig
+from or_af.exceptions import CallbackError
+from or_af.models import AgentEvent, EventType, StreamChunkEvent
+
+from tests.helpers import answer
+
+
+def test_emit_returns_none_without_listeners():
+    handler = CallbackHandler()
+
+    assert handler.emit(EventType.AGENT_START, task="t") is None
+    assert handler.emit_chunk("x") is None
+
+
+def test_emit_returns_the_delivered_event():
+    events = []
+    handler = CallbackHandler()
+    handler.register(EventType.AGENT_START, events.append)
+
+    event = handler.emit(EventType.AGENT_START, iteration=1, task="t")
+
+    assert isinstance(event, AgentEvent)
+    assert events == [event]
+    assert handler.emit(EventType.AGENT_END) is None
+
+
+def test_stream_chunk_event_dumps_like_an_agent_event():
+    chunk = StreamChunkEvent("hello", iteration=2)
+    event = AgentEvent(event_type=EventType.STREAM_CHUNK, iteration=2, data={"chunk": "hello"})
+
+    dumped = chunk.model_dump()
+
+    assert dumped.keys() == event.model_dump().keys()
+    assert dumped["event_type"] == event.model_dump()["event_type"]
+    assert dumped["timestamp"] == chunk.timestamp
+    assert {key: dumped[key] for key in ("iteration", "data")} == {"iteration": 2, "data": {"chunk": "hello"}}
+    assert chunk.model_dump(mode="json")["timestamp"] == chunk.timestamp.isoformat()
+    assert chunk.dict() == dumped
+
+
+def test_callbacks_can_dump_every_event_of_a_streamed_run(make_agent):
+    dumps = []
+    agent = make_agent([answer("Hello there")], callbacks=[lambda event: dumps.append(event.model_dump())])
+
+    assert agent.run("Hi", stream=True).success
+
+    chunks = [dump["data"]["chunk"] for dump in dumps if dump["event_type"] == EventType.STREAM_CHUNK.value]
+    assert "".join(chunks) == "Hello there"
+
+
+# Asynchronous dispatch
+
+
+class Gate:
+    """Callback that blocks on its first event until released"""
+
+    def __init__(self):
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.seen = []
+
+    def __call__(self, event):
+        self.entered.set()
+        self.release.wait(5)
+        self.seen.append(event.data["n"])
+
+
+def gated_handler(**config):
+    gate = Gate()
+    handler = CallbackHandler(dispatch=DispatchConfig(**config))
+    handler.register(EventType.WARNING, gate)
+    handler.emit(EventType.WARNING, n=0)
+    assert gate.entered.wait(5)
+    return handler, gate
+
+
+def test_async_dispatch_does_not_wait_for_callbacks():
+    handler, gate = gated_handler()
+
+    start = time.perf_counter()
+    for n in range(1, 4):
+        handler.emit(EventType.WARNING, n=n)
+    assert time.perf_counter() - start < 0.1
+
+    gate.release.set()
+    assert handler.flush(5)
+    assert gate.seen == [0, 1, 2, 3]
+    assert handler.stats()["dispatched"] == 4
+    handler.close()
+
+
+def test_drop_oldest_keeps_the_newest_events():
+    handler, gate = gated_handler(buffer_size=2, overflow="drop_oldest")
+
+    for n in range(1, 5):
+        handler.emit(EventType.WARNING, n=n)
+    gate.release.set()
+    handler.flush(5)
+
+    assert gate.seen == [0, 3, 4]
+    assert handler.stats()["dropped"] == 2
+    handler.close()
+
+
+def test_drop_newest_keeps_the_oldest_events():
+    handler, gate = gated_handler(buffer_size=2, overflow="drop_newest")
+
+    for n in range(1, 5):
+        handler.emit(EventType.WARNING, n=n)
+    gate.release.set()
+    handler.flush(5)
+
+    assert gate.seen == [0, 1, 2]
+    assert handler.stats()["dropped"] == 2
+    handler.close()
+
+
+def test_block_waits_for_room_up_to_its_timeout():
+    handler, gate = gated_handler(buffer_size=1, overflow="block", block_timeout=0.1)
+    handler.emit(EventType.WARNING, n=1)
+
+    start = time.perf_counter()
+    handler.emit(EventType.WARNING, n=2)
+    assert time.perf_counter() - start >= 0.1
+
+    gate.release.set()
+    handler.flush(5)
+    assert gate.seen == [0, 1]
+    handler.close()
+
+
+def test_callback_errors_are_counted_not_raised():
+    def broken(event):
+        raise RuntimeError("boom")
+
+    handler = CallbackHandler(dispatch=DispatchConfig())
+    handler.register_global(broken)
+    handler.emit(EventType.WARNING)
+    handler.flush(5)
+
+    (stats,) = handler.stats()["callbacks"].values()
+    assert (stats["calls"], stats["errors"]) == (1, 1)
+    handler.close()
+
+
+def test_events_after_close_are_dispatched_inline():
+    events = []
+    with CallbackHandler(dispatch=DispatchConfig()) as handler:
+        handler.register_global(events.append)
+
+    handler.emit(EventType.WARNING)
+
+    assert len(events) == 1
+
+
+def test_invalid_dispatch_config_is_rejected():
+    with pytest.raises(CallbackError):
+        DispatchConfig(overflow="spill")
+    with pytest.raises(CallbackError):
+        DispatchConfig(buffer_size=0)
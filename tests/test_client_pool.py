@@ -0,0 +1,87 @@
+"""Tests for the shared OpenAI client pool."""
+
+import asyncio
+import importlib.util
+
+import pytest
+
+from or_af import Agent
+from or_af.exceptions import LLMConfigurationError
+from or_af.llm import ClientPool, ClientPoolConfig
+
+
+DEPLOYMENT = ("https://example.openai.azure.com", "2024-06-01", "key")
+
+
+@pytest.fixture
+def pool():
+    pool = ClientPool()
+    yield pool
+    pool.close()
+
+
+def test_sync_clients_are_shared_per_deployment(pool):
+    client = pool.get_client(*DEPLOYMENT)
+
+    assert pool.get_client(*DEPLOYMENT) is client
+    assert pool.get_client("https://other.openai.azure.com", *DEPLOYMENT[1:]) is not client
+    assert pool.stats()["sync_clients"] == 2
+
+
+def test_retry_override_gets_its_own_client(pool):
+    default = pool.get_client(*DEPLOYMENT)
+    no_retries = pool.get_client(*DEPLOYMENT, max_retries=0)
+
+    assert no_retries is not default
+    assert no_retries.max_retries == 0
+    assert default.max_retries == ClientPoolConfig().max_retries
+
+
+def test_agents_share_the_pooled_client(pool, monkeypatch):
+    endpoint, api_version, key = DEPLOYMENT
+    monkeypatch.setenv("endpoint", endpoint)
+    monkeypatch.setenv("api_version", api_version)
+    monkeypatch.setenv("subscription_key", key)
+
+    first = Agent(system_prompt="s", verbose=False, client_pool=pool)
+    second = Agent(system_prompt="s", verbose=False, client_pool=pool)
+
+    assert first.client is second.client
+
+
+def test_async_clients_are_shared_per_loop(pool):
+    async def get():
+        return pool.get_async_client(*DEPLOYMENT), pool.get_async_client(*DEPLOYMENT)
+
+    first, same = asyncio.run(get())
+    other_loop, _ = asyncio.run(get())
+
+    assert first is same
+    assert other_loop is not first
+
+
+def test_aclose_closes_the_loops_async_clients(pool):
+    async def main():
+        client = pool.get_async_client(*DEPLOYMENT)
+        await pool.aclose()
+        return client, pool.stats()["async_clients"]
+
+    client, remaining = asyncio.run(main())
+
+    assert client.is_closed()
+    assert remaining == 0
+
+
+def test_close_closes_sync_clients(pool):
+    client = pool.get_client(*DEPLOYMENT)
+
+    pool.close()
+
+    assert client.is_closed()
+    assert pool.stats() == {"sync_clients": 0, "async_clients": 0}
+
+
+@pytest.mark.skipif(importlib.util.find_spec("h2") is not None, reason="h2 is installed")
+def test_http2_requires_h2():
+    with pytest.raises(LLMConfigurationError):
+        ClientPool(ClientPoolConfig(http2=True))
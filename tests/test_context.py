@@ -0,0 +1,172 @@
+"""Tests for ContextWindow budgeting, compaction and rollback."""
+
+import copy
+
+from or_af.core.context import ContextWindow
+
+from tests.helpers import answer, call, tool_reply
+
+
+BIG_OUTPUT = "x" * 4000
+
+
+def tool_turn(context, call_id, output):
+    context.append({
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [{"id": call_id, "type": "function", "function": {"name": "read", "arguments": "{}"}}]
+    })
+    context.append({"role": "tool", "tool_call_id": call_id, "content": output})
+
+
+class ReadCountingList(list):
+    """List counting the items read by index or iteration"""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def __getitem__(self, index):
+        self.reads += 1
+        return super().__getitem__(index)
+
+    def __iter__(self):
+        self.reads += len(self)
+        return super().__iter__()
+
+
+def snapshot(context):
+    return copy.deepcopy(context.messages), context.total_tokens, context.tokens_saved
+
+
+def test_fit_is_a_no_op_within_budget():
+    context = ContextWindow(max_tokens=10_000)
+    context.append({"role": "user", "content": "hi"})
+    tool_turn(context, "call_1", BIG_OUTPUT)
+    context.append({"role": "assistant", "content": "done"})
+
+    assert context.fit() == 0
+    assert context.messages[2]["content"] == BIG_OUTPUT
+
+
+def test_fit_compacts_only_tool_outputs_the_model_has_seen():
+    context = ContextWindow(max_tokens=1000, truncate_to=50)
+    context.append({"role": "user", "content": "hi"})
+    tool_turn(context, "call_1", BIG_OUTPUT)
+    tool_turn(context, "call_2", BIG_OUTPUT)
+
+    saved = context.fit()
+
+    assert saved > 0
+    assert context.tokens_saved == saved
+    assert "[truncated" in context.messages[2]["content"]
+    # The second output comes after the last assistant message
+    assert context.messages[4]["content"] == BIG_OUTPUT
+    assert context.original(2)["content"] == BIG_OUTPUT
+    assert context.total_tokens == sum(context._message_tokens(m) for m in context.messages)
+
+
+def test_fit_uses_the_summarizer():
+    context = ContextWindow(max_tokens=500, summarizer=lambda content: f"{len(content)} chars")
+    tool_turn(context, "call_1", BIG_OUTPUT)
+    context.append({"role": "assistant", "content": "done"})
+
+    context.fit()
+
+    assert context.messages[1]["content"] == "4000 chars"
+
+
+def test_fit_does_not_rescan_earlier_messages():
+    context = ContextWindow(max_tokens=2000, truncate_to=10)
+    context.messages = ReadCountingList()
+
+    for turn in range(200):
+        tool_turn(context, f"call_{turn}", BIG_OUTPUT)
+        context.fit()
+
+    # Each fit() reads only the messages appended since the previous one
+    assert context.messages.reads < 1000
+    compacted = [m for m in list.__iter__(context.messages) if "[truncated" in (m.get("content") or "")]
+    assert len(compacted) == 199
+
+
+def test_rollback_undoes_compactions_of_the_dropped_turn():
+    context = ContextWindow(max_tokens=1500, truncate_to=50)
+    context.append({"role": "user", "content": "hi"})
+    tool_turn(context, "call_1", BIG_OUTPUT)
+    context.append({"role": "assistant", "content": "done"})
+    before = snapshot(context)
+    turn_start = len(context)
+
+    context.append({"role": "user", "content": "again"})
+    tool_turn(context, "call_2", BIG_OUTPUT)
+    context.append({"role": "assistant", "content": "reading"})
+    assert context.fit() > 0
+    context.rollback(turn_start)
+
+    assert snapshot(context) == before
+    assert context.original(2)["content"] == BIG_OUTPUT
+
+
+def test_rollback_keeps_compactions_of_earlier_turns():
+    context = ContextWindow(max_tokens=1000, truncate_to=50)
+    context.append({"role": "user", "content": "hi"})
+    tool_turn(context, "call_1", BIG_OUTPUT)
+    context.append({"role": "assistant", "content": "done"})
+    context.fit()
+    before = snapshot(context)
+    turn_start = len(context)
+
+    context.append({"role": "user", "content": "again"})
+    tool_turn(context, "call_2", BIG_OUTPUT)
+    context.append({"role": "assistant", "content": "reading"})
+    context.fit()
+    context.rollback(turn_start)
+
+    assert snapshot(context) == before
+    assert "[truncated" in context.messages[2]["content"]
+
+
+def test_compactions_undone_by_rollback_are_redone_by_fit():
+    context = ContextWindow(max_tokens=1500, truncate_to=50)
+    context.append({"role": "user", "content": "hi"})
+    tool_turn(context, "call_1", BIG_OUTPUT)
+    context.append({"role": "assistant", "content": "done"})
+    turn_start = len(context)
+
+    def failed_turn():
+        context.append({"role": "user", "content": "again"})
+        tool_turn(context, "call_2", BIG_OUTPUT)
+        context.append({"role": "assistant", "content": "reading"})
+        saved = context.fit()
+        context.rollback(turn_start)
+        return saved
+
+    first = failed_turn()
+    assert first > 0
+    assert failed_turn() == first
+
+
+def test_rollback_forgets_dropped_assistant_messages():
+    context = ContextWindow(max_tokens=500, truncate_to=50)
+    context.append({"role": "user", "content": "hi"})
+    tool_turn(context, "call_1", BIG_OUTPUT)
+    context.append({"role": "assistant", "content": "done"})
+    context.rollback(3)
+
+    # The tool output is unseen again once the reply after it is dropped
+    assert context.fit() == 0
+    assert context.messages[2]["content"] == BIG_OUTPUT
+
+
+def test_failed_chat_turn_leaves_the_session_unchanged(make_agent):
+    trace = [tool_reply(call("fail", reason="r" * 3000)), answer("It failed"), tool_reply(call("add", a=1, b=2))]
+    agent = make_agent(trace, max_context_tokens=1000)
+
+    agent.chat("Try it")
+    before = snapshot(agent._session)
+    # The first output is compacted, then the backend runs out of replies
+    assert not agent.chat("Again").success
+
+    assert snapshot(agent._session) == before
+    assert agent._session.messages[3]["content"].endswith("r" * 100)
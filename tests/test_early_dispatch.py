@@ -0,0 +1,181 @@
+"""Tests for early tool dispatch while a reply is still streaming."""
+
+import asyncio
+import threading
+import time
+
+from or_af import Agent, MCPServer, ReplayBackend, ReplayTiming
+
+from tests.helpers import answer, call, tool_reply
+
+
+class BrokenStreamBackend(ReplayBackend):
+    """Replays the trace, but every stream fails before its final chunk"""
+
+    def _stream(self, chunks):
+        yield from super()._stream(chunks[:-1])
+        raise ConnectionError("stream dropped")
+
+    async def _astream(self, chunks):
+        async for chunk in super()._astream(chunks[:-1]):
+            yield chunk
+        raise ConnectionError("stream dropped")
+
+
+class Probe:
+    """Tools recording how many of them run at once and how they ended"""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.finished = []
+        self.cancelled = []
+        self._lock = threading.Lock()
+        self.server = MCPServer(name="probe")
+
+        @self.server.tool()
+        async def nap(seconds: float) -> float:
+            """Sleep asynchronously"""
+            self._enter()
+            try:
+                await asyncio.sleep(seconds)
+            except asyncio.CancelledError:
+                self.cancelled.append(seconds)
+                raise
+            finally:
+                self._exit()
+            self.finished.append(seconds)
+            return seconds
+
+        @self.server.tool()
+        def block(seconds: float) -> float:
+            """Sleep in the calling thread"""
+            self._enter()
+            time.sleep(seconds)
+            self._exit()
+            self.finished.append(seconds)
+            return seconds
+
+    def _enter(self):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+    def _exit(self):
+        with self._lock:
+            self.active -= 1
+
+
+def probe_agent(probe, backend, **kwargs):
+    return Agent(
+        system_prompt="s",
+        mcp_servers=[probe.server],
+        verbose=False,
+        backend=backend,
+        early_tool_dispatch=True,
+        **kwargs
+    )
+
+
+def test_tools_start_before_the_reply_ends(make_agent):
+    trace = [tool_reply(call("wait", "call_1", seconds=0.2), call("wait", "call_2", seconds=0.2)), answer("done")]
+    timing = ReplayTiming(chunk_interval=0.02, chunk_chars=4)
+
+    def elapsed(early_tool_dispatch):
+        agent = make_agent(
+            None, backend=ReplayBackend(trace, timing=timing), early_tool_dispatch=early_tool_dispatch
+        )
+        start = time.perf_counter()
+        assert agent.run("Wait twice").success
+        return time.perf_counter() - start
+
+    # The first call runs while the second one streams
+    assert elapsed(True) < elapsed(False) - 0.1
+
+
+def test_a_single_tool_call_starts_before_the_reply_ends(make_agent):
+    # Header, arguments and final chunk: the tool can run during the last interval
+    trace = [tool_reply(call("wait", "call_1", seconds=0.3)), answer("done")]
+    timing = ReplayTiming(chunk_interval=0.3, chunk_chars=64)
+
+    def elapsed(early_tool_dispatch):
+        agent = make_agent(
+            None, backend=ReplayBackend(trace, timing=timing), early_tool_dispatch=early_tool_dispatch
+        )
+        start = time.perf_counter()
+        assert agent.run("Wait").success
+        return time.perf_counter() - start
+
+    assert elapsed(True) < elapsed(False) - 0.15
+
+
+def test_sequential_early_dispatch_runs_tools_one_at_a_time_in_order():
+    probe = Probe()
+    calls = [call("block", f"call_{i}", seconds=seconds) for i, seconds in enumerate((0.1, 0.05, 0.01))]
+    backend = ReplayBackend([tool_reply(*calls), answer("done")], timing=ReplayTiming(chunk_interval=0.005))
+    agent = probe_agent(probe, backend)
+
+    assert agent.run("Block").success
+
+    assert probe.finished == [0.1, 0.05, 0.01]
+    assert probe.max_active == 1
+
+
+def test_async_sequential_early_dispatch_runs_tools_one_at_a_time_in_order():
+    probe = Probe()
+    calls = [call("nap", f"call_{i}", seconds=seconds) for i, seconds in enumerate((0.1, 0.05, 0.01))]
+    backend = ReplayBackend([tool_reply(*calls), answer("done")], timing=ReplayTiming(chunk_interval=0.005))
+    agent = probe_agent(probe, backend)
+
+    assert asyncio.run(agent.arun("Nap")).success
+
+    assert probe.finished == [0.1, 0.05, 0.01]
+    assert probe.max_active == 1
+
+
+def test_async_early_dispatch_respects_max_tool_concurrency():
+    probe = Probe()
+    calls = [call("nap", f"call_{i}", seconds=0.05) for i in range(6)]
+    backend = ReplayBackend([tool_reply(*calls), answer("done")], timing=ReplayTiming(chunk_interval=0.005))
+    agent = probe_agent(probe, backend, parallel_tool_calls=True, max_tool_concurrency=2)
+
+    response = asyncio.run(agent.arun("Nap"))
+
+    assert response.success
+    assert len(probe.finished) == 6
+    assert probe.max_active <= 2
+
+
+def test_sync_run_waits_for_dispatched_tools_when_the_stream_fails():
+    probe = Probe()
+    calls = [call("block", "call_1", seconds=0.2), call("block", "call_2", seconds=0.2)]
+    agent = probe_agent(probe, BrokenStreamBackend([tool_reply(*calls), answer("done")]))
+
+    response = agent.run("Block")
+
+    assert not response.success
+    assert "stream dropped" in response.error_message
+    # The call dispatched before the failure finished before run() returned
+    assert probe.finished == [0.2]
+    assert probe.active == 0
+
+
+def test_async_run_cancels_dispatched_tools_when_the_stream_fails():
+    probe = Probe()
+    calls = [call("nap", "call_1", seconds=5), call("nap", "call_2", seconds=5)]
+    backend = BrokenStreamBackend([tool_reply(*calls), answer("done")], timing=ReplayTiming(chunk_interval=0.01))
+    agent = probe_agent(probe, backend)
+
+    async def main():
+        response = await agent.arun("Nap")
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        return response, pending
+
+    start = time.perf_counter()
+    response, pending = asyncio.run(main())
+
+    assert not response.success
+    assert time.perf_counter() - start < 1
+    assert probe.cancelled == [5]
+    assert probe.finished == []
+    assert pending == []
@@ -0,0 +1,152 @@
+"""Tests for the buffered, rotating FileCallback."""
+
+import gzip
+import json
+import os
+import time
+
+import pytest
+
+from or_af.callbacks import FileCallback
+from or_af.exceptions import CallbackError
+from or_af.models import AgentEvent, EventType
+
+
+def event(n):
+    return AgentEvent(event_type=EventType.WARNING, iteration=n, data={"n": n})
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_events_are_written_as_json_lines(tmp_path):
+    path = tmp_path / "events.jsonl"
+
+    with FileCallback(str(path), flush_interval=None) as callback:
+        callback.on_event(event(1))
+
+    (line,) = read_lines(path)
+    assert line["event_type"] == EventType.WARNING.value
+    assert (line["iteration"], line["data"]) == (1, {"n": 1})
+    assert "timestamp" in line
+
+
+def test_events_are_buffered_until_the_buffer_fills(tmp_path):
+    path = tmp_path / "events.jsonl"
+    callback = FileCallback(str(path), buffer_size=3, flush_interval=None)
+
+    callback.on_event(event(1))
+    callback.on_event(event(2))
+    assert not path.exists()
+    callback.on_event(event(3))
+    assert len(read_lines(path)) == 3
+
+    callback.on_event(event(4))
+    callback.flush()
+    assert [line["data"]["n"] for line in read_lines(path)] == [1, 2, 3, 4]
+    callback.close()
+
+
+def test_close_writes_pending_events_and_discards_later_ones(tmp_path):
+    path = tmp_path / "events.jsonl"
+    callback = FileCallback(str(path), flush_interval=None)
+
+    callback.on_event(event(1))
+    callback.close()
+    callback.on_event(event(2))
+    callback.flush()
+
+    assert len(read_lines(path)) == 1
+
+
+def test_append_false_truncates_the_file(tmp_path):
+    path = tmp_path / "events.jsonl"
+    path.write_text('{"old": true}\n')
+
+    with FileCallback(str(path), append=False, flush_interval=None) as callback:
+        callback.on_event(event(1))
+
+    assert [line["iteration"] for line in read_lines(path)] == [1]
+
+
+def test_append_keeps_existing_lines(tmp_path):
+    path = tmp_path / "events.jsonl"
+    path.write_text('{"old": true}\n')
+
+    with FileCallback(str(path), flush_interval=None) as callback:
+        callback.on_event(event(1))
+
+    assert len(read_lines(path)) == 2
+
+
+def test_rotation_keeps_backup_count_backups(tmp_path):
+    path = tmp_path / "events.jsonl"
+    callback = FileCallback(str(path), buffer_size=1, flush_interval=None, max_bytes=1, backup_count=2)
+
+    for n in range(5):
+        callback.on_event(event(n))
+    callback.close()
+
+    assert callback.rotations == 4
+    assert sorted(os.listdir(tmp_path)) == ["events.jsonl", "events.jsonl.1", "events.jsonl.2"]
+    assert read_lines(path)[0]["iteration"] == 4
+    assert read_lines(f"{path}.1")[0]["iteration"] == 3
+    assert read_lines(f"{path}.2")[0]["iteration"] == 2
+
+
+def test_rotation_respects_max_bytes(tmp_path):
+    path = tmp_path / "events.jsonl"
+    callback = FileCallback(str(path), buffer_size=1, flush_interval=None, max_bytes=2000, backup_count=1)
+
+    for n in range(100):
+        callback.on_event(event(n))
+    callback.close()
+
+    assert callback.rotations > 0
+    assert os.path.getsize(path) <= 2000
+    assert os.path.getsize(f"{path}.1") <= 2000
+
+
+def test_gzip_compresses_rotated_files(tmp_path):
+    path = tmp_path / "events.jsonl"
+    callback = FileCallback(str(path), buffer_size=1, flush_interval=None, max_bytes=1, compression="gzip")
+
+    callback.on_event(event(1))
+    callback.on_event(event(2))
+    callback.close()
+
+    with gzip.open(f"{path}.1.gz", "rt", encoding="utf-8") as f:
+        assert json.loads(f.read())["iteration"] == 1
+    assert read_lines(path)[0]["iteration"] == 2
+
+
+def test_no_backups_discards_rotated_files(tmp_path):
+    path = tmp_path / "events.jsonl"
+    callback = FileCallback(str(path), buffer_size=1, flush_interval=None, max_bytes=1, backup_count=0)
+
+    callback.on_event(event(1))
+    callback.on_event(event(2))
+    callback.close()
+
+    assert os.listdir(tmp_path) == ["events.jsonl"]
+
+
+def test_background_thread_flushes_the_buffer(tmp_path):
+    path = tmp_path / "events.jsonl"
+    callback = FileCallback(str(path), flush_interval=0.05)
+
+    callback.on_event(event(1))
+    time.sleep(0.3)
+
+    assert len(read_lines(path)) == 1
+    callback.close()
+    assert not callback._flusher.is_alive()
+
+
+def test_invalid_options_are_rejected(tmp_path):
+    with pytest.raises(CallbackError):
+        FileCallback(str(tmp_path / "a"), compression="bzip2")
+    with pytest.raises(CallbackError):
+        FileCallback(str(tmp_path / "a"), buffer_size=0)
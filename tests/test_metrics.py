@@ -0,0 +1,187 @@
+"""Tests for StreamingHistogram accuracy and MetricsCallback snapshots."""
+
+import math
+import random
+import threading
+
+import pytest
+
+from or_af.callbacks import MetricsCallback, StreamingHistogram
+from or_af.models import AgentEvent, EventType
+
+from tests.helpers import answer, call, tool_reply
+
+
+def exact_percentile(values, percent):
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+# StreamingHistogram
+
+
+@pytest.mark.parametrize("relative_error", [0.01, 0.05])
+def test_percentiles_are_within_the_relative_error(relative_error):
+    rng = random.Random(7)
+    values = [rng.lognormvariate(-3, 1.5) for _ in range(20_000)]
+    histogram = StreamingHistogram(relative_error=relative_error)
+    for value in values:
+        histogram.record(value)
+
+    for percent in (1, 10, 25, 50, 75, 90, 95, 99, 99.9):
+        expected = exact_percentile(values, percent)
+        assert abs(histogram.percentile(percent) - expected) <= relative_error * expected
+
+
+def test_count_sum_min_and_max_are_exact():
+    values = [0.5, 2.0, 1e-9, 5e7]
+    histogram = StreamingHistogram()
+    for value in values:
+        histogram.record(value)
+
+    assert histogram.count == 4
+    assert histogram.total == sum(values)
+    assert (histogram.min, histogram.max) == (1e-9, 5e7)
+    assert histogram.percentile(100) == 5e7
+    # Values below ``lowest`` are reported as the exact minimum
+    assert histogram.percentile(1) == 1e-9
+
+
+def test_memory_is_bounded_by_the_bucket_range():
+    histogram = StreamingHistogram(lowest=1e-3, highest=1e3)
+    rng = random.Random(3)
+    for _ in range(50_000):
+        histogram.record(10 ** rng.uniform(-5, 5))
+
+    assert len(histogram.buckets()) <= histogram._max_index + 2
+    assert histogram.count == 50_000
+
+
+def test_empty_histogram_reports_nothing():
+    histogram = StreamingHistogram()
+
+    assert histogram.percentile(50) is None
+    assert histogram.mean is None
+    assert histogram.summary()["p99"] is None
+
+
+def test_cumulative_counts():
+    histogram = StreamingHistogram()
+    for value in (0.001, 0.01, 0.1, 1.0, 10.0):
+        histogram.record(value)
+
+    assert histogram.cumulative_counts([0.005, 0.5, 5.0]) == [1, 3, 4]
+
+
+def test_values_approximate_every_recorded_value():
+    histogram = StreamingHistogram()
+    for value in (3.0, 1.0, 2.0, 2.0):
+        histogram.record(value)
+
+    assert histogram.values() == pytest.approx([1.0, 2.0, 2.0, 3.0], rel=histogram.relative_error)
+
+
+def test_reset_drops_all_values():
+    histogram = StreamingHistogram()
+    histogram.record(1.0)
+    histogram.reset()
+
+    assert histogram.count == 0
+    assert histogram.buckets() == {}
+    assert histogram.percentile(50) is None
+
+
+def test_invalid_ranges_are_rejected():
+    with pytest.raises(ValueError):
+        StreamingHistogram(lowest=1.0, highest=0.5)
+    with pytest.raises(ValueError):
+        StreamingHistogram(relative_error=1.0)
+
+
+# MetricsCallback
+
+
+def test_snapshot_summarizes_a_run(make_agent):
+    metrics = MetricsCallback()
+    trace = [tool_reply(call("add", a=1, b=2), call("fail", reason="no")), answer("3", 40, 8)]
+    agent = make_agent(trace, callbacks=[metrics])
+
+    assert agent.run("Add").success
+    snapshot = metrics.snapshot()
+
+    assert snapshot["runs"] == {"succeeded": 1, "failed": 0}
+    assert snapshot["total_iterations"] == 2
+    assert snapshot["total_tool_calls"] == 2
+    assert snapshot["tools"]["add"]["count"] == 1
+    assert snapshot["tools"]["fail"]["errors"] == 1
+    assert snapshot["errors_by_type"] == {"ValueError": 1}
+    assert snapshot["tokens"]["completion"] >= 8
+    assert snapshot["latency"]["agent_run"]["count"] == 1
+    assert snapshot["latency"]["llm_call"]["count"] == 2
+
+
+def test_unknown_tool_is_counted_once(make_agent):
+    metrics = MetricsCallback()
+    events = []
+    agent = make_agent([tool_reply(call("missing")), answer("done")], callbacks=[metrics, events.append])
+
+    assert agent.run("Call it").success
+    snapshot = metrics.snapshot()
+
+    assert [event.event_type for event in events].count(EventType.TOOL_ERROR.value) == 1
+    assert (snapshot["total_tool_calls"], snapshot["failed_tool_calls"]) == (1, 1)
+    assert snapshot["errors_by_type"] == {"ToolNotFoundError": 1}
+
+
+def test_tool_execution_times_is_a_deprecated_alias():
+    metrics = MetricsCallback()
+    for seconds in (0.2, 0.1):
+        metrics.on_event(AgentEvent(event_type=EventType.TOOL_CALL_END, data={"tool_name": "add", "execution_time": seconds}))
+
+    with pytest.warns(DeprecationWarning):
+        times = metrics.tool_execution_times
+
+    assert times == pytest.approx([0.1, 0.2], rel=metrics.relative_error)
+
+
+def test_snapshot_is_a_copy():
+    metrics = MetricsCallback()
+    metrics.on_event(AgentEvent(event_type=EventType.TOOL_CALL_END, data={"tool_name": "add", "execution_time": 0.1}))
+
+    snapshot = metrics.snapshot()
+    metrics.on_event(AgentEvent(event_type=EventType.TOOL_CALL_END, data={"tool_name": "add", "execution_time": 0.2}))
+
+    assert snapshot["tools"]["add"]["count"] == 1
+    assert metrics.snapshot()["tools"]["add"]["count"] == 2
+
+
+def test_reset_clears_every_metric():
+    metrics = MetricsCallback()
+    metrics.on_event(AgentEvent(event_type=EventType.TOOL_CALL_END, data={"tool_name": "add", "execution_time": 0.1}))
+    metrics.on_event(AgentEvent(event_type=EventType.NODE_END, data={"workflow": "w", "node": "n", "status": "completed", "execution_time": 0.1}))
+
+    metrics.reset()
+    snapshot = metrics.snapshot()
+
+    assert snapshot["total_tool_calls"] == 0
+    assert snapshot["tools"] == {}
+    assert snapshot["nodes"] == {}
+    assert snapshot["event_counts"] == {}
+
+
+def test_concurrent_events_are_all_counted():
+    metrics = MetricsCallback()
+    event = AgentEvent(event_type=EventType.TOOL_CALL_END, data={"tool_name": "add", "execution_time": 0.01})
+
+    def record():
+        for _ in range(1000):
+            metrics.on_event(event)
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert metrics.snapshot()["tools"]["add"]["count"] == 4000
@@ -0,0 +1,150 @@
+"""Tests for the PrometheusExporter exposition formats, file output and HTTP endpoint."""
+
+import os
+import urllib.error
+import urllib.request
+
+import pytest
+
+from or_af.callbacks import PrometheusExporter
+from or_af.callbacks.prometheus import OPENMETRICS_CONTENT_TYPE, PROMETHEUS_CONTENT_TYPE
+from or_af.exceptions import CallbackError
+from or_af.models import AgentEvent, EventType
+
+from tests.helpers import answer, call, tool_reply
+
+
+def tool_end(name, seconds, success=True):
+    return AgentEvent(
+        event_type=EventType.TOOL_CALL_END,
+        data={"tool_name": name, "execution_time": seconds, "success": success, "error_type": "ValueError"}
+    )
+
+
+@pytest.fixture
+def exporter():
+    exporter = PrometheusExporter(latency_buckets=(0.1, 1.0))
+    exporter.on_event(tool_end("search", 0.05))
+    exporter.on_event(tool_end("search", 0.5))
+    exporter.on_event(tool_end("search", 5.0, success=False))
+    return exporter
+
+
+def samples(text):
+    return [line for line in text.splitlines() if line and not line.startswith("#")]
+
+
+def test_openmetrics_output_ends_with_eof(exporter):
+    text = exporter.render(openmetrics=True)
+
+    assert text.endswith("# EOF\n")
+    assert text.count("# EOF") == 1
+    assert "# EOF" not in exporter.render(openmetrics=False)
+
+
+def test_counter_families_are_named_per_format(exporter):
+    openmetrics = exporter.render(openmetrics=True).splitlines()
+    prometheus = exporter.render(openmetrics=False).splitlines()
+
+    assert "# TYPE or_af_tool_calls counter" in openmetrics
+    assert "# HELP or_af_tool_calls Tool calls by tool and outcome" in openmetrics
+    assert "# TYPE or_af_tool_calls_total counter" in prometheus
+    assert "# HELP or_af_tool_calls_total Tool calls by tool and outcome" in prometheus
+    # Samples are the same in both formats
+    assert samples("\n".join(openmetrics)) == samples("\n".join(prometheus))
+    assert 'or_af_tool_calls_total{tool="search",status="success"} 2' in openmetrics
+    assert 'or_af_tool_calls_total{tool="search",status="error"} 1' in openmetrics
+
+
+def test_histograms_have_cumulative_buckets_count_and_sum(exporter):
+    lines = exporter.render().splitlines()
+
+    assert "# TYPE or_af_tool_duration_seconds histogram" in lines
+    buckets = [line for line in lines if line.startswith('or_af_tool_duration_seconds_bucket{tool="search"')]
+    assert buckets == [
+        'or_af_tool_duration_seconds_bucket{tool="search",le="0.1"} 1',
+        'or_af_tool_duration_seconds_bucket{tool="search",le="1.0"} 2',
+        'or_af_tool_duration_seconds_bucket{tool="search",le="+Inf"} 3'
+    ]
+    assert 'or_af_tool_duration_seconds_count{tool="search"} 3' in lines
+    assert 'or_af_tool_duration_seconds_sum{tool="search"} 5.55' in lines
+
+
+def test_empty_histograms_still_export_their_buckets():
+    lines = PrometheusExporter(latency_buckets=(1.0,)).render().splitlines()
+
+    assert 'or_af_agent_run_duration_seconds_bucket{le="+Inf"} 0' in lines
+    assert "or_af_agent_run_duration_seconds_count 0" in lines
+
+
+def test_label_values_are_escaped():
+    exporter = PrometheusExporter()
+    exporter.on_event(tool_end('say "hi"\\\n', 0.1))
+
+    assert 'tool="say \\"hi\\"\\\\\\n"' in exporter.render()
+
+
+def test_unknown_tool_is_one_error(make_agent):
+    exporter = PrometheusExporter()
+    agent = make_agent([tool_reply(call("missing")), answer("done")], callbacks=[exporter])
+
+    agent.run("Call it")
+
+    lines = exporter.render().splitlines()
+    assert 'or_af_errors_total{error_type="ToolNotFoundError"} 1' in lines
+    assert 'or_af_tool_calls_total{tool="missing",status="error"} 1' in lines
+
+
+def test_namespace_prefixes_every_family():
+    text = PrometheusExporter(namespace="svc").render()
+
+    names = [line.split()[2] for line in text.splitlines() if line.startswith("# TYPE")]
+    assert names and all(name.startswith("svc_") for name in names)
+
+
+def test_write_replaces_the_file_atomically(exporter, tmp_path):
+    path = tmp_path / "or_af.prom"
+    path.write_text("stale")
+
+    exporter.write(str(path))
+
+    assert path.read_text() == exporter.render(openmetrics=False)
+    assert os.listdir(tmp_path) == ["or_af.prom"]
+    exporter.write(str(path), openmetrics=True)
+    assert path.read_text().endswith("# EOF\n")
+
+
+def scrape(url, accept=None):
+    request = urllib.request.Request(url, headers={"Accept": accept} if accept else {})
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return response.headers["Content-Type"], response.read().decode("utf-8")
+
+
+def test_serve_negotiates_the_format(exporter):
+    host, port = exporter.serve(port=0)
+    url = f"http://{host}:{port}/metrics"
+    try:
+        content_type, body = scrape(url, "application/openmetrics-text; version=1.0.0")
+        assert content_type == OPENMETRICS_CONTENT_TYPE
+        assert body == exporter.render(openmetrics=True)
+
+        content_type, body = scrape(url)
+        assert content_type == PROMETHEUS_CONTENT_TYPE
+        assert body == exporter.render(openmetrics=False)
+
+        with pytest.raises(urllib.error.HTTPError):
+            scrape(f"http://{host}:{port}/other")
+        with pytest.raises(CallbackError):
+            exporter.serve(port=0)
+    finally:
+        exporter.shutdown()
+
+    with pytest.raises(OSError):
+        scrape(url)
+    exporter.shutdown()
+
+
+@pytest.mark.parametrize("buckets", [(), (1.0, 0.5), (0.5, 0.5)])
+def test_invalid_buckets_are_rejected(buckets):
+    with pytest.raises(CallbackError):
+        PrometheusExporter(latency_buckets=buckets)
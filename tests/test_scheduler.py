@@ -0,0 +1,328 @@
+"""Tests for RequestScheduler: retries, token accounting and concurrency slots."""
+
+import asyncio
+import gc
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from or_af import Agent
+from or_af.llm import ClientPool, RequestScheduler, SchedulerConfig, TokenBucket
+
+from tests.helpers import answer, call, tool_reply
+
+
+class FakeAPIError(Exception):
+    """Stand-in for an OpenAI status error"""
+
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+def fast_config(**kwargs):
+    kwargs.setdefault("initial_backoff", 0.001)
+    kwargs.setdefault("max_backoff", 0.002)
+    return SchedulerConfig(**kwargs)
+
+
+def usage(total):
+    return SimpleNamespace(total_tokens=total)
+
+
+def failing(errors, result):
+    """create() raising each of ``errors`` in turn, then returning ``result``"""
+    calls = []
+
+    def create(**api_params):
+        calls.append(api_params)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    create.calls = calls
+    return create
+
+
+def chunk(text=None, total_tokens=None):
+    return SimpleNamespace(text=text, usage=usage(total_tokens) if total_tokens else None)
+
+
+PARAMS = {"messages": [{"role": "user", "content": "x" * 400}]}
+
+
+# Token bucket
+
+
+def test_token_bucket_delays_when_empty():
+    bucket = TokenBucket(per_minute=60)
+
+    assert bucket.reserve(60) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0, rel=0.05)
+
+
+def test_token_bucket_refund_restores_capacity():
+    bucket = TokenBucket(per_minute=60)
+    bucket.reserve(60)
+    bucket.refund(60)
+
+    assert bucket.reserve(30) == 0.0
+
+
+# Retries
+
+
+def test_retries_rate_limits_then_succeeds():
+    scheduler = RequestScheduler(fast_config())
+    create = failing([FakeAPIError(429), FakeAPIError(503)], "ok")
+
+    assert scheduler.call(create, PARAMS) == "ok"
+    assert len(create.calls) == 3
+    stats = scheduler.stats()
+    assert stats["retries"] == 2
+    assert stats["rate_limited"] == 1
+    assert stats["failures"] == 0
+    assert stats["in_flight"] == 0
+
+
+def test_does_not_retry_client_errors():
+    scheduler = RequestScheduler(fast_config())
+    create = failing([FakeAPIError(400)], "ok")
+
+    with pytest.raises(FakeAPIError):
+        scheduler.call(create, PARAMS)
+    assert len(create.calls) == 1
+    assert scheduler.stats()["failures"] == 1
+    assert scheduler.stats()["in_flight"] == 0
+
+
+def test_gives_up_after_max_retries():
+    scheduler = RequestScheduler(fast_config(max_retries=2))
+    create = failing([FakeAPIError(500)] * 5, "ok")
+
+    with pytest.raises(FakeAPIError):
+        scheduler.call(create, PARAMS)
+    assert len(create.calls) == 3
+
+
+def test_honors_retry_after():
+    scheduler = RequestScheduler(fast_config())
+    create = failing([FakeAPIError(429, {"retry-after-ms": "150"})], "ok")
+
+    start = time.perf_counter()
+    scheduler.call(create, PARAMS)
+
+    assert time.perf_counter() - start >= 0.15
+
+
+def test_failed_attempts_return_their_token_reservation():
+    scheduler = RequestScheduler(fast_config(tokens_per_minute=10_000, completion_tokens=100))
+    create = failing([FakeAPIError(429), FakeAPIError(429)], SimpleNamespace(usage=usage(150)))
+
+    scheduler.call(create, PARAMS)
+
+    # Only the successful attempt's actual usage stays charged
+    assert scheduler._token_bucket._tokens == pytest.approx(10_000 - 150, abs=1)
+
+
+def test_unreported_usage_keeps_the_estimate():
+    scheduler = RequestScheduler(fast_config(tokens_per_minute=10_000, completion_tokens=100))
+
+    scheduler.call(lambda **api_params: SimpleNamespace(usage=None), PARAMS)
+
+    # 400 characters / 4 + the completion allowance
+    assert scheduler._token_bucket._tokens == pytest.approx(10_000 - 200, abs=1)
+
+
+# Streaming
+
+
+def test_stream_holds_slot_until_exhausted():
+    scheduler = RequestScheduler(fast_config(max_concurrency=1))
+
+    stream = scheduler.call(lambda **api_params: iter([chunk("a"), chunk("b")]), {**PARAMS, "stream": True})
+    assert scheduler.stats()["in_flight"] == 1
+
+    assert [c.text for c in stream] == ["a", "b"]
+    assert scheduler.stats()["in_flight"] == 0
+
+
+def test_stream_limits_concurrency():
+    scheduler = RequestScheduler(fast_config(max_concurrency=1))
+    params = {**PARAMS, "stream": True}
+    first = scheduler.call(lambda **api_params: iter([chunk("a")]), params)
+    second_started = threading.Event()
+
+    def second_request():
+        for _ in scheduler.call(lambda **api_params: iter([chunk("b")]), params):
+            pass
+        second_started.set()
+
+    thread = threading.Thread(target=second_request)
+    thread.start()
+    assert not second_started.wait(0.1)
+
+    list(first)
+    assert second_started.wait(1.0)
+    thread.join()
+
+
+def test_closing_a_stream_releases_its_slot():
+    scheduler = RequestScheduler(fast_config(max_concurrency=1))
+    closed = []
+
+    def create(**api_params):
+        def chunks():
+            try:
+                yield chunk("a")
+                yield chunk("b")
+            finally:
+                closed.append(True)
+        return chunks()
+
+    stream = scheduler.call(create, {**PARAMS, "stream": True})
+    next(stream)
+    stream.close()
+
+    assert closed == [True]
+    assert scheduler.stats()["in_flight"] == 0
+
+
+def test_abandoned_stream_releases_its_slot_while_the_lock_is_held():
+    scheduler = RequestScheduler(fast_config(max_concurrency=1))
+    streams = [scheduler.call(lambda **api_params: iter([chunk("a"), chunk("b")]), {**PARAMS, "stream": True})]
+
+    def collect_under_lock():
+        # Garbage collection may run while this thread holds the scheduler's lock
+        with scheduler._lock:
+            streams.clear()
+            gc.collect()
+
+    thread = threading.Thread(target=collect_under_lock, daemon=True)
+    thread.start()
+    thread.join(1.0)
+
+    assert not thread.is_alive()
+    assert scheduler.stats()["in_flight"] == 0
+
+
+def test_stream_error_before_first_chunk_is_retried():
+    scheduler = RequestScheduler(fast_config())
+    attempts = []
+
+    def create(**api_params):
+        attempts.append(1)
+
+        def chunks():
+            if len(attempts) == 1:
+                raise FakeAPIError(503)
+            yield chunk("ok")
+        return chunks()
+
+    stream = scheduler.call(create, {**PARAMS, "stream": True})
+
+    assert [c.text for c in stream] == ["ok"]
+    assert len(attempts) == 2
+    assert scheduler.stats()["retries"] == 1
+
+
+def test_stream_error_after_first_chunk_is_raised():
+    scheduler = RequestScheduler(fast_config())
+
+    def create(**api_params):
+        def chunks():
+            yield chunk("a")
+            raise FakeAPIError(503)
+        return chunks()
+
+    stream = scheduler.call(create, {**PARAMS, "stream": True})
+    with pytest.raises(FakeAPIError):
+        list(stream)
+    assert scheduler.stats()["failures"] == 1
+    assert scheduler.stats()["in_flight"] == 0
+
+
+def test_stream_usage_settles_token_bucket():
+    scheduler = RequestScheduler(fast_config(tokens_per_minute=10_000, completion_tokens=100))
+
+    stream = scheduler.call(
+        lambda **api_params: iter([chunk("a"), chunk(total_tokens=120)]),
+        {**PARAMS, "stream": True}
+    )
+    list(stream)
+
+    assert scheduler._token_bucket._tokens == pytest.approx(10_000 - 120, abs=1)
+
+
+def test_async_stream_holds_slot_until_exhausted():
+    scheduler = RequestScheduler(fast_config(max_concurrency=1))
+
+    async def create(**api_params):
+        async def chunks():
+            yield chunk("a")
+            yield chunk("b")
+        return chunks()
+
+    async def main():
+        stream = await scheduler.acall(create, {**PARAMS, "stream": True})
+        in_flight = scheduler.stats()["in_flight"]
+        texts = [c.text async for c in stream]
+        return in_flight, texts
+
+    in_flight, texts = asyncio.run(main())
+    assert in_flight == 1
+    assert texts == ["a", "b"]
+    assert scheduler.stats()["in_flight"] == 0
+
+
+def test_async_retries_then_succeeds():
+    scheduler = RequestScheduler(fast_config())
+    attempts = []
+
+    async def create(**api_params):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise FakeAPIError(429)
+        return "ok"
+
+    assert asyncio.run(scheduler.acall(create, PARAMS)) == "ok"
+    assert scheduler.stats()["retries"] == 1
+
+
+# Agents
+
+
+def test_agent_releases_slots_after_streamed_runs(make_agent):
+    scheduler = RequestScheduler(fast_config(max_concurrency=1))
+    agent = make_agent([tool_reply(call("add", a=1, b=2)), answer("3")], scheduler=scheduler)
+
+    assert agent.run("Add").success
+    assert scheduler.stats()["requests"] == 2
+    assert scheduler.stats()["in_flight"] == 0
+
+
+def test_agent_streams_settle_the_token_bucket_with_reported_usage(make_agent):
+    scheduler = RequestScheduler(fast_config(tokens_per_minute=60, completion_tokens=10))
+    agent = make_agent([answer("3", prompt_tokens=20, completion_tokens=2)], scheduler=scheduler)
+
+    response = agent.run("Add", stream=True)
+
+    assert response.iterations[0].prompt_tokens == 20
+    assert scheduler._token_bucket._tokens == pytest.approx(60 - 22, abs=1)
+
+
+def test_agent_with_scheduler_disables_client_retries(monkeypatch):
+    monkeypatch.setenv("endpoint", "https://example.openai.azure.com")
+    monkeypatch.setenv("api_version", "2024-06-01")
+    monkeypatch.setenv("subscription_key", "key")
+    pool = ClientPool()
+
+    scheduled = Agent(system_prompt="s", verbose=False, client_pool=pool, scheduler=RequestScheduler())
+    unscheduled = Agent(system_prompt="s", verbose=False, client_pool=pool)
+
+    assert scheduled.client.max_retries == 0
+    assert unscheduled.client.max_retries == pool.config.max_retries
+    pool.close()
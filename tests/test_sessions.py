@@ -0,0 +1,85 @@
+"""Tests for multi-turn chat sessions."""
+
+import asyncio
+
+import pytest
+
+from or_af.exceptions import AgentConfigurationError
+from or_af.models import MessageRole
+
+from tests.helpers import CapturingBackend, answer, call, tool_reply
+
+
+TURNS = [tool_reply(call("add", a=5, b=3)), answer("8"), answer("16")]
+
+
+def roles(messages):
+    return [message["role"] for message in messages]
+
+
+def test_chat_sends_earlier_turns_with_each_request(make_agent):
+    backend = CapturingBackend(TURNS)
+    agent = make_agent(None, backend=backend)
+
+    assert agent.chat("Add 5 and 3").response == "8"
+    assert agent.chat("Double it").response == "16"
+
+    assert roles(backend.sent[-1]) == ["system", "user", "assistant", "tool", "assistant", "user"]
+    assert backend.sent[-1][3]["content"] == "8"
+    assert [message.role for message in agent.conversation_history] == [
+        MessageRole.USER, MessageRole.ASSISTANT, MessageRole.TOOL, MessageRole.ASSISTANT,
+        MessageRole.USER, MessageRole.ASSISTANT
+    ]
+
+
+def test_run_does_not_touch_the_conversation(make_agent):
+    agent = make_agent([answer("hi")])
+
+    agent.run("Hello")
+
+    assert agent.conversation_history == []
+
+
+def test_achat_matches_chat(make_agent):
+    sync_agent, async_agent = make_agent(TURNS), make_agent(TURNS)
+
+    sync_agent.chat("Add 5 and 3")
+    asyncio.run(async_agent.achat("Add 5 and 3"))
+
+    assert sync_agent.save_session().count('"role"') == async_agent.save_session().count('"role"') == 4
+
+
+def test_saved_session_resumes_the_conversation(make_agent):
+    agent = make_agent(TURNS)
+    agent.chat("Add 5 and 3")
+
+    backend = CapturingBackend(TURNS)
+    restored = make_agent(None, backend=backend).load_session(agent.save_session())
+    restored.chat("Double it")
+
+    assert roles(backend.sent[0]) == ["system", "user", "assistant", "tool", "assistant", "user"]
+    assert backend.sent[0][2]["tool_calls"][0]["function"]["name"] == "add"
+    # Timestamps are saved to the millisecond
+    for saved, original in zip(restored.conversation_history, agent.conversation_history):
+        assert abs((saved.timestamp - original.timestamp).total_seconds()) <= 0.001
+
+
+def test_load_session_rejects_invalid_data(make_agent):
+    agent = make_agent([answer("hi")])
+
+    with pytest.raises(AgentConfigurationError):
+        agent.load_session('{"version": 99, "messages": []}')
+    with pytest.raises(AgentConfigurationError):
+        agent.load_session("not json")
+
+
+def test_reset_starts_a_new_conversation(make_agent):
+    backend = CapturingBackend([answer("hi")], loop=True)
+    agent = make_agent(None, backend=backend)
+    agent.chat("Hello")
+
+    agent.reset()
+    agent.chat("Hello again")
+
+    assert agent.conversation_history[0].content == "Hello again"
+    assert roles(backend.sent[-1]) == ["system", "user"]
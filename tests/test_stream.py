@@ -0,0 +1,121 @@
+"""Tests for Agent.stream() and Agent.astream()."""
+
+import asyncio
+import threading
+import time
+
+import or_af.core.agent as agent_module
+from or_af import ReplayBackend, ReplayTiming
+from or_af.models import EventType, StreamChunkType
+
+from tests.helpers import answer, call, tool_reply
+
+
+PARALLEL_TRACE = [
+    tool_reply(call("wait", "call_slow", seconds=0.3), call("wait", "call_fast", seconds=0.05)),
+    answer("done")
+]
+
+LONG_ANSWER = "word " * 200
+
+
+def tool_results(timed_chunks):
+    return [(chunk.tool_call_id, at) for chunk, at in timed_chunks if chunk.type == StreamChunkType.TOOL_RESULT]
+
+
+def stream_threads(agent):
+    return [thread for thread in threading.enumerate() if thread.name == f"{agent.name}-stream"]
+
+
+def test_stream_yields_each_tool_result_as_it_finishes(make_agent):
+    agent = make_agent(PARALLEL_TRACE, parallel_tool_calls=True)
+
+    timed = [(chunk, time.perf_counter()) for chunk in agent.stream("Wait twice")]
+
+    (first, first_at), (second, second_at) = tool_results(timed)
+    assert (first, second) == ("call_fast", "call_slow")
+    assert second_at - first_at > 0.15
+    assert timed[-1][0].response.success
+
+
+def test_astream_yields_each_tool_result_as_it_finishes(make_agent):
+    agent = make_agent(PARALLEL_TRACE, parallel_tool_calls=True)
+
+    async def collect():
+        return [(chunk, time.perf_counter()) async for chunk in agent.astream("Wait twice")]
+
+    timed = asyncio.run(collect())
+
+    (first, first_at), (second, second_at) = tool_results(timed)
+    assert (first, second) == ("call_fast", "call_slow")
+    assert second_at - first_at > 0.15
+    assert timed[-1][0].response.success
+
+
+def test_closing_stream_stops_the_run(make_agent):
+    timing = ReplayTiming(chunk_interval=0.01, chunk_chars=4)
+    agent = make_agent(None, backend=ReplayBackend([answer(LONG_ANSWER)], timing=timing))
+
+    chunks = agent.stream("Talk")
+    assert next(chunks).type == StreamChunkType.TEXT_DELTA
+    start = time.perf_counter()
+    chunks.close()
+
+    assert time.perf_counter() - start < 0.5
+    assert stream_threads(agent) == []
+
+
+def test_closing_astream_cancels_and_awaits_the_run(make_agent):
+    timing = ReplayTiming(chunk_interval=0.01, chunk_chars=4)
+    agent = make_agent(None, backend=ReplayBackend([answer(LONG_ANSWER)], timing=timing))
+
+    async def close_early():
+        chunks = agent.astream("Talk")
+        first = await chunks.__anext__()
+        await chunks.aclose()
+        return first, [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    first, pending = asyncio.run(close_early())
+
+    assert first.type == StreamChunkType.TEXT_DELTA
+    assert pending == []
+
+
+def test_stream_buffers_a_bounded_number_of_chunks(make_agent, monkeypatch):
+    monkeypatch.setattr(agent_module, "STREAM_BUFFER_SIZE", 2)
+    events = []
+    timing = ReplayTiming(chunk_chars=4)
+    agent = make_agent(None, backend=ReplayBackend([answer(LONG_ANSWER)], timing=timing), callbacks=[events.append])
+
+    chunks = agent.stream("Talk")
+    first = next(chunks)
+    time.sleep(0.2)
+    produced = sum(1 for event in events if event.event_type == EventType.STREAM_CHUNK.value)
+    rest = list(chunks)
+
+    assert produced <= 5
+    text = "".join(chunk.content for chunk in [first] + rest if chunk.type == StreamChunkType.TEXT_DELTA)
+    assert text == LONG_ANSWER
+    assert rest[-1].response.success
+    assert stream_threads(agent) == []
+
+
+def test_astream_buffers_a_bounded_number_of_chunks(make_agent, monkeypatch):
+    monkeypatch.setattr(agent_module, "STREAM_BUFFER_SIZE", 2)
+    events = []
+    timing = ReplayTiming(chunk_chars=4)
+    agent = make_agent(None, backend=ReplayBackend([answer(LONG_ANSWER)], timing=timing), callbacks=[events.append])
+
+    async def consume():
+        chunks = agent.astream("Talk")
+        first = await chunks.__anext__()
+        await asyncio.sleep(0.2)
+        produced = sum(1 for event in events if event.event_type == EventType.STREAM_CHUNK.value)
+        return first, produced, [chunk async for chunk in chunks]
+
+    first, produced, rest = asyncio.run(consume())
+
+    assert produced <= 5
+    text = "".join(chunk.content for chunk in [first] + rest if chunk.type == StreamChunkType.TEXT_DELTA)
+    assert text == LONG_ANSWER
+    assert rest[-1].response.success
@@ -0,0 +1,104 @@
+"""Tests for StreamAccumulator reply assembly."""
+
+from types import SimpleNamespace
+
+from or_af import ReplayBackend, ReplayTiming
+from or_af.core.streaming import AssistantMessage, StreamAccumulator
+
+from tests.helpers import call, tool_reply
+
+
+def text(content):
+    return SimpleNamespace(content=content, tool_calls=None)
+
+
+def fragment(index, arguments, call_id=None, name=None):
+    function = SimpleNamespace(name=name, arguments=arguments)
+    return SimpleNamespace(content=None, tool_calls=[SimpleNamespace(index=index, id=call_id, function=function)])
+
+
+def completed(tool_calls):
+    return [(tool_call.id, tool_call.function.name, tool_call.function.arguments) for tool_call in tool_calls]
+
+
+def test_text_fragments_are_joined():
+    accumulator = StreamAccumulator()
+
+    assert [accumulator.add(text(part)) for part in ("Hel", "lo")] == ["Hel", "lo"]
+
+    assert accumulator.build() == AssistantMessage(content="Hello")
+    assert StreamAccumulator().build() == AssistantMessage()
+
+
+def test_tool_call_fragments_are_assembled_in_index_order():
+    accumulator = StreamAccumulator()
+    for delta in (
+        fragment(1, "", "call_b", "add"),
+        fragment(0, '{"a": ', "call_a", "add"),
+        fragment(1, '{"a": 2, "b": 2}'),
+        fragment(0, '1, "b": 2}'),
+    ):
+        accumulator.add(delta)
+
+    message = accumulator.build()
+
+    assert message.content is None
+    assert completed(message.tool_calls) == [
+        ("call_a", "add", '{"a": 1, "b": 2}'),
+        ("call_b", "add", '{"a": 2, "b": 2}')
+    ]
+
+
+def test_tool_call_is_reported_once_its_arguments_parse():
+    reported = []
+    accumulator = StreamAccumulator(reported.append)
+
+    accumulator.add(fragment(0, "", "call_a", "add"))
+    accumulator.add(fragment(0, '{"a": {"x": 1},'))
+    assert reported == []
+
+    accumulator.add(fragment(0, ' "b": 2}'))
+    assert completed(reported) == [("call_a", "add", '{"a": {"x": 1}, "b": 2}')]
+
+    # A single (or last) tool call is reported before the stream ends
+    accumulator.add(fragment(1, '{"reason": "x"}', "call_b", "fail"))
+    assert completed(reported)[1] == ("call_b", "fail", '{"reason": "x"}')
+    accumulator.build()
+    assert len(reported) == 2
+
+
+def test_tool_calls_are_reported_in_call_order():
+    reported = []
+    accumulator = StreamAccumulator(reported.append)
+
+    accumulator.add(fragment(0, '{"a": 1,', "call_a", "add"))
+    accumulator.add(fragment(1, "{}", "call_b", "add"))
+    assert reported == []
+
+    accumulator.add(fragment(0, ' "b": 2}'))
+    assert [tool_call.id for tool_call in reported] == ["call_a", "call_b"]
+
+
+def test_tool_call_with_invalid_arguments_is_not_reported():
+    reported = []
+    accumulator = StreamAccumulator(reported.append)
+
+    accumulator.add(fragment(0, '{"a": 1', "call_a", "add"))
+    accumulator.add(fragment(1, "{}", "call_b", "add"))
+
+    # The later call waits for the earlier one, which never completes
+    assert reported == []
+    assert accumulator.build().tool_calls[0].function.arguments == '{"a": 1'
+
+
+def test_replayed_stream_rebuilds_the_recorded_reply():
+    entry = tool_reply(call("add", "call_1", a=1, b=2), call("wait", "call_2", seconds=0.5), content="Working on it")
+    backend = ReplayBackend([entry], timing=ReplayTiming(chunk_chars=3))
+    reported = []
+    accumulator = StreamAccumulator(reported.append)
+
+    for chunk in backend.create(messages=[], stream=True):
+        accumulator.add(chunk.choices[0].delta)
+
+    assert accumulator.build() == AssistantMessage.from_parts(entry["content"], entry["tool_calls"])
+    assert [tool_call.id for tool_call in reported] == ["call_1", "call_2"]
@@ -0,0 +1,222 @@
+"""Tests for tool execution within an agent iteration."""
+
+import asyncio
+import time
+
+import pytest
+
+from or_af import MCPServer, Tool
+from or_af.exceptions import AgentConfigurationError
+
+from tests.helpers import CapturingBackend, answer, call, tool_reply
+
+
+def three_waits(seconds=0.2):
+    return tool_reply(*(call("wait", f"call_{i}", seconds=seconds * (3 - i) / 3) for i in range(3)))
+
+
+def tool_messages(messages):
+    return [(m["tool_call_id"], m["content"]) for m in messages if m["role"] == "tool"]
+
+
+# Parallel tool calls
+
+
+def test_parallel_tool_calls_overlap_and_keep_call_order(make_agent):
+    backend = CapturingBackend([three_waits(0.3), answer("done")])
+    agent = make_agent(None, backend=backend, parallel_tool_calls=True)
+
+    start = time.perf_counter()
+    assert agent.run("Wait").success
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
+    assert [call_id for call_id, _ in tool_messages(backend.sent[1])] == ["call_0", "call_1", "call_2"]
+
+
+def test_sequential_tool_calls_by_default(make_agent):
+    agent = make_agent([three_waits(0.15), answer("done")])
+
+    start = time.perf_counter()
+    assert agent.run("Wait").success
+
+    assert time.perf_counter() - start >= 0.3
+
+
+def test_max_tool_concurrency_caps_parallel_calls(make_agent):
+    trace = [tool_reply(*(call("wait", f"call_{i}", seconds=0.1) for i in range(4))), answer("done")]
+    agent = make_agent(trace, parallel_tool_calls=True, max_tool_concurrency=2)
+
+    start = time.perf_counter()
+    assert agent.run("Wait").success
+
+    assert 0.2 <= time.perf_counter() - start < 0.35
+
+
+def test_async_parallel_tool_calls_keep_call_order(make_agent):
+    backend = CapturingBackend([three_waits(0.3), answer("done")])
+    agent = make_agent(None, backend=backend, parallel_tool_calls=True)
+
+    start = time.perf_counter()
+    assert asyncio.run(agent.arun("Wait")).success
+
+    assert time.perf_counter() - start < 0.5
+    assert [call_id for call_id, _ in tool_messages(backend.sent[1])] == ["call_0", "call_1", "call_2"]
+
+
+def test_a_failing_tool_does_not_affect_the_others(make_agent):
+    backend = CapturingBackend([tool_reply(call("fail", reason="boom"), call("add", a=1, b=2)), answer("done")])
+    agent = make_agent(None, backend=backend, parallel_tool_calls=True)
+
+    assert agent.run("Go").success
+
+    (_, failed), (_, added) = tool_messages(backend.sent[1])
+    assert "boom" in failed
+    assert added == "3"
+
+
+def test_sync_run_executes_async_tools_inside_a_running_loop(make_agent, calculator):
+    @calculator.tool()
+    async def double(x: int) -> int:
+        """Double a number"""
+        await asyncio.sleep(0)
+        return 2 * x
+
+    backend = CapturingBackend([tool_reply(call("double", x=21)), answer("done")])
+    agent = make_agent(None, backend=backend)
+
+    async def main():
+        return agent.run("Double")
+
+    assert asyncio.run(main()).success
+    assert tool_messages(backend.sent[1]) == [("call_double", "42")]
+
+
+def test_close_shuts_down_the_tool_thread_pool(make_agent):
+    with make_agent([three_waits(0.03), answer("done")], parallel_tool_calls=True) as agent:
+        assert agent.run("Wait").success
+        executor = agent._tool_executor
+        assert executor is not None
+
+    assert agent._tool_executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
+
+
+# Tool schema registry
+
+
+def test_tool_schema_is_compiled_once():
+    def area(width: float, height: float, label: str = "") -> float:
+        """Area of a rectangle"""
+        return width * height
+
+    tool = Tool(name="area", func=area)
+
+    schema = tool.to_openai_format()
+    assert schema is tool.to_openai_format()
+    parameters = schema["function"]["parameters"]
+    assert parameters["properties"]["width"]["type"] == "number"
+    assert parameters["required"] == ["width", "height"]
+
+
+def test_agent_tool_list_is_cached_until_tools_change(make_agent, calculator):
+    agent = make_agent([answer("ok")])
+
+    tools = agent._get_tools_schema()
+    assert agent._get_tools_schema() is tools
+    assert sorted(tool["function"]["name"] for tool in tools) == ["add", "fail", "wait"]
+
+    @calculator.tool()
+    def negate(x: int) -> int:
+        """Negate a number"""
+        return -x
+
+    assert "negate" in [tool["function"]["name"] for tool in agent._get_tools_schema()]
+    agent.disconnect_mcp("calculator")
+    assert agent._get_tools_schema() == []
+
+
+# Tool routing
+
+
+def test_tool_calls_are_routed_to_their_server(make_agent, calculator):
+    text = MCPServer(name="text")
+
+    @text.tool()
+    def shout(message: str) -> str:
+        """Upper-case a message"""
+        return message.upper()
+
+    backend = CapturingBackend([tool_reply(call("shout", message="hi"), call("add", a=2, b=2)), answer("done")])
+    agent = make_agent(None, backend=backend, mcp_servers=[calculator, text])
+
+    assert agent._find_tool_server("shout") == "text"
+    assert agent._find_tool_server("add") == "calculator"
+    assert agent.run("Go").success
+    assert [content for _, content in tool_messages(backend.sent[1])] == ["HI", "4"]
+
+
+def test_lookups_do_not_poll_the_servers(make_agent, calculator, monkeypatch):
+    agent = make_agent([answer("ok")])
+    agent._find_tool_server("add")
+    rebuilds = []
+    get_tools = calculator.get_tools
+    monkeypatch.setattr(calculator, "get_tools", lambda: rebuilds.append(1) or get_tools())
+    monkeypatch.setattr(agent, "_mcp_clients", None)
+
+    for _ in range(100):
+        assert agent._find_tool_server("add") == "calculator"
+        agent._get_tools_schema()
+
+    assert rebuilds == []
+
+
+def test_registering_a_tool_invalidates_the_index(make_agent, calculator):
+    agent = make_agent([answer("ok")])
+    assert agent._find_tool_server("negate") is None
+
+    @calculator.tool()
+    def negate(x: int) -> int:
+        """Negate a number"""
+        return -x
+
+    assert agent._find_tool_server("negate") == "calculator"
+
+
+def test_disconnected_server_no_longer_invalidates_the_index(make_agent, calculator):
+    agent = make_agent([answer("ok")])
+    agent.disconnect_mcp("calculator")
+    tools = agent._get_tools_schema()
+
+    @calculator.tool()
+    def negate(x: int) -> int:
+        """Negate a number"""
+        return -x
+
+    assert agent._get_tools_schema() is tools == []
+
+
+def test_unknown_tool_is_reported_to_the_model(make_agent):
+    backend = CapturingBackend([tool_reply(call("missing")), answer("done")])
+    agent = make_agent(None, backend=backend)
+
+    assert agent._find_tool_server("missing") is None
+    assert agent.run("Go").success
+    (_, content), = tool_messages(backend.sent[1])
+    assert "not found" in content
+
+
+def test_connecting_a_server_with_a_duplicate_tool_name_fails(make_agent):
+    other = MCPServer(name="other")
+
+    @other.tool()
+    def add(a: int, b: int) -> int:
+        """Also add"""
+        return a + b
+
+    agent = make_agent([answer("ok")])
+
+    with pytest.raises(AgentConfigurationError):
+        agent.connect_mcp(other)
+    assert agent.list_mcp_servers() == ["calculator"]
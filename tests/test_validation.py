@@ -0,0 +1,68 @@
+"""Tests for graph validation: topological sort, components and cycles."""
+
+import pytest
+
+from or_af import WorkflowGraph
+from or_af.exceptions import CycleDetectedError
+from or_af.workflow import cyclic_components, find_cycle, strongly_connected_components, topological_sort
+
+
+DAG = {"a": ["b", "c"], "b": ["d"], "c": ["d"], "d": []}
+
+# a -> b -> c -> a, c -> d, d -> d, e isolated
+CYCLIC = {"a": ["b"], "b": ["c"], "c": ["a", "d"], "d": ["d"], "e": []}
+
+
+def chain(length, closed=False):
+    successors = {str(i): [str(i + 1)] for i in range(length - 1)}
+    successors[str(length - 1)] = ["0"] if closed else []
+    return successors
+
+
+def test_topological_sort_orders_every_edge_forward():
+    order = topological_sort(DAG)
+
+    position = {node: index for index, node in enumerate(order)}
+    assert sorted(order) == sorted(DAG)
+    assert all(position[source] < position[target] for source, targets in DAG.items() for target in targets)
+
+
+def test_topological_sort_leaves_out_cycles():
+    assert topological_sort(CYCLIC) == ["e"]
+
+
+def test_strongly_connected_components():
+    components = sorted(sorted(component) for component in strongly_connected_components(CYCLIC))
+
+    assert components == [["a", "b", "c"], ["d"], ["e"]]
+    assert sorted(sorted(component) for component in cyclic_components(CYCLIC)) == [["a", "b", "c"], ["d"]]
+    assert cyclic_components(DAG) == []
+
+
+def test_find_cycle_returns_a_closed_path():
+    cycle = find_cycle(CYCLIC)
+
+    assert cycle[0] == cycle[-1]
+    assert all(target in CYCLIC[source] for source, target in zip(cycle, cycle[1:]))
+    assert find_cycle(DAG) is None
+
+
+def test_deep_graphs_do_not_recurse():
+    assert len(topological_sort(chain(100_000))) == 100_000
+    cycle = find_cycle(chain(100_000, closed=True))
+    assert len(cycle) == 100_001
+
+
+def test_compile_reports_the_cycle():
+    graph = WorkflowGraph(name="loop")
+    for name in "abc":
+        graph.add_node(lambda data: data, name=name)
+    graph.connect(*(graph._resolve_node(name) for name in "abca"))
+
+    with pytest.raises(CycleDetectedError) as info:
+        graph.compile()
+
+    assert info.value.cycle[0] == info.value.cycle[-1]
+    assert sorted(info.value.components[0]) == ["a", "b", "c"]
+    assert [node.name for node in graph.find_cycle()][0] in "abc"
+    graph.compile(check_cycles=False)
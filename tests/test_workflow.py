@@ -0,0 +1,159 @@
+"""Tests for WorkflowGraph execution."""
+
+import sys
+import time
+from types import SimpleNamespace
+
+from or_af import EdgeCondition, MergedInputs, NodeStatus, WorkflowGraph
+
+
+class RecordingAgent:
+    """Agent stand-in that records the prompt it was run with"""
+
+    def __init__(self, name):
+        self.name = name
+        self.tasks = []
+
+    def run(self, task):
+        self.tasks.append(task)
+        return SimpleNamespace(response=f"{self.name} done", success=True)
+
+
+def test_agent_merge_node_receives_joined_inputs():
+    graph = WorkflowGraph(name="merge")
+    start = graph.add_node(lambda data: data, name="start", is_entry=True)
+    left = graph.add_node(lambda data: "left", name="left")
+    right = graph.add_node(lambda data: "right", name="right")
+    writer = RecordingAgent("writer")
+    end = graph.add_node(writer, is_exit=True)
+    graph.add_edge(start, left)
+    graph.add_edge(start, right)
+    graph.merge([left, right], end)
+
+    graph.run("go")
+
+    assert writer.tasks == ["left\n\nright"]
+
+
+def test_callable_merge_node_receives_merged_inputs():
+    received = []
+    graph = WorkflowGraph(name="merge")
+    start = graph.add_node(lambda data: data, name="start", is_entry=True)
+    left = graph.add_node(lambda data: 1, name="left")
+    right = graph.add_node(lambda data: 2, name="right")
+    end = graph.add_node(lambda data: received.append(data), name="end", is_exit=True)
+    graph.add_edge(start, left)
+    graph.add_edge(start, right)
+    graph.merge([left, right], end)
+
+    graph.run("go")
+
+    assert received == [[1, 2]]
+    assert isinstance(received[0], MergedInputs)
+
+
+def test_agent_node_receives_a_list_output_unchanged():
+    graph = WorkflowGraph(name="list")
+    start = graph.add_node(lambda data: ["a", "b"], name="start", is_entry=True)
+    reader = RecordingAgent("reader")
+    end = graph.add_node(reader, is_exit=True)
+    graph.add_edge(start, end)
+
+    graph.run("go")
+
+    assert reader.tasks == [["a", "b"]]
+    assert not isinstance(reader.tasks[0], MergedInputs)
+
+
+def test_long_dead_path_is_skipped_without_recursion():
+    graph = WorkflowGraph(name="dead")
+    start = graph.add_node(lambda data: data, name="start", is_entry=True)
+    previous = graph.add_node(lambda data: data, name="n0")
+    graph.add_edge(start, previous, condition=EdgeCondition.ON_FAILURE)
+    for index in range(1, sys.getrecursionlimit() + 500):
+        node = graph.add_node(lambda data: data, name=f"n{index}")
+        graph.add_edge(previous, node)
+        previous = node
+
+    result = graph.run("go")
+
+    assert result["execution_order"] == [start.node_id]
+    assert previous.status == NodeStatus.SKIPPED
+
+
+def test_ready_nodes_run_concurrently():
+    graph = WorkflowGraph(name="fan-out")
+    start = graph.add_node(lambda data: data, name="start", is_entry=True)
+    branches = [graph.add_node(lambda data: time.sleep(0.2), name=f"b{i}") for i in range(3)]
+    for branch in branches:
+        graph.add_edge(start, branch)
+
+    began = time.perf_counter()
+    graph.run("go")
+
+    assert time.perf_counter() - began < 0.4
+
+
+# Compile
+
+
+def diamond():
+    graph = WorkflowGraph(name="diamond")
+    nodes = {name: graph.add_node(lambda data, name=name: name, name=name) for name in "abcd"}
+    graph.add_edge("a", "b")
+    graph.add_edge("a", "c")
+    graph.merge(["b", "c"], "d")
+    return graph, nodes
+
+
+def test_compile_builds_adjacency_and_order():
+    graph, nodes = diamond()
+    island = graph.add_node(lambda data: data, name="island")
+    ids = {name: node.node_id for name, node in nodes.items()}
+
+    graph.compile()
+
+    assert sorted(graph._successors[ids["a"]]) == sorted([ids["b"], ids["c"]])
+    assert [edge.source.name for edge in graph._reverse_adjacency[ids["d"]]] == ["b", "c"]
+    assert graph._in_degree[ids["d"]] == 2
+    position = {node_id: index for index, node_id in enumerate(graph._topological_order)}
+    assert position[ids["a"]] < position[ids["b"]] < position[ids["d"]]
+    assert island.node_id not in graph._reachable
+    assert graph.exit_nodes == {ids["d"], island.node_id}
+
+
+def test_unreachable_predecessor_does_not_block_a_merge_node():
+    graph, nodes = diamond()
+    graph.add_node(lambda data: "late", name="orphan")
+    graph.add_edge("orphan", "d")
+
+    result = graph.run("go")
+
+    assert [node_result.output for node_result in result["final_outputs"]] == ["d"]
+
+
+def test_adding_an_edge_recompiles_on_run():
+    graph, nodes = diamond()
+    graph.compile()
+    tail = graph.add_node(lambda data: f"tail after {data}", name="tail", is_exit=True)
+    graph.add_edge("d", "tail")
+
+    result = graph.run("go")
+
+    assert graph.compiled
+    assert result["results"][tail.node_id].output == "tail after d"
+
+
+def test_compile_scales_linearly():
+    graph = WorkflowGraph(name="chain")
+    previous = graph.add_node(lambda data: data, name="n0")
+    for index in range(1, 10_000):
+        node = graph.add_node(lambda data: data, name=f"n{index}")
+        graph.add_edge(previous, node)
+        previous = node
+
+    start = time.perf_counter()
+    graph.compile()
+
+    assert time.perf_counter() - start < 2.0
+    assert len(graph._topological_order) == 10_000